@@ -15,42 +15,70 @@ import re
 import requests
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
+from concurrent.futures import Future
 import PyPDF2
 import io
 from PIL import Image
 import pytesseract
 import base64
+from resolvedor_urls import ResolvedorURLOficial
+from proveedores_busqueda import (LimitadorTasa, ProveedorNavegador, ProveedorHTTP, ProveedorCache, ProveedorConcurrente,
+                                  es_resultado_confiable)
+from procesador_pdf import ProcesadorPDF
+from motor_ocr import MotorOCR
+from cache_ocr import CacheOCR, hash_archivo, hash_perceptual, clave_config
+from preprocesamiento_ocr import VERSION_PREPROCESO
+from extractor_contactos import ExtractorContactos, PATRON_EMAIL, PATRON_TELEFONO, PATRON_EXTENSION
+from tablas_directorio import analizar_tablas, mapear_columnas
+from bloques_pagina import clasificar_bloques
+from clasificador_enlaces import ClasificadorEnlaces
+from escaner_enlaces import EscanerEnlaces
+from descubrimiento_sitemap import DescubridorSitemap
+from frontera_rastreo import FronteraRastreo, PresupuestoSitio
+from descargas import descargar
+from normalizacion_contactos import normalizar_contactos, deduplicar_contactos
 
 class AgenteContactos:
-    def __init__(self, download_path="downloads"):
+    def __init__(self, download_path="downloads", buscador=None):
         self.download_path = os.path.abspath(download_path)
         if not os.path.exists(self.download_path):
             os.makedirs(self.download_path)
         
-        # Palabras clave específicas para encontrar directorios de empleados
-        self.palabras_directorio = [
-            'organigrama', 'directorio', 'directorio institucional',
-            'funcionarios', 'autoridades', 'personal directivo',
-            'estructura organizacional', 'quien es quien',
-            'conocenos', 'conozcanos', 'quienes somos',
-            'estructura administrativa', 'gobierno',
-            'directorio telefonico', 'staff', 'personal',
-            'directorio de funcionarios', 'directorio de personal',
-            'estructura orgánica', 'servidores públicos'
-        ]
+        # Escáner de enlaces de directorio (palabras clave ponderadas, un solo matcher)
+        self.escaner_enlaces = EscanerEnlaces()
         
-        # Palabras a evitar (contacto general de la secretaría)
-        self.palabras_evitar = [
-            'contacto', 'contactanos', 'atencion al publico',
-            'tramites', 'servicios', 'quejas', 'sugerencias',
-            'contacto general', 'información general',
-            'atención ciudadana', 'mesa de ayuda'
-        ]
+        # Descubrimiento por robots.txt/sitemaps y ritmo por sitio según Crawl-delay
+        self.descubridor_sitemap = DescubridorSitemap(self.escaner_enlaces)
+        self.limitadores_sitio = {}
         
-        # Patrones de extracción
-        self.patron_email = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        self.patron_telefono = r'(\(?[0-9]{2,3}\)?[-.\s]?[0-9]{3,4}[-.\s]?[0-9]{4})'
-        self.patron_extension = r'(?:ext|extensión|extension)\.?\s*([0-9]{2,5})'
+        # Rastreo best-first: se detiene al encontrar una página con al menos estos contactos
+        self.min_contactos_directorio = 5
+        
+        # Patrones de extracción (compilados una sola vez)
+        self.patron_email = PATRON_EMAIL
+        self.patron_telefono = PATRON_TELEFONO
+        self.patron_extension = PATRON_EXTENSION
+        self.extractor = ExtractorContactos()
+        
+        # Clasificación de enlaces por HEAD / bytes mágicos (con caché)
+        self.clasificador_enlaces = ClasificadorEnlaces()
+        
+        # Caché persistente y registro local de URLs oficiales
+        self.resolvedor_urls = ResolvedorURLOficial()
+        
+        # Proveedor de búsqueda: caché → HTTP; el navegador sólo arranca si HTTP no da un .gob.mx
+        # confiable o tarda más de 10s (inyectable, p. ej. ProveedorFixture sin red)
+        self.buscador = buscador or ProveedorCache(ProveedorConcurrente([
+            ProveedorHTTP(),
+            ProveedorNavegador(self.crear_driver_avanzado)
+        ], espera_escalonada=10))
+        
+        # Extracción de PDFs por página en pool de procesos
+        self.procesador_pdf = ProcesadorPDF()
+        
+        # OCR en pool de procesos para imágenes y PDFs escaneados
+        self.motor_ocr = MotorOCR()
+        self.cache_ocr = CacheOCR()
     
     def set_download_path(self, new_path):
         """Actualiza la ruta de descarga"""
@@ -58,6 +86,40 @@ class AgenteContactos:
         if not os.path.exists(self.download_path):
             os.makedirs(self.download_path)
         
+    def limitador_sitio(self, url):
+        """Limitador de tasa compartido por todas las visitas a un mismo host"""
+        host = urlparse(url).netloc.lower()
+        if host not in self.limitadores_sitio:
+            # setdefault es atómico: entidades en paralelo comparten el mismo limitador por host
+            self.limitadores_sitio.setdefault(host, LimitadorTasa())
+        return self.limitadores_sitio[host]
+    
+    def aplicar_crawl_delay(self, url, crawl_delay, maximo=10):
+        """Ajusta el ritmo de visitas al host según el Crawl-delay de robots.txt (acotado)"""
+        if crawl_delay:
+            self.limitador_sitio(url).intervalo = min(crawl_delay, maximo)
+            print(f"   🐢 Crawl-delay de {urlparse(url).netloc}: {min(crawl_delay, maximo)}s")
+    
+    def descubrir_por_sitemap(self, url_base):
+        """Candidatos de directorio desde robots.txt y sitemaps, sin abrir el navegador"""
+        print("🗺️ Revisando robots.txt y sitemaps...")
+        descubrimiento = self.descubridor_sitemap.descubrir(url_base)
+        self.aplicar_crawl_delay(url_base, descubrimiento['crawl_delay'])
+        
+        enlaces = []
+        for candidato in descubrimiento['candidatos']:
+            texto = urlparse(candidato['url']).path.strip('/').split('/')[-1] or candidato['url']
+            enlaces.append({
+                'url': candidato['url'],
+                'texto': texto,
+                'tipo': self.determinar_tipo_contenido(candidato['url'], texto),
+                'fuente': 'sitemap',
+                'relevancia': candidato['puntaje'],
+                'confiable': candidato['confiable']
+            })
+            print(f"   🗺️ Sitemap ({candidato['puntaje']}): {candidato['url']}")
+        return enlaces
+    
     def crear_driver_avanzado(self, headless=False):
         """Driver con configuraciones avanzadas"""
         options = Options()
@@ -92,166 +154,22 @@ class AgenteContactos:
         
         return driver
 
-    def buscar_pagina_oficial_avanzada(self, nombre_entidad):
-        """Búsqueda avanzada con múltiples estrategias"""
+    def buscar_pagina_oficial_avanzada(self, nombre_entidad, estadisticas=None):
+        """Resuelve la página oficial: caché, registro local y búsqueda en vivo"""
         print(f"🔍 Búsqueda avanzada para: {nombre_entidad}")
-        
-        # Estrategia 1: Selenium + Google
-        url_selenium = self.buscar_con_selenium(nombre_entidad)
-        if url_selenium:
-            return url_selenium
-        
-        # Estrategia 2: Requests + Google (fallback)
-        url_requests = self.buscar_con_requests(nombre_entidad)
-        if url_requests:
-            return url_requests
-        
-        return None
+        return self.resolvedor_urls.resolver(nombre_entidad, self.buscar_pagina_oficial_en_vivo, estadisticas)
 
-    def buscar_con_selenium(self, nombre_entidad):
-        """Búsqueda usando Selenium"""
-        driver = self.crear_driver_avanzado(headless=False)
-        
-        try:
-            print("📄 Usando Selenium para búsqueda...")
-            driver.get("https://www.google.com")
-            time.sleep(2)
-            
-            # Manejar cookies
-            try:
-                cookie_btn = driver.find_element(By.XPATH, "//button[contains(text(), 'Acepto') or contains(text(), 'Accept')]")
-                cookie_btn.click()
-                time.sleep(1)
-            except:
-                pass
-            
-            # Buscar
-            search_box = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.NAME, "q"))
-            )
-            
-            # Búsqueda simple solo con el nombre de la entidad
-            consultas = [
-                f'{nombre_entidad}'
-            ]
-            
-            for consulta in consultas:
-                print(f"   🔍 Probando: {consulta}")
-                
-                search_box.clear()
-                search_box.send_keys(consulta)
-                search_box.send_keys(Keys.RETURN)
-                time.sleep(3)
-                
-                # Tomar el PRIMER resultado (generalmente es el correcto)
-                try:
-                    resultados = driver.find_elements(By.CSS_SELECTOR, "h3")
-                    if resultados:
-                        primer_resultado = resultados[0]
-                        try:
-                            link = primer_resultado.find_element(By.XPATH, "./ancestor::a")
-                            url = link.get_attribute("href")
-                            titulo = primer_resultado.text
-                            
-                            print(f"   📋 Primer resultado: '{titulo}'")
-                            print(f"   🔗 URL: {url}")
-                            
-                            # Validar que sea una URL válida
-                            if url and not any(x in url for x in ['youtube.com', 'facebook.com', 'twitter.com']):
-                                url_limpia = self.limpiar_url_google(url)
-                                print(f"   ✅ Seleccionando primer resultado: {url_limpia}")
-                                return url_limpia
-                                
-                        except Exception as e:
-                            print(f"   ⚠️ Error procesando primer resultado: {e}")
-                            
-                    # Si el primer resultado falla, probar los siguientes
-                    print("   🔄 Primer resultado falló, probando siguientes...")
-                    for i, resultado in enumerate(resultados[1:4], 2):
-                        try:
-                            link = resultado.find_element(By.XPATH, "./ancestor::a")
-                            url = link.get_attribute("href")
-                            titulo = resultado.text
-                            
-                            if self.es_url_relevante(url, titulo, nombre_entidad):
-                                url_limpia = self.limpiar_url_google(url)
-                                print(f"   ✅ Resultado #{i} seleccionado: {url_limpia}")
-                                return url_limpia
-                                
-                        except Exception:
-                            continue
-                            
-                except Exception as e:
-                    print(f"   ❌ Error obteniendo resultados: {e}")
-            
+    def buscar_pagina_oficial_en_vivo(self, nombre_entidad):
+        """Búsqueda en vivo a través del proveedor de búsqueda configurado"""
+        resultados = self.buscador.buscar(nombre_entidad)
+        if not resultados:
             return None
-            
-        except Exception as e:
-            print(f"❌ Error en Selenium: {e}")
-            return None
-        finally:
-            driver.quit()
-
-    def buscar_con_requests(self, nombre_entidad):
-        """Búsqueda usando requests como fallback"""
-        print("📄 Usando requests como fallback...")
         
-        try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            
-            query = f"{nombre_entidad}"
-            url = f"https://www.google.com/search?q={query}"
-            
-            response = requests.get(url, headers=headers)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Buscar primer enlace válido en resultados
-            enlaces_encontrados = []
-            for link in soup.find_all('a', href=True):
-                href = link['href']
-                if '/url?q=' in href:
-                    url_real = href.split('/url?q=')[1].split('&')[0]
-                    if url_real and not any(x in url_real for x in ['youtube.com', 'facebook.com', 'twitter.com']):
-                        enlaces_encontrados.append((url_real, link.text))
-            
-            # Tomar el primer enlace válido
-            if enlaces_encontrados:
-                url_real, titulo = enlaces_encontrados[0]
-                print(f"   📋 Primer resultado (requests): '{titulo[:50]}...'")
-                print(f"   ✅ URL seleccionada: {url_real}")
-                return url_real
-            
-            return None
-            
-        except Exception as e:
-            print(f"❌ Error en requests: {e}")
-            return None
-
-    def es_url_relevante(self, url, titulo, nombre_entidad):
-        """Evalúa si una URL es relevante"""
-        if not url or 'youtube.com' in url or 'facebook.com' in url:
-            return False
-        
-        # Priorizar dominios oficiales
-        if '.gob.mx' in url or '.gov.mx' in url:
-            return True
-        
-        # Evaluar similitud del título
-        from fuzzywuzzy import fuzz
-        similitud = fuzz.partial_ratio(nombre_entidad.lower(), titulo.lower())
-        return similitud >= 60
-
-    def limpiar_url_google(self, url):
-        """Limpia URLs de Google"""
-        if '/url?q=' in url:
-            try:
-                from urllib.parse import unquote
-                return unquote(url.split('/url?q=')[1].split('&')[0])
-            except:
-                pass
-        return url
+        # Tomar el primer resultado confiable (.gob.mx en los primeros lugares); si no hay, el PRIMERO
+        elegido = next((r for r in resultados if es_resultado_confiable(r)), resultados[0])
+        print(f"   📋 Resultado {elegido['posicion']} ({elegido['proveedor']}): '{elegido['titulo'][:50]}'")
+        print(f"   ✅ Seleccionando: {elegido['url']}")
+        return elegido['url']
 
     def buscar_en_menus_navegacion(self, url_base):
         """Busca enlaces de directorio en menús de navegación con búsqueda ampliada"""
@@ -259,6 +177,7 @@ class AgenteContactos:
         enlaces_encontrados = []
         
         try:
+            self.limitador_sitio(url_base).esperar()
             driver.get(url_base)
             time.sleep(5)
             
@@ -378,43 +297,87 @@ class AgenteContactos:
         
         contactos_totales = []
         
-        # Paso 1: Navegar por menús para encontrar directorio
-        print("🗺️ Navegando por menús de la página...")
-        enlaces_menu = self.buscar_en_menus_navegacion(url_base)
+        # Paso 0: robots.txt y sitemaps; con un acierto confiable no hace falta renderizar menús
+        enlaces_sitemap = self.descubrir_por_sitemap(url_base)
+        
+        if any(enlace['confiable'] for enlace in enlaces_sitemap):
+            print("✅ Directorio encontrado en sitemap, se omite la navegación por menús")
+            enlaces_menu = []
+            enlaces_directorio = []
+        else:
+            # Paso 1: Navegar por menús para encontrar directorio
+            print("🗺️ Navegando por menús de la página...")
+            enlaces_menu = self.buscar_en_menus_navegacion(url_base)
+            
+            # Paso 2: Buscar enlaces específicos de directorio en la página
+            print("🔗 Buscando enlaces de directorio/organigrama...")
+            enlaces_directorio = self.encontrar_enlaces_directorio_avanzado(url_base)
         
-        # Paso 2: Buscar enlaces específicos de directorio en la página
-        print("🔗 Buscando enlaces de directorio/organigrama...")
-        enlaces_directorio = self.encontrar_enlaces_directorio_avanzado(url_base)
+        # Combinar en una frontera best-first (URLs canónicas, sin revisitas)
+        todos_enlaces = enlaces_sitemap + enlaces_menu + enlaces_directorio
         
-        # Combinar y eliminar duplicados
-        todos_enlaces = enlaces_menu + enlaces_directorio
-        enlaces_unicos = []
-        urls_vistas = set()
-        for enlace in todos_enlaces:
-            if enlace['url'] not in urls_vistas:
-                enlaces_unicos.append(enlace)
-                urls_vistas.add(enlace['url'])
+        # Clasificar por Content-Type / bytes mágicos antes de abrir navegador o descargar
+        semillas = sorted(todos_enlaces, key=lambda e: e.get('relevancia', 0), reverse=True)
+        self.clasificador_enlaces.clasificar_lote(
+            [e for e in semillas[:20] if not self.es_expansion_menu(e, url_base)]
+        )
         
-        print(f"📁 Total enlaces únicos: {len(enlaces_unicos)}")
+        frontera = FronteraRastreo(url_base, PresupuestoSitio())
+        for enlace in semillas:
+            if self.es_expansion_menu(enlace, url_base):
+                enlace['clave'] = f"menu:{enlace['texto'].lower()}"
+            frontera.agregar(enlace)
         
-        # Paso 3: Explorar enlaces encontrados
-        for enlace in enlaces_unicos[:5]:
-            print(f"\n📂 Explorando: {enlace['texto']}")
+        print(f"📁 Total enlaces únicos: {len(frontera)}")
+        
+        # Paso 3: Explorar primero los enlaces más prometedores, siguiendo enlaces de segundo nivel.
+        # El OCR de imágenes corre en el motor de OCR mientras el rastreo sigue; sus contactos se
+        # recogen en cada vuelta (y al final se espera a los que falten)
+        verificacion_manual = []
+        ocr_pendiente = []
+        while True:
+            contactos_ocr = self.recoger_ocr(ocr_pendiente)
+            contactos_totales.extend(contactos_ocr)
+            if self.contactos_reales(contactos_ocr) >= self.min_contactos_directorio:
+                print(f"✅ Directorio encontrado por OCR con {self.contactos_reales(contactos_ocr)} contactos, se detiene la exploración")
+                break
+            enlace = frontera.siguiente()
+            if enlace is None:
+                break
+            
+            print(f"\n📂 Explorando (nivel {enlace['profundidad']}): {enlace['texto']}")
+            visita = {}
             
             # Si es un enlace de menú que puede tener submenú, expandirlo primero
-            if enlace['fuente'] == 'menu' and ('#' in enlace['url'] or enlace['url'] == url_base):
+            if self.es_expansion_menu(enlace, url_base):
                 print(f"   🗺️ Expandiendo menú: {enlace['texto']}")
-                contactos_submenu = self.explorar_submenu_directorio(url_base, enlace['texto'])
-                contactos_totales.extend(contactos_submenu)
-            elif enlace['tipo'] == 'pdf':
-                contactos_pdf = self.procesar_pdf_directorio(enlace['url'])
-                contactos_totales.extend(contactos_pdf)
-            elif enlace['tipo'] == 'imagen':
-                contactos_img = self.procesar_imagen_directorio(enlace['url'])
-                contactos_totales.extend(contactos_img)
+                contactos = self.explorar_submenu_directorio(url_base, enlace['texto'], ocr_pendiente)
             else:
-                contactos_html = self.procesar_pagina_directorio(enlace['url'])
-                contactos_totales.extend(contactos_html)
+                enlace['tipo'] = self.clasificador_enlaces.clasificar(enlace['url'], enlace['tipo'])
+                if enlace['tipo'] == 'pdf':
+                    contactos = self.procesar_pdf_directorio(enlace['url'], visita)
+                elif enlace['tipo'] == 'imagen':
+                    contactos = self.procesar_imagen_directorio(enlace['url'], ocr_pendiente, visita)
+                elif enlace['tipo'] == 'otro':
+                    print(f"   ⏭️ Contenido no procesable, se omite: {enlace['url']}")
+                    continue
+                else:
+                    contactos = self.procesar_pagina_directorio(enlace['url'], visita, ocr_pendiente)
+            
+            frontera.presupuesto.consumir(1, visita.get('bytes') or self.clasificador_enlaces.tamano(enlace['url']))
+            
+            reales = [c for c in contactos if c.get('fuente_tipo') != 'verificacion_manual']
+            verificacion_manual.extend(c for c in contactos if c.get('fuente_tipo') == 'verificacion_manual')
+            contactos_totales.extend(reales)
+            
+            if len(reales) >= self.min_contactos_directorio:
+                print(f"✅ Directorio encontrado con {len(reales)} contactos, se detiene la exploración")
+                break
+            
+            for nuevo in visita.get('enlaces', []):
+                frontera.agregar(nuevo, enlace['profundidad'] + 1)
+        
+        contactos_totales.extend(self.recoger_ocr(ocr_pendiente, esperar=True))
         
         # Paso 4: Fallback a página principal
         if not contactos_totales:
@@ -422,6 +385,10 @@ class AgenteContactos:
             contactos_main = self.analizar_pagina_principal(url_base)
             contactos_totales.extend(contactos_main)
         
+        # Sin contactos en ningún lado: dejar el enlace para verificación manual
+        if not contactos_totales:
+            contactos_totales.extend(verificacion_manual[:1])
+        
         # Procesar contactos
         if contactos_totales:
             df_contactos = self.procesar_contactos_encontrados(contactos_totales, nombre_entidad)
@@ -429,7 +396,31 @@ class AgenteContactos:
         
         return pd.DataFrame()
     
-    def explorar_submenu_directorio(self, url_base, texto_menu):
+    @staticmethod
+    def recoger_ocr(pendientes, esperar=False):
+        """Saca de pendientes los OCR terminados (o todos, con esperar) y devuelve sus contactos"""
+        contactos = []
+        for futuro in list(pendientes):
+            if esperar or futuro.done():
+                pendientes.remove(futuro)
+                contactos.extend(futuro.result())
+        return contactos
+    
+    @staticmethod
+    def sumar_bytes(visita, cantidad):
+        """Acumula bytes descargados en visita['bytes'] para el presupuesto del sitio"""
+        if visita is not None:
+            visita['bytes'] = visita.get('bytes', 0) + (cantidad or 0)
+    
+    @staticmethod
+    def contactos_reales(contactos):
+        return sum(1 for c in contactos if c.get('fuente_tipo') != 'verificacion_manual')
+    
+    def es_expansion_menu(self, enlace, url_base):
+        """Enlace de menú sin destino propio (ancla o la misma página): hay que desplegarlo"""
+        return enlace.get('fuente') == 'menu' and ('#' in enlace['url'] or enlace['url'] == url_base)
+    
+    def explorar_submenu_directorio(self, url_base, texto_menu, ocr_pendiente=None):
         """Explora submenús para encontrar directorio u organigrama"""
         print(f"🗺️ Explorando submenú de: {texto_menu}")
         
@@ -437,6 +428,7 @@ class AgenteContactos:
         contactos = []
         
         try:
+            self.limitador_sitio(url_base).esperar()
             driver.get(url_base)
             time.sleep(3)
             
@@ -482,15 +474,19 @@ class AgenteContactos:
                                     if href_sub.startswith('/'):
                                         href_sub = urljoin(url_base, href_sub)
                                     
-                                    # Procesar el enlace encontrado
-                                    if href_sub.endswith('.pdf'):
+                                    # Procesar el enlace encontrado según su tipo real
+                                    tipo = self.clasificador_enlaces.clasificar(
+                                        href_sub, self.determinar_tipo_contenido(href_sub, texto_sub))
+                                    if tipo == 'pdf':
                                         contactos_pdf = self.procesar_pdf_directorio(href_sub)
                                         contactos.extend(contactos_pdf)
-                                    elif any(ext in href_sub.lower() for ext in ['.jpg', '.jpeg', '.png', '.gif']):
-                                        contactos_img = self.procesar_imagen_directorio(href_sub)
+                                    elif tipo == 'imagen':
+                                        contactos_img = self.procesar_imagen_directorio(href_sub, ocr_pendiente)
                                         contactos.extend(contactos_img)
+                                    elif tipo == 'otro':
+                                        continue
                                     else:
-                                        contactos_html = self.procesar_pagina_directorio(href_sub)
+                                        contactos_html = self.procesar_pagina_directorio(href_sub, ocr_pendiente=ocr_pendiente)
                                         contactos.extend(contactos_html)
                                     
                                     # Si encontramos algo, no seguir buscando
@@ -522,43 +518,14 @@ class AgenteContactos:
         enlaces_encontrados = []
         
         try:
+            self.limitador_sitio(url_base).esperar()
             driver.get(url_base)
             time.sleep(5)
             
-            # Buscar todos los enlaces
-            todos_enlaces = driver.find_elements(By.TAG_NAME, "a")
-            
-            for enlace in todos_enlaces:
-                try:
-                    href = enlace.get_attribute("href")
-                    texto = enlace.text.strip().lower()
-                    
-                    if not href or not texto:
-                        continue
-                    
-                    # Evaluar si es enlace de directorio
-                    es_directorio = any(palabra in texto for palabra in self.palabras_directorio)
-                    es_contacto_general = any(palabra in texto for palabra in self.palabras_evitar)
-                    
-                    if es_directorio and not es_contacto_general:
-                        # Determinar tipo de contenido
-                        tipo = self.determinar_tipo_contenido(href, texto)
-                        
-                        # Convertir a URL absoluta
-                        if href.startswith('/'):
-                            href = urljoin(url_base, href)
-                        
-                        enlaces_encontrados.append({
-                            'url': href,
-                            'texto': enlace.text.strip(),
-                            'tipo': tipo,
-                            'relevancia': len([p for p in self.palabras_directorio if p in texto])
-                        })
-                        
-                        print(f"   🎯 Encontrado ({tipo}): {texto[:50]}...")
-                
-                except Exception:
-                    continue
+            # Escanear todos los enlaces en una sola llamada al navegador
+            enlaces_encontrados = self.enlaces_directorio_en_pagina(driver, url_base)
+            for enlace in enlaces_encontrados:
+                print(f"   🎯 Encontrado ({enlace['tipo']}): {enlace['texto'][:50]}...")
             
             # Ordenar por relevancia
             enlaces_encontrados.sort(key=lambda x: x['relevancia'], reverse=True)
@@ -572,6 +539,19 @@ class AgenteContactos:
         finally:
             driver.quit()
 
+    def enlaces_directorio_en_pagina(self, driver, url_pagina):
+        """Enlaces candidatos a directorio de la página cargada, con tipo estimado"""
+        enlaces = []
+        for candidato in self.escaner_enlaces.escanear(driver, url_pagina):
+            enlaces.append({
+                'url': candidato['url'],
+                'texto': candidato['texto'],
+                'tipo': self.determinar_tipo_contenido(candidato['url'], candidato['texto']),
+                'fuente': 'enlace',
+                'relevancia': candidato['puntaje']
+            })
+        return enlaces
+
     def determinar_tipo_contenido(self, url, texto):
         """Determina el tipo de contenido del enlace"""
         url_lower = url.lower()
@@ -586,38 +566,26 @@ class AgenteContactos:
         else:
             return 'html'
 
-    def procesar_pdf_directorio(self, url_pdf):
-        """Procesa PDFs de organigrama/directorio con extracción mejorada"""
+    def procesar_pdf_directorio(self, url_pdf, visita=None):
+        """Procesa PDFs de organigrama/directorio página por página en paralelo.
+        
+        Con el dict visita, sus bytes descargados se suman a visita['bytes'].
+        """
         print(f"📄 Procesando PDF: {url_pdf}")
         contactos = []
         
         try:
-            headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-            response = requests.get(url_pdf, headers=headers, timeout=30)
+            paginas = self.procesador_pdf.procesar_url(
+                url_pdf,
+                lambda texto: self.extraer_contactos_pdf_avanzado(texto, url_pdf),
+                self.procesar_pdf_como_imagen,
+                lambda tamano: self.sumar_bytes(visita, tamano)
+            )
+            for num_pagina, contactos_pagina in paginas:
+                print(f"   📄 Página {num_pagina + 1}: {len(contactos_pagina)} contactos")
+                contactos.extend(contactos_pagina)
             
-            if response.status_code == 200:
-                pdf_file = io.BytesIO(response.content)
-                pdf_reader = PyPDF2.PdfReader(pdf_file)
-                
-                print(f"   📄 PDF con {len(pdf_reader.pages)} páginas")
-                
-                texto_completo = ""
-                for i, page in enumerate(pdf_reader.pages):
-                    try:
-                        texto_pagina = page.extract_text()
-                        texto_completo += f"\n--- Página {i+1} ---\n{texto_pagina}\n"
-                    except Exception as e:
-                        print(f"   ⚠️ Error en página {i+1}: {e}")
-                        continue
-                
-                if texto_completo.strip():
-                    # Extraer contactos con patrones mejorados
-                    contactos = self.extraer_contactos_pdf_avanzado(texto_completo, url_pdf)
-                    print(f"   ✅ PDF procesado: {len(contactos)} contactos extraidos")
-                else:
-                    print(f"   ⚠️ PDF sin texto extraible (posible imagen)")
-                    # Intentar OCR si el PDF es una imagen
-                    contactos = self.procesar_pdf_como_imagen(pdf_file, url_pdf)
+            print(f"   ✅ PDF procesado: {len(contactos)} contactos extraidos")
                 
         except Exception as e:
             print(f"   ❌ Error procesando PDF: {e}")
@@ -625,177 +593,169 @@ class AgenteContactos:
         return contactos
     
     def extraer_contactos_pdf_avanzado(self, texto, url_fuente):
-        """Extrae contactos de texto PDF con patrones avanzados"""
-        contactos = []
-        
-        # Patrones mejorados
-        patron_email = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        patron_telefono = r'(?:teléfono|tel|phone)?:?\s*([\(]?\d{2,3}[\)]?[\s.-]?\d{3,4}[\s.-]?\d{4})'
-        patron_extension = r'(?:ext|extensión|extension)\.?\s*([0-9]{2,5})'
-        
-        # Dividir en líneas para mejor procesamiento
-        lineas = texto.split('\n')
-        
-        contacto_actual = {'nombre': '', 'cargo': '', 'email': '', 'telefono': '', 'extension': ''}
-        
-        for i, linea in enumerate(lineas):
-            linea = linea.strip()
-            if not linea:
-                continue
-            
-            # Buscar emails
-            emails = re.findall(patron_email, linea)
-            if emails:
-                contacto_actual['email'] = emails[0]
-            
-            # Buscar teléfonos
-            telefonos = re.findall(patron_telefono, linea)
-            if telefonos:
-                contacto_actual['telefono'] = telefonos[0]
-            
-            # Buscar extensiones
-            extensiones = re.findall(patron_extension, linea)
-            if extensiones:
-                contacto_actual['extension'] = extensiones[0]
-            
-            # Identificar cargos (líneas con palabras clave de cargos)
-            cargos_keywords = ['director', 'coordinador', 'jefe', 'secretario', 'titular', 'responsable']
-            if any(cargo in linea.lower() for cargo in cargos_keywords):
-                contacto_actual['cargo'] = linea
-            
-            # Identificar nombres (líneas que parecen nombres)
-            elif re.match(r'^[A-Z][a-z]+ [A-Z][a-z]+', linea) and len(linea.split()) >= 2:
-                contacto_actual['nombre'] = linea
-            
-            # Si tenemos suficiente información, guardar contacto
-            if contacto_actual['email'] or contacto_actual['telefono']:
-                if contacto_actual['nombre'] or contacto_actual['cargo']:
-                    contactos.append({
-                        'nombre': contacto_actual['nombre'],
-                        'cargo': contacto_actual['cargo'],
-                        'email': contacto_actual['email'],
-                        'telefono': contacto_actual['telefono'],
-                        'extension': contacto_actual['extension'],
-                        'fuente_url': url_fuente,
-                        'fuente_tipo': 'pdf'
-                    })
-                    
-                    # Resetear para siguiente contacto
-                    contacto_actual = {'nombre': '', 'cargo': '', 'email': '', 'telefono': '', 'extension': ''}
-        
-        return contactos
+        """Extrae contactos de texto PDF con el tokenizador compilado"""
+        return self.extractor.extraer(texto, url_fuente, fuente_tipo='pdf')
     
-    def procesar_pdf_como_imagen(self, pdf_file, url_fuente):
-        """Procesa PDF como imagen usando OCR"""
-        contactos = []
+    def procesar_pdf_como_imagen(self, ruta_pdf, paginas):
+        """Aplica OCR a las páginas indicadas de un PDF escaneado; devuelve {página: texto}"""
+        textos = {}
         try:
-            import fitz  # PyMuPDF
-            doc = fitz.open(stream=pdf_file.getvalue(), filetype="pdf")
-            
-            for page_num in range(len(doc)):
-                page = doc.load_page(page_num)
-                pix = page.get_pixmap()
-                img_data = pix.tobytes("png")
+            # Consultar la caché antes de cualquier llamada a Tesseract
+            hash_pdf = hash_archivo(ruta_pdf)
+            config = clave_config(tipo='pdf', lang=self.motor_ocr.lang, dpi=self.motor_ocr.dpi,
+                                  max_pixeles=self.motor_ocr.max_pixeles)
+            pendientes = []
+            for num in paginas:
+                resultado = self.cache_ocr.obtener(f"{hash_pdf}:{num}", config)
+                if resultado is None:
+                    pendientes.append(num)
+                elif resultado['texto'].strip():
+                    textos[num] = resultado['texto']
+            
+            if len(pendientes) < len(paginas):
+                print(f"   💾 OCR desde caché: {len(paginas) - len(pendientes)} páginas")
+            
+            if pendientes:
+                import fitz  # noqa: F401 - PyMuPDF rasteriza en los workers de OCR
                 
-                # OCR con pytesseract
-                imagen = Image.open(io.BytesIO(img_data))
-                texto_ocr = pytesseract.image_to_string(imagen, lang='spa')
-                
-                if texto_ocr.strip():
-                    contactos_pagina = self.extraer_contactos_de_texto(texto_ocr, url_fuente)
-                    contactos.extend(contactos_pagina)
+                resultados = self.motor_ocr.reconocer_paginas_pdf(ruta_pdf, pendientes)
+                for num, resultado in resultados.items():
+                    self.cache_ocr.guardar(f"{hash_pdf}:{num}", config, resultado)
+                    if resultado['texto'].strip():
+                        textos[num] = resultado['texto']
             
-            doc.close()
-            print(f"   ✅ OCR procesado: {len(contactos)} contactos")
+            print(f"   ✅ OCR procesado: {len(textos)} páginas con texto")
             
         except ImportError:
             print(f"   ⚠️ PyMuPDF no disponible para OCR")
         except Exception as e:
             print(f"   ❌ Error en OCR: {e}")
         
-        return contactos
+        return textos
 
-    def procesar_imagen_directorio(self, url_imagen):
-        """Procesa imágenes de organigrama usando OCR mejorado"""
+    def procesar_imagen_directorio(self, url_imagen, pendientes=None, visita=None):
+        """Procesa imágenes de organigrama usando OCR mejorado.
+        
+        Con una lista en pendientes, el OCR queda encolado (se agrega su Future) y se devuelve []
+        de inmediato para que el rastreo siga; sin ella se espera el resultado.
+        Con el dict visita, los bytes de la imagen se suman a visita['bytes'].
+        """
+        futuro = self.enviar_imagen_directorio(url_imagen, visita)
+        if pendientes is not None:
+            pendientes.append(futuro)
+            return []
+        return futuro.result()
+    
+    def enviar_imagen_directorio(self, url_imagen, visita=None):
+        """Descarga la imagen y encola su OCR; devuelve un Future con los contactos extraídos"""
         print(f"🖼️ Procesando imagen: {url_imagen}")
-        contactos = []
+        contactos = Future()
         
         try:
-            headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-            response = requests.get(url_imagen, headers=headers, timeout=30)
+            # Descarga en streaming a archivo temporal con límite de tamaño y validación de tipo
+            descarga = descargar(url_imagen, 'imagen')
+            if not descarga:
+                contactos.set_result([])
+                return contactos
+            self.sumar_bytes(visita, descarga.tamano)
+            
+            # Cargar imagen desde el archivo y liberar el temporal
+            with descarga:
+                clave = hash_archivo(descarga.ruta)
+                imagen = Image.open(descarga.ruta)
+                imagen.load()
+            
+            # OCR con configuración optimizada
+            config_ocr = '--oem 3 --psm 6 -c tessedit_char_whitelist=ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyzÁÉÍÓÚáéíóúñÑ 0123456789@.-_()'
+            
+            # Consultar la caché por hash de contenido (y perceptual) antes de Tesseract
+            config = clave_config(tipo='imagen', lang=self.motor_ocr.lang, config=config_ocr,
+                                  max_pixeles=self.motor_ocr.max_pixeles, preproceso=VERSION_PREPROCESO)
+            phash = hash_perceptual(imagen)
+            resultado = self.cache_ocr.obtener(clave, config, phash)
+            
+            if resultado is not None:
+                print(f"   💾 OCR desde caché")
+                contactos.set_result(self.contactos_de_ocr(resultado, url_imagen))
+                return contactos
             
-            if response.status_code == 200:
-                # Cargar y procesar imagen
-                imagen = Image.open(io.BytesIO(response.content))
-                
-                # Mejorar imagen para OCR
-                imagen = self.mejorar_imagen_para_ocr(imagen)
-                
-                # OCR con configuración optimizada
-                config_ocr = '--oem 3 --psm 6 -c tessedit_char_whitelist=ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyzÁÉÍÓÚáéíóúñÑ 0123456789@.-_()'
-                texto_ocr = pytesseract.image_to_string(imagen, lang='spa', config=config_ocr)
-                
-                print(f"   🔍 Texto OCR extraido: {len(texto_ocr)} caracteres")
-                
-                if texto_ocr.strip():
-                    # Extraer contactos del texto OCR
-                    contactos = self.extraer_contactos_de_texto(texto_ocr, url_imagen)
-                    print(f"   ✅ Imagen procesada: {len(contactos)} contactos")
-                else:
-                    print(f"   ⚠️ No se pudo extraer texto de la imagen")
-                
+            # Preprocesar (en el worker de OCR) y reconocer sin esperar el resultado
+            futuro_ocr = self.motor_ocr.reconocer_imagen(imagen, config=config_ocr,
+                                                         preproceso=self.opciones_preproceso_ocr())
+            
+            def ocr_terminado(futuro):
+                try:
+                    resultado = futuro.result()
+                    self.cache_ocr.guardar(clave, config, resultado, phash)
+                    contactos.set_result(self.contactos_de_ocr(resultado, url_imagen))
+                except Exception as e:
+                    print(f"   ❌ Error procesando imagen: {e}")
+                    contactos.set_result([])
+            
+            futuro_ocr.add_done_callback(ocr_terminado)
+        
         except Exception as e:
             print(f"   ❌ Error procesando imagen: {e}")
+            contactos.set_result([])
         
         return contactos
     
-    def mejorar_imagen_para_ocr(self, imagen):
-        """Mejora la imagen para mejor reconocimiento OCR"""
-        try:
-            # Convertir a escala de grises
-            if imagen.mode != 'L':
-                imagen = imagen.convert('L')
-            
-            # Redimensionar si es muy pequeña
-            width, height = imagen.size
-            if width < 1000 or height < 1000:
-                factor = max(1000/width, 1000/height)
-                new_size = (int(width * factor), int(height * factor))
-                imagen = imagen.resize(new_size, Image.Resampling.LANCZOS)
-            
-            # Mejorar contraste
-            from PIL import ImageEnhance
-            enhancer = ImageEnhance.Contrast(imagen)
-            imagen = enhancer.enhance(2.0)
-            
-            return imagen
-        except:
-            return imagen
+    def contactos_de_ocr(self, resultado, url_imagen):
+        """Contactos a partir del texto OCR de una imagen"""
+        texto_ocr = resultado['texto']
+        print(f"   🔍 Texto OCR extraido ({url_imagen}): {len(texto_ocr)} caracteres")
+        
+        if not texto_ocr.strip():
+            print(f"   ⚠️ No se pudo extraer texto de la imagen")
+            return []
+        contactos = self.extraer_contactos_de_texto(texto_ocr, url_imagen)
+        print(f"   ✅ Imagen procesada: {len(contactos)} contactos")
+        return contactos
+    
+    def opciones_preproceso_ocr(self):
+        """Recorte, DPI objetivo, enderezado y umbral adaptativo, con los límites del motor de OCR"""
+        return {'dpi_objetivo': self.motor_ocr.dpi, 'max_pixeles': self.motor_ocr.max_pixeles}
 
-    def procesar_pagina_directorio(self, url_pagina):
-        """Procesa páginas de directorio en todos los formatos evitando footer"""
+    def procesar_pagina_directorio(self, url_pagina, visita=None, ocr_pendiente=None):
+        """Procesa páginas de directorio en todos los formatos evitando footer.
+        
+        Si se pasa el dict visita, se llena con los bytes de la página (más los PDFs e imágenes que
+        se descarguen desde ella) y sus enlaces de directorio.
+        Con ocr_pendiente, las imágenes de organigrama se encolan ahí en vez de esperar su OCR.
+        """
         print(f"🌐 Procesando página: {url_pagina}")
         contactos = []
         
         driver = self.crear_driver_avanzado(headless=True)
         
         try:
+            self.limitador_sitio(url_pagina).esperar()
             driver.get(url_pagina)
             time.sleep(5)
+            html = driver.page_source
+            
+            self.sumar_bytes(visita, len(html.encode('utf-8')))
+            if visita is not None:
+                visita['enlaces'] = self.enlaces_directorio_en_pagina(driver, url_pagina)
+            
+            # Footer, posición y visibilidad de tablas y contenido en un solo script
+            bloques = clasificar_bloques(driver)
             
             # ESTRATEGIA 1: Buscar texto estructurado (evitando footer)
             print(f"   🔍 Buscando contactos en texto...")
-            contactos_texto = self.extraer_contactos_contenido_principal(driver, url_pagina)
+            contactos_texto = self.extraer_contactos_contenido_principal(driver, url_pagina, bloques)
             if contactos_texto:
                 contactos.extend(contactos_texto)
                 print(f"   ✅ Encontrados en texto: {len(contactos_texto)} contactos")
             
-            # ESTRATEGIA 2: Buscar tablas (evitando footer)
+            # ESTRATEGIA 2: Buscar tablas (evitando footer) sobre un solo snapshot del HTML
             if not contactos:
                 print(f"   🔍 Buscando tablas de directorio...")
-                tablas = driver.find_elements(By.TAG_NAME, "table")
+                tablas = [t for t in analizar_tablas(html) if t['es_directorio']]
+                info_tablas = bloques['tablas']
                 for tabla in tablas:
-                    if not self.esta_en_footer(tabla, driver) and self.es_tabla_directorio(tabla):
+                    info = info_tablas[tabla['indice']] if tabla['indice'] < len(info_tablas) else None
+                    if not self.esta_en_footer(info):
                         contactos_tabla = self.extraer_contactos_tabla_avanzada(tabla, url_pagina)
                         if contactos_tabla:
                             contactos.extend(contactos_tabla)
@@ -815,7 +775,7 @@ class AgenteContactos:
                         palabras_directorio_pdf = ['directorio', 'organigrama', 'funcionarios', 'personal', 'estructura']
                         if any(palabra in texto for palabra in palabras_directorio_pdf):
                             print(f"   📄 PDF encontrado: {texto} -> {href}")
-                            contactos_pdf = self.procesar_pdf_directorio(href)
+                            contactos_pdf = self.procesar_pdf_directorio(href, visita)
                             if contactos_pdf:
                                 contactos.extend(contactos_pdf)
                                 print(f"   ✅ Encontrados en PDF: {len(contactos_pdf)} contactos")
@@ -836,7 +796,7 @@ class AgenteContactos:
                         
                         if any(palabra in texto for palabra in ['organigrama', 'directorio', 'estructura']) or 'organigrama' in href.lower():
                             print(f"   🖼️ Imagen encontrada: {texto} -> {href}")
-                            contactos_img = self.procesar_imagen_directorio(href)
+                            contactos_img = self.procesar_imagen_directorio(href, ocr_pendiente, visita)
                             if contactos_img:
                                 contactos.extend(contactos_img)
                                 print(f"   ✅ Encontrados en imagen: {len(contactos_img)} contactos")
@@ -867,50 +827,24 @@ class AgenteContactos:
         
         return contactos
     
-    def esta_en_footer(self, elemento, driver):
-        """Verifica si un elemento está en el footer de la página"""
-        try:
-            # Selectores comunes de footer
-            selectores_footer = ['footer', '.footer', '#footer', '.pie', '.bottom', '.contact-info']
-            
-            for selector in selectores_footer:
-                try:
-                    footers = driver.find_elements(By.CSS_SELECTOR, selector)
-                    for footer in footers:
-                        if footer.find_elements(By.XPATH, ".//table") and elemento in footer.find_elements(By.XPATH, ".//table"):
-                            return True
-                except:
-                    continue
-            
-            # Verificar por posición (si está en el último 20% de la página)
-            page_height = driver.execute_script("return document.body.scrollHeight")
-            element_position = driver.execute_script("return arguments[0].offsetTop;", elemento)
-            
-            if element_position > (page_height * 0.8):
-                return True
-                
-        except:
-            pass
-        
-        return False
+    def esta_en_footer(self, info_bloque):
+        """Verifica con la clasificación de clasificar_bloques si un bloque está en el footer"""
+        if not info_bloque:
+            return False
+        return info_bloque['en_footer']
     
-    def extraer_contactos_contenido_principal(self, driver, url_fuente):
+    def extraer_contactos_contenido_principal(self, driver, url_fuente, bloques=None):
         """Extrae contactos solo del contenido principal, evitando footer"""
         contactos = []
         
         try:
-            # Buscar en el contenido principal, evitando footer
-            selectores_contenido = ['main', '.main', '#main', '.content', '#content', '.container', 'article']
-            
+            # Primer bloque de contenido principal visible y fuera del footer
+            bloques = bloques or clasificar_bloques(driver)
             contenido_principal = None
-            for selector in selectores_contenido:
-                try:
-                    elementos = driver.find_elements(By.CSS_SELECTOR, selector)
-                    if elementos:
-                        contenido_principal = elementos[0]
-                        break
-                except:
-                    continue
+            for bloque in bloques['contenido']:
+                if bloque['visible'] and not bloque['dentro_footer']:
+                    contenido_principal = driver.find_element(By.CSS_SELECTOR, bloque['selector'])
+                    break
             
             if contenido_principal:
                 texto_contenido = contenido_principal.text
@@ -949,42 +883,21 @@ class AgenteContactos:
         
         return contactos
 
-    def es_tabla_directorio(self, tabla):
-        """Evalúa si una tabla contiene directorio"""
-        try:
-            texto_tabla = tabla.text.lower()
-            indicadores = ['nombre', 'cargo', 'email', 'telefono', 'director', 'coordinador']
-            coincidencias = sum(1 for ind in indicadores if ind in texto_tabla)
-            return coincidencias >= 3
-        except:
-            return False
-
     def extraer_contactos_tabla_avanzada(self, tabla, url_fuente):
-        """Extrae contactos de tabla con análisis avanzado"""
+        """Extrae contactos de una tabla parseada mapeando columnas por encabezado"""
         contactos = []
         
         try:
-            filas = tabla.find_elements(By.TAG_NAME, "tr")
-            if len(filas) < 2:
+            if not tabla['filas']:
                 return contactos
             
-            # Analizar headers
-            primera_fila = filas[0]
-            headers = [cel.text.strip().lower() for cel in primera_fila.find_elements(By.TAG_NAME, ["th", "td"])]
-            
             # Mapear columnas
-            indices = {
-                'nombre': self.encontrar_indice_columna(headers, ['nombre', 'funcionario']),
-                'cargo': self.encontrar_indice_columna(headers, ['cargo', 'puesto']),
-                'email': self.encontrar_indice_columna(headers, ['email', 'correo']),
-                'telefono': self.encontrar_indice_columna(headers, ['telefono', 'tel'])
-            }
+            indices = mapear_columnas(tabla['encabezados'])
+            minimo_celdas = max([i for i in indices.values() if i is not None], default=0)
             
             # Procesar filas de datos
-            for fila in filas[1:]:
-                celdas = fila.find_elements(By.TAG_NAME, ["td", "th"])
-                
-                if len(celdas) >= max([i for i in indices.values() if i is not None], default=[0]):
+            for celdas in tabla['filas']:
+                if len(celdas) > minimo_celdas:
                     contacto = self.extraer_contacto_de_fila(celdas, indices, url_fuente)
                     if contacto:
                         contactos.append(contacto)
@@ -994,15 +907,8 @@ class AgenteContactos:
         
         return contactos
 
-    def encontrar_indice_columna(self, headers, palabras_buscar):
-        """Encuentra índice de columna por palabras clave"""
-        for i, header in enumerate(headers):
-            if any(palabra in header for palabra in palabras_buscar):
-                return i
-        return None
-
     def extraer_contacto_de_fila(self, celdas, indices, url_fuente):
-        """Extrae contacto de una fila de tabla"""
+        """Extrae contacto de una fila de tabla (lista de textos de celda)"""
         try:
             contacto = {
                 'nombre': '',
@@ -1015,14 +921,14 @@ class AgenteContactos:
             
             for campo, indice in indices.items():
                 if indice is not None and indice < len(celdas):
-                    valor = celdas[indice].text.strip()
+                    valor = celdas[indice].strip()
                     
                     # Limpiar y validar datos según el campo
                     if campo == 'email':
-                        email_match = re.search(self.patron_email, valor)
+                        email_match = self.patron_email.search(valor)
                         contacto[campo] = email_match.group() if email_match else valor
                     elif campo == 'telefono':
-                        tel_match = re.search(self.patron_telefono, valor)
+                        tel_match = self.patron_telefono.search(valor)
                         contacto[campo] = tel_match.group() if tel_match else valor
                     else:
                         contacto[campo] = valor
@@ -1037,7 +943,7 @@ class AgenteContactos:
         return None
 
     def extraer_contactos_de_texto(self, texto, url_fuente):
-        """Extrae contactos de texto libre con patrones avanzados"""
+        """Extrae contactos de texto libre en una sola pasada del tokenizador"""
         contactos = []
         
         try:
@@ -1046,79 +952,7 @@ class AgenteContactos:
                 soup = BeautifulSoup(texto, 'html.parser')
                 texto = soup.get_text()
             
-            # Buscar todos los emails
-            emails = re.findall(self.patron_email, texto)
-            
-            # Buscar todos los teléfonos
-            telefonos = re.findall(self.patron_telefono, texto)
-            
-            # Intentar asociar emails/teléfonos con nombres y cargos
-            lineas = texto.split('\n')
-            
-            contacto_actual = {
-                'nombre': '',
-                'cargo': '',
-                'email': '',
-                'telefono': '',
-                'fuente_url': url_fuente,
-                'fuente_tipo': 'texto'
-            }
-            
-            for i, linea in enumerate(lineas):
-                linea = linea.strip()
-                if not linea:
-                    continue
-                
-                # Buscar email en la línea
-                email_match = re.search(self.patron_email, linea)
-                if email_match:
-                    contacto_actual['email'] = email_match.group()
-                
-                # Buscar teléfono en la línea
-                tel_match = re.search(self.patron_telefono, linea)
-                if tel_match:
-                    contacto_actual['telefono'] = tel_match.group()
-                
-                # Identificar nombres y cargos
-                if any(palabra in linea.lower() for palabra in ['director', 'coordinador', 'secretario', 'jefe']):
-                    contacto_actual['cargo'] = linea
-                elif not any(char in linea for char in ['@', 'tel', 'ext', ':']):
-                    if not contacto_actual['nombre'] and len(linea.split()) >= 2:
-                        contacto_actual['nombre'] = linea
-                
-                # Si tenemos suficiente información, guardar contacto
-                if (contacto_actual['email'] or contacto_actual['telefono']) and contacto_actual['nombre']:
-                    contactos.append(contacto_actual.copy())
-                    contacto_actual = {
-                        'nombre': '',
-                        'cargo': '',
-                        'email': '',
-                        'telefono': '',
-                        'fuente_url': url_fuente,
-                        'fuente_tipo': 'texto'
-                    }
-            
-            # Agregar contactos simples si no encontramos estructura
-            if not contactos:
-                for email in emails[:10]:
-                    contactos.append({
-                        'nombre': '',
-                        'cargo': '',
-                        'email': email,
-                        'telefono': '',
-                        'fuente_url': url_fuente,
-                        'fuente_tipo': 'email_simple'
-                    })
-                
-                for telefono in telefonos[:5]:
-                    contactos.append({
-                        'nombre': '',
-                        'cargo': '',
-                        'email': '',
-                        'telefono': telefono,
-                        'fuente_url': url_fuente,
-                        'fuente_tipo': 'telefono_simple'
-                    })
+            contactos = self.extractor.extraer(texto, url_fuente, fuente_tipo='texto', simples_si_vacio=True)
             
         except Exception as e:
             print(f"     ⚠️ Error extrayendo de texto: {e}")
@@ -1135,19 +969,16 @@ class AgenteContactos:
             return pd.DataFrame()
         
         try:
-            df = pd.DataFrame(contactos_raw)
-            
-            # Limpiar datos
-            for col in ['nombre', 'cargo', 'email', 'telefono']:
-                if col in df.columns:
-                    df[col] = df[col].astype(str).str.strip()
-                    df[col] = df[col].replace(['', 'nan', 'None'], pd.NA)
+            # Normalizar emails, teléfonos (con extensión) y nombres de forma vectorizada
+            df = normalizar_contactos(pd.DataFrame(contactos_raw))
             
             # Filtrar contactos válidos
             df = df[(df['email'].notna()) | (df['telefono'].notna())]
             
-            # Eliminar duplicados
-            df = df.drop_duplicates(subset=['email'], keep='first')
+            # Eliminar duplicados por clave compuesta, combinando campo por campo
+            antes = len(df)
+            df = deduplicar_contactos(df)
+            print(f"🧹 Duplicados combinados: {antes - len(df)}")
             
             # Agregar información adicional
             df['entidad'] = nombre_entidad
@@ -1166,13 +997,13 @@ class AgenteContactos:
             print(f"❌ Error procesando contactos: {e}")
             return pd.DataFrame()
 
-    def investigar(self, nombre_entidad):
-        """Método principal - Solo encuentra URLs de directorio"""
+    def investigar(self, nombre_entidad, url_oficial=None):
+        """Método principal - Solo encuentra URLs de directorio (url_oficial si ya se resolvió antes)"""
         try:
             print(f"[AGENTE CONTACTOS] Buscando URL de directorio para: {nombre_entidad}")
             
             # Buscar página oficial
-            url_oficial = self.buscar_pagina_oficial_avanzada(nombre_entidad)
+            url_oficial = url_oficial or self.buscar_pagina_oficial_avanzada(nombre_entidad)
             
             if not url_oficial:
                 return {
@@ -1182,8 +1013,12 @@ class AgenteContactos:
                     'url_oficial': None
                 }
             
-            # Buscar URL específica del directorio
-            url_directorio = self.buscar_url_directorio(nombre_entidad, url_oficial)
+            # Buscar URL específica del directorio (primero en sitemaps, luego en la página)
+            enlaces_sitemap = self.descubrir_por_sitemap(url_oficial)
+            if enlaces_sitemap and enlaces_sitemap[0]['confiable']:
+                url_directorio = enlaces_sitemap[0]['url']
+            else:
+                url_directorio = self.buscar_url_directorio(nombre_entidad, url_oficial)
             
             if url_directorio:
                 print(f"✅ URL de directorio encontrada: {url_directorio}")
@@ -1217,121 +1052,19 @@ class AgenteContactos:
         driver = self.crear_driver_avanzado(headless=True)
         
         try:
+            self.limitador_sitio(url_oficial).esperar()
             driver.get(url_oficial)
             time.sleep(5)
             
-            # Buscar enlaces de directorio/organigrama
-            palabras_directorio = [
-                'directorio', 'organigrama', 'directorio institucional',
-                'funcionarios', 'autoridades', 'personal directivo',
-                'estructura organizacional', 'quien es quien', 'conocenos'
-            ]
-            
-            enlaces_encontrados = []
-            
-            # Buscar en menús y enlaces
-            for palabra in palabras_directorio:
-                try:
-                    enlaces = driver.find_elements(By.XPATH, f"//a[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), '{palabra}')]")
-                    
-                    for enlace in enlaces:
-                        try:
-                            href = enlace.get_attribute('href')
-                            texto = enlace.text.strip()
-                            
-                            if href and texto:
-                                if href.startswith('/'):
-                                    href = urljoin(url_oficial, href)
-                                
-                                enlaces_encontrados.append({
-                                    'url': href,
-                                    'texto': texto,
-                                    'palabra_clave': palabra
-                                })
-                                print(f"   🔗 Encontrado: '{texto}' -> {href}")
-                        except:
-                            continue
-                except:
-                    continue
-            
-            # Si encontró enlaces, devolver el más relevante
-            if enlaces_encontrados:
-                prioridades = ['directorio', 'organigrama', 'funcionarios', 'conocenos']
-                
-                for prioridad in prioridades:
-                    for enlace in enlaces_encontrados:
-                        if prioridad in enlace['palabra_clave']:
-                            return enlace['url']
-                
-                return enlaces_encontrados[0]['url']
+            # Todos los enlaces en una sola llamada, puntuados por palabras clave
+            candidatos = self.escaner_enlaces.escanear(driver, url_oficial)
+            for candidato in candidatos[:5]:
+                print(f"   🔗 Encontrado ({candidato['puntaje']}): '{candidato['texto']}' -> {candidato['url']}")
             
-            return None
+            return candidatos[0]['url'] if candidatos else None
             
         except Exception as e:
             print(f"❌ Error buscando URL directorio: {e}")
             return None
         finally:
             driver.quit()
-    
-    def buscar_url_directorio(self, nombre_entidad, url_oficial):
-        """Busca la URL específica del directorio sin extraer contactos"""
-        print(f"🔍 Buscando URL de directorio en: {url_oficial}")
-        
-        driver = self.crear_driver_avanzado(headless=True)
-        
-        try:
-            driver.get(url_oficial)
-            time.sleep(5)
-            
-            # Buscar enlaces de directorio/organigrama
-            palabras_directorio = [
-                'directorio', 'organigrama', 'directorio institucional',
-                'funcionarios', 'autoridades', 'personal directivo',
-                'estructura organizacional', 'quien es quien', 'conocenos'
-            ]
-            
-            enlaces_encontrados = []
-            
-            # Buscar en menús y enlaces
-            for palabra in palabras_directorio:
-                try:
-                    enlaces = driver.find_elements(By.XPATH, f"//a[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), '{palabra}')]")
-                    
-                    for enlace in enlaces:
-                        try:
-                            href = enlace.get_attribute('href')
-                            texto = enlace.text.strip()
-                            
-                            if href and texto:
-                                if href.startswith('/'):
-                                    href = urljoin(url_oficial, href)
-                                
-                                enlaces_encontrados.append({
-                                    'url': href,
-                                    'texto': texto,
-                                    'palabra_clave': palabra
-                                })
-                                print(f"   🔗 Encontrado: '{texto}' -> {href}")
-                        except:
-                            continue
-                except:
-                    continue
-            
-            # Si encontró enlaces, devolver el más relevante
-            if enlaces_encontrados:
-                prioridades = ['directorio', 'organigrama', 'funcionarios', 'conocenos']
-                
-                for prioridad in prioridades:
-                    for enlace in enlaces_encontrados:
-                        if prioridad in enlace['palabra_clave']:
-                            return enlace['url']
-                
-                return enlaces_encontrados[0]['url']
-            
-            return None
-            
-        except Exception as e:
-            print(f"❌ Error buscando URL directorio: {e}")
-            return None
-        finally:
-            driver.quit()
\ No newline at end of file
@@ -11,6 +11,7 @@ from selenium.webdriver.support.ui import WebDriverWait, Select
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.action_chains import ActionChains
+from selenium.common.exceptions import WebDriverException
 import pandas as pd
 import time
 from fuzzywuzzy import fuzz, process
@@ -381,10 +382,15 @@ class AgenteTransparencia:
         
         return None, None, 0
 
-    def buscar_contactos_instituciones(self, institucion: str, headless: bool = False):
-        """Busca contactos de una institución específica - CÓDIGO COMPLETO."""
+    def buscar_contactos_instituciones(self, institucion: str, headless: bool = False, filtrar: bool = True):
+        """Busca contactos de una institución específica - CÓDIGO COMPLETO.
+        
+        Con filtrar=False devuelve la tabla sin filtrar ni guardar (lo hace el pipeline del coordinador).
+        """
         
         print(f"🔍 Iniciando búsqueda para: {institucion}")
+        # Motivo del último fallo: 'host' (la plataforma no respondió bien) o 'entidad' (no existe en el catálogo)
+        self.tipo_error = None
         
         driver = self.crear_driver_anti_deteccion(headless)
         
@@ -449,6 +455,7 @@ class AgenteTransparencia:
             
             if not dropdown_button:
                 print("❌ No se pudo encontrar el dropdown de institución")
+                self.tipo_error = 'host'
                 return pd.DataFrame()
             
             # Verificar elementos bloqueadores
@@ -508,6 +515,7 @@ class AgenteTransparencia:
             
             if not click_exitoso:
                 print("❌ No se pudo abrir el dropdown")
+                self.tipo_error = 'host'
                 return pd.DataFrame()
             
             time.sleep(3)
@@ -523,6 +531,7 @@ class AgenteTransparencia:
             
             if not opcion_elemento:
                 print("❌ No se encontró ninguna opción similar")
+                self.tipo_error = 'entidad'
                 try:
                     dropdown_button.click()
                 except:
@@ -917,6 +926,11 @@ class AgenteTransparencia:
                     
                     print("\n" + "="*80)
                     
+                    if not filtrar:
+                        # El filtrado y el guardado corren en otras etapas: liberar el navegador ya
+                        print(f"✅ Extracción completa: {len(tabla_df)} registros (filtrado en etapa aparte)")
+                        return tabla_df
+                    
                     # Apply Ollama filtering before saving
                     print("🤖 Applying Ollama-based filtering...")
                     try:
@@ -983,13 +997,13 @@ class AgenteTransparencia:
         finally:
             driver.quit()
 
-    def investigar(self, nombre_entidad):
+    def investigar(self, nombre_entidad, filtrar=True):
         """Método principal que integra todo"""
         try:
             print(f"[AGENTE TRANSPARENCIA] Iniciando para: {nombre_entidad}")
             
             # Usar el código completo
-            tabla_df = self.buscar_contactos_instituciones(nombre_entidad, headless=False)
+            tabla_df = self.buscar_contactos_instituciones(nombre_entidad, headless=False, filtrar=filtrar)
             
             if not tabla_df.empty:
                 # Contar emails válidos
@@ -1004,23 +1018,28 @@ class AgenteTransparencia:
                 institucion_clean = nombre_entidad.replace(' ', '_').replace('/', '_').lower()
                 archivo_path = os.path.join(self.download_path, f"directorio_filtered_{institucion_clean}.csv")
                 
-                return {
+                resultado = {
                     'exito': True,
                     'error': None,
                     'institucion_validada': nombre_entidad,
                     'similitud': 100,
-                    'archivo_descargado': True,
-                    'ruta_archivo': archivo_path,
+                    'archivo_descargado': filtrar,
+                    'ruta_archivo': archivo_path if filtrar else None,
                     'total_registros': len(tabla_df),  # Now filtered count
                     'total_emails': total_emails,
                     'total_columnas': len(tabla_df.columns),
                     'columnas': list(tabla_df.columns),
                     'filter_efficiency': f"{len(tabla_df)} filtered contacts"
                 }
+                if not filtrar:
+                    # Tabla en memoria para las etapas de normalización, filtrado y guardado
+                    resultado['tabla'] = tabla_df
+                return resultado
             else:
                 return {
                     'exito': False,
                     'error': 'No se pudieron extraer datos del directorio',
+                    'tipo_error': getattr(self, 'tipo_error', None) or 'datos',
                     'institucion_validada': nombre_entidad,
                     'similitud': 0,
                     'archivo_descargado': False,
@@ -1031,6 +1050,7 @@ class AgenteTransparencia:
             return {
                 'exito': False,
                 'error': str(e),
+                'tipo_error': 'host' if isinstance(e, WebDriverException) else 'interno',
                 'institucion_validada': None,
                 'similitud': 0,
                 'archivo_descargado': False,
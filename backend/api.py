@@ -6,8 +6,11 @@ import asyncio
 import json
 import os
 import sys
+import threading
 
 from coordinador import Coordinador
+from cola_trabajos import ColaTrabajos
+from cola_broker import servir_cola
 
 app = FastAPI(title="Transparencia API", version="1.0.0")
 
@@ -20,10 +23,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Estado global para manejar investigaciones
-investigaciones_activas = {}
+# Cola persistente: sesiones, tareas por entidad, resultados y logs sobreviven a un reinicio
+cola = ColaTrabajos()
 coordinador = Coordinador()
 
+# Sesiones que ya tienen un hilo de trabajo en este proceso
+sesiones_en_proceso = set()
+lock_sesiones = threading.Lock()
+
 def crear_carpeta_busqueda():
     """Crea carpeta única para cada búsqueda en Downloads del usuario"""
     from datetime import datetime
@@ -42,126 +49,117 @@ class InvestigacionRequest(BaseModel):
     entidades: List[str]
     session_id: str
 
+@app.on_event("startup")
+def exponer_cola():
+    """Con BROKER_COLA=[host:]puerto y BROKER_CLAVE, nodos trabajadores (trabajador.py --broker) pueden tomar tareas"""
+    direccion = os.environ.get('BROKER_COLA')
+    if direccion:
+        clave = os.environ.get('BROKER_CLAVE')
+        if not clave:
+            raise RuntimeError("BROKER_COLA requiere BROKER_CLAVE: el broker no se expone sin una clave explícita")
+        host, _, puerto = direccion.rpartition(':')
+        servir_cola(cola, clave.encode(), (host or '127.0.0.1', int(puerto)))
+
+@app.on_event("startup")
+def reanudar_sesiones_pendientes():
+    """Retoma las sesiones que quedaron con tareas pendientes antes del reinicio"""
+    for session_id in cola.sesiones_pendientes():
+        if reservar_sesion(session_id):
+            threading.Thread(target=ejecutar_investigacion, args=(session_id,), daemon=True).start()
+
+def reservar_sesion(session_id: str) -> bool:
+    """True si la sesión no tenía hilo de trabajo y ahora queda reservada para uno"""
+    with lock_sesiones:
+        if session_id in sesiones_en_proceso:
+            return False
+        sesiones_en_proceso.add(session_id)
+        return True
+
 @app.post("/api/investigar")
 async def iniciar_investigacion(request: InvestigacionRequest, background_tasks: BackgroundTasks):
-    """Inicia investigación en background"""
+    """Encola las entidades de la sesión; repetir el session_id agrega entidades a la misma búsqueda"""
     session_id = request.session_id
     
-    # Crear carpeta única para esta búsqueda
-    carpeta_busqueda = crear_carpeta_busqueda()
+    # Carpeta única por búsqueda (se conserva si la sesión ya existía)
+    sesion = cola.sesion(session_id)
+    carpeta_busqueda = sesion['carpeta'] if sesion else crear_carpeta_busqueda()
+    cola.crear_sesion(session_id, carpeta_busqueda)
+    agregadas = cola.encolar(session_id, request.entidades)
     
-    # Inicializar estado de la investigación
-    investigaciones_activas[session_id] = {
-        'status': 'iniciando',
-        'progress': 0,
-        'logs': [],
-        'resultados': [],
-        'total_entidades': len(request.entidades),
-        'entidades_procesadas': 0,
-        'carpeta_busqueda': carpeta_busqueda
-    }
+    # Ejecutar investigación en background (si la sesión ya corre, toma las nuevas tareas sola)
+    if reservar_sesion(session_id):
+        background_tasks.add_task(ejecutar_investigacion, session_id)
     
-    # Ejecutar investigación en background
-    background_tasks.add_task(ejecutar_investigacion, request.entidades, session_id)
-    
-    return {"message": "Investigación iniciada", "session_id": session_id}
+    return {"message": "Investigación iniciada", "session_id": session_id, "entidades_agregadas": agregadas}
 
-async def ejecutar_investigacion(entidades: List[str], session_id: str):
-    """Ejecuta la investigación completa"""
+def ejecutar_investigacion(session_id: str):
+    """Procesa las tareas de la sesión desde la cola hasta que no quede ninguna"""
+    def log_callback(message: str, tipo: str = "info"):
+        cola.agregar_log(session_id, message, tipo)
+    
     try:
-        investigaciones_activas[session_id]['status'] = 'procesando'
-        
-        def log_callback(message: str, tipo: str = "info"):
-            from datetime import datetime
-            log_entry = {
-                'timestamp': datetime.now().isoformat(),
-                'message': message,
-                'type': tipo
-            }
-            investigaciones_activas[session_id]['logs'].append(log_entry)
-        
-        total_entidades = len(entidades)
+        cola.marcar_sesion(session_id, 'procesando')
         
-        # Configurar carpeta de búsqueda para los agentes
-        carpeta_busqueda = investigaciones_activas[session_id]['carpeta_busqueda']
-        coordinador.agente_transparencia.set_download_path(carpeta_busqueda)
-        coordinador.agente_contactos.set_download_path(carpeta_busqueda)
+        # Contexto propio de la sesión: carpeta, logs y estadísticas sin tocar los agentes compartidos
+        carpeta_busqueda = cola.sesion(session_id)['carpeta']
+        contexto = coordinador.crear_contexto(carpeta_busqueda, log_callback)
         
-        # Inicializar lista de contactos AWS
-        if 'contactos_aws' not in investigaciones_activas[session_id]:
-            investigaciones_activas[session_id]['contactos_aws'] = []
-        
-        for i, entidad in enumerate(entidades):
-            log_callback(f"Investigando: {entidad}", "info")
-            
-            # Usar tu coordinador existente
-            resultado = coordinador.investigar_entidad(entidad, log_callback)
-            investigaciones_activas[session_id]['resultados'].append(resultado)
+        while True:
+            # Entidades en paralelo con límites por agente; resultados en orden de finalización
+            for resultado in coordinador.investigar_desde_cola(cola, contexto, session_id):
+                entidad = resultado['entidad']
+                
+                # Contactos AWS ya filtrados y guardados por las etapas del pipeline
+                contactos_filtrados = resultado.get('contactos_aws', [])
+                if resultado['transparencia'].get('exito'):
+                    log_callback(f"✅ {entidad}: {len(contactos_filtrados)} contactos AWS encontrados", "success")
+                
+                log_callback(f"Completado: {entidad}", "success")
             
-            # FILTRAR INMEDIATAMENTE si transparencia fue exitosa
-            if resultado['transparencia'].get('exito') and 'ruta_archivo' in resultado['transparencia']:
-                try:
-                    ruta_archivo = resultado['transparencia']['ruta_archivo']
-                    if os.path.exists(ruta_archivo):
-                        log_callback(f"📊 Filtrando contactos de {entidad}...", "info")
-                        
-                        from filtro_aws import FiltroAWS
-                        filtro = FiltroAWS()
-                        contactos_filtrados = filtro.filtrar_contactos(ruta_archivo)
-                        
-                        # Añadir entidad a cada contacto y agregarlo a la lista
-                        for contacto in contactos_filtrados:
-                            contacto['entidad'] = entidad
-                            investigaciones_activas[session_id]['contactos_aws'].append(contacto)
-                        
-                        log_callback(f"✅ {entidad}: {len(contactos_filtrados)} contactos AWS encontrados", "success")
-                        
-                except Exception as e:
-                    log_callback(f"⚠️ Error filtrando {entidad}: {e}", "warning")
-            
-            # Actualizar progreso
-            investigaciones_activas[session_id]['entidades_procesadas'] = i + 1
-            investigaciones_activas[session_id]['progress'] = ((i + 1) / total_entidades) * 100
-            
-            log_callback(f"Completado: {entidad}", "success")
+            # Entidades agregadas justo al terminar: otra vuelta en lugar de dejarlas en cola
+            with lock_sesiones:
+                if cola.contar(session_id)['queued'] == 0:
+                    sesiones_en_proceso.discard(session_id)
+                    break
         
         # El filtrado ya se hizo en tiempo real durante la investigación
-        total_contactos = len(investigaciones_activas[session_id].get('contactos_aws', []))
+        total_contactos = len(cola.contactos_aws(session_id))
         log_callback(f"🎯 Total contactos AWS filtrados: {total_contactos}", "success")
+        log_callback(f"🔗 URLs oficiales — {coordinador.agente_contactos.resolvedor_urls.resumen_estadisticas(contexto.estadisticas_urls)}", "info")
         
-        investigaciones_activas[session_id]['status'] = 'completado'
+        cola.marcar_sesion(session_id, 'completado')
         log_callback("¡Investigación completada!", "success")
         
     except Exception as e:
-        investigaciones_activas[session_id]['status'] = 'error'
-        investigaciones_activas[session_id]['error'] = str(e)
+        with lock_sesiones:
+            sesiones_en_proceso.discard(session_id)
+        cola.marcar_sesion(session_id, 'error', str(e))
 
 @app.get("/api/status/{session_id}")
 async def obtener_status(session_id: str):
     """Obtiene el status actual de una investigación"""
-    if session_id not in investigaciones_activas:
+    estado = cola.estado_sesion(session_id)
+    if estado is None:
         return {"error": "Sesión no encontrada"}
     
-    return investigaciones_activas[session_id]
+    return estado
 
 @app.get("/api/logs/{session_id}")
 async def obtener_logs(session_id: str, desde: int = 0):
     """Obtiene logs desde un índice específico"""
-    if session_id not in investigaciones_activas:
-        return {"logs": []}
-    
-    logs = investigaciones_activas[session_id]['logs'][desde:]
-    return {"logs": logs, "total": len(investigaciones_activas[session_id]['logs'])}
+    logs = cola.logs(session_id, desde)
+    return {"logs": logs, "total": cola.total_logs(session_id)}
 
 @app.post("/api/exportar/{session_id}")
 async def exportar_resultados(session_id: str):
     """Exporta los contactos AWS filtrados por Ollama"""
-    if session_id not in investigaciones_activas:
+    sesion = cola.sesion(session_id)
+    if sesion is None:
         return {"error": "Sesión no encontrada"}
     
     try:
-        carpeta_busqueda = investigaciones_activas[session_id].get('carpeta_busqueda', 'downloads')
-        contactos_aws = investigaciones_activas[session_id].get('contactos_aws', [])
+        carpeta_busqueda = sesion['carpeta'] or 'downloads'
+        contactos_aws = cola.contactos_aws(session_id)
         
         if contactos_aws:
             # Agrupar por entidad para el Excel
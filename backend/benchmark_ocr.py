@@ -0,0 +1,62 @@
+import os
+import sys
+import time
+from PIL import Image, ImageEnhance
+import pytesseract
+
+from preprocesamiento_ocr import preprocesar
+from agente_contactos import AgenteContactos
+
+CONFIG_OCR = '--oem 3 --psm 6'
+
+
+def mejorar_imagen_anterior(imagen):
+    """Preprocesamiento previo: gris, mínimo de 1000 px con LANCZOS y contraste x2"""
+    if imagen.mode != 'L':
+        imagen = imagen.convert('L')
+    width, height = imagen.size
+    if width < 1000 or height < 1000:
+        factor = max(1000/width, 1000/height)
+        imagen = imagen.resize((int(width * factor), int(height * factor)), Image.Resampling.LANCZOS)
+    return ImageEnhance.Contrast(imagen).enhance(2.0)
+
+
+def medir(nombre, preproceso, imagenes, agente):
+    """OCR serial de todas las imágenes con un preprocesamiento dado"""
+    tiempo_pre = 0.0
+    tiempo_ocr = 0.0
+    contactos = 0
+    for ruta in imagenes:
+        imagen = Image.open(ruta)
+
+        inicio = time.perf_counter()
+        procesada = preproceso(imagen)
+        tiempo_pre += time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        texto = pytesseract.image_to_string(procesada, lang='spa', config=CONFIG_OCR)
+        tiempo_ocr += time.perf_counter() - inicio
+
+        contactos += len([c for c in agente.extraer_contactos_de_texto(texto, ruta)
+                          if c.get('email') or c.get('telefono')])
+
+    print(f"{nombre:<10} preproceso: {tiempo_pre:7.2f}s   OCR: {tiempo_ocr:7.2f}s   contactos: {contactos}")
+
+
+def benchmark_ocr(carpeta):
+    """Compara tiempo de OCR y contactos recuperados antes y después del nuevo preprocesamiento"""
+    extensiones = ('.png', '.jpg', '.jpeg', '.gif', '.tif', '.tiff')
+    imagenes = sorted(os.path.join(carpeta, f) for f in os.listdir(carpeta) if f.lower().endswith(extensiones))
+    if not imagenes:
+        print(f"❌ No hay imágenes en {carpeta}")
+        return
+
+    print(f"🧪 Benchmark OCR sobre {len(imagenes)} imágenes")
+    print("=" * 70)
+    agente = AgenteContactos(download_path=os.path.join(carpeta, "_benchmark"))
+    medir('anterior', mejorar_imagen_anterior, imagenes, agente)
+    medir('numpy', preprocesar, imagenes, agente)
+
+
+if __name__ == "__main__":
+    benchmark_ocr(sys.argv[1] if len(sys.argv) > 1 else "organigramas")
@@ -0,0 +1,51 @@
+SELECTORES_FOOTER = ['footer', '.footer', '#footer', '.pie', '.bottom', '.contact-info']
+SELECTORES_CONTENIDO = ['main', '.main', '#main', '.content', '#content', '.container', 'article']
+
+# Un solo execute_script: pertenencia a footer, posición relativa y visibilidad
+# de todas las tablas (en orden de documento) y de los bloques de contenido principal
+SCRIPT_BLOQUES = """
+var selectorFooter = arguments[0].join(',');
+var selectoresContenido = arguments[1];
+var alto = Math.max(document.body.scrollHeight, document.documentElement.scrollHeight) || 1;
+
+function describir(el) {
+    var r = el.getBoundingClientRect();
+    var estilo = window.getComputedStyle(el);
+    return {
+        dentro_footer: el.closest(selectorFooter) !== null,
+        posicion_relativa: (r.top + window.scrollY) / alto,
+        visible: r.width > 0 && r.height > 0 && estilo.display !== 'none' && estilo.visibility !== 'hidden'
+    };
+}
+
+var tablas = Array.prototype.map.call(document.querySelectorAll('table'), function(t, i) {
+    var d = describir(t);
+    d.indice = i;
+    return d;
+});
+
+var contenido = [];
+selectoresContenido.forEach(function(selector) {
+    var el = document.querySelector(selector);
+    if (el) {
+        var d = describir(el);
+        d.selector = selector;
+        contenido.push(d);
+    }
+});
+
+return {tablas: tablas, contenido: contenido};
+"""
+
+
+def clasificar_bloques(driver, umbral_footer=0.8):
+    """Clasifica tablas y bloques de contenido de la página con un solo viaje al navegador"""
+    try:
+        bloques = driver.execute_script(SCRIPT_BLOQUES, SELECTORES_FOOTER, SELECTORES_CONTENIDO)
+    except Exception as e:
+        print(f"   ⚠️ Error clasificando bloques de la página: {e}")
+        return {'tablas': [], 'contenido': []}
+
+    for bloque in bloques['tablas'] + bloques['contenido']:
+        bloque['en_footer'] = bloque['dentro_footer'] or bloque['posicion_relativa'] > umbral_footer
+    return bloques
@@ -0,0 +1,140 @@
+import sqlite3
+import hashlib
+import json
+import threading
+from datetime import datetime
+
+from PIL import Image
+
+
+def hash_contenido(datos):
+    """SHA-256 de un bloque de bytes"""
+    return hashlib.sha256(datos).hexdigest()
+
+
+def hash_archivo(ruta, chunk_size=1024 * 1024):
+    """SHA-256 de un archivo leyéndolo por bloques"""
+    sha = hashlib.sha256()
+    with open(ruta, 'rb') as archivo:
+        for bloque in iter(lambda: archivo.read(chunk_size), b''):
+            sha.update(bloque)
+    return sha.hexdigest()
+
+
+def hash_perceptual(imagen, tamano=8):
+    """dHash de 64 bits: detecta copias re-codificadas o redimensionadas de la misma imagen"""
+    pequena = imagen.convert('L').resize((tamano + 1, tamano), Image.Resampling.LANCZOS)
+    pixeles = list(pequena.getdata())
+    bits = 0
+    for fila in range(tamano):
+        for col in range(tamano):
+            izquierda = pixeles[fila * (tamano + 1) + col]
+            derecha = pixeles[fila * (tamano + 1) + col + 1]
+            bits = (bits << 1) | (1 if izquierda > derecha else 0)
+    return f"{bits:016x}"
+
+
+def clave_config(**config):
+    """Huella de la configuración de OCR (idioma, DPI, parámetros de Tesseract...)"""
+    return hashlib.md5(json.dumps(config, sort_keys=True).encode()).hexdigest()
+
+
+class CacheOCR:
+    """Caché persistente de resultados OCR por hash de contenido, con expulsión por tamaño"""
+
+    def __init__(self, cache_file="ocr_cache.db", max_bytes=200 * 1024 * 1024, distancia_perceptual=4):
+        self.cache_file = cache_file
+        self.max_bytes = max_bytes
+        self.distancia_perceptual = distancia_perceptual
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self._init_cache()
+
+    def _init_cache(self):
+        """Inicializa la tabla SQLite de resultados OCR"""
+        conn = sqlite3.connect(self.cache_file)
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS ocr_cache (
+                clave TEXT,
+                config TEXT,
+                phash TEXT,
+                resultado TEXT,
+                tamano INTEGER,
+                ultimo_uso TIMESTAMP,
+                PRIMARY KEY (clave, config)
+            )
+        ''')
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_ocr_cache_uso ON ocr_cache (ultimo_uso)")
+        conn.commit()
+        conn.close()
+
+    def obtener(self, clave, config, phash=None):
+        """Devuelve el resultado guardado ({texto, cajas}) o None"""
+        with self._lock:
+            conn = sqlite3.connect(self.cache_file)
+            fila = conn.execute(
+                "SELECT clave, resultado FROM ocr_cache WHERE clave = ? AND config = ?", (clave, config)
+            ).fetchone()
+
+            # Sin coincidencia exacta: buscar la copia visualmente más cercana comparando sólo los
+            # hashes, y leer después el resultado de esa única entrada
+            if fila is None and phash is not None:
+                objetivo = int(phash, 16)
+                mejor, mejor_distancia = None, self.distancia_perceptual + 1
+                for clave_similar, phash_guardado in conn.execute(
+                    "SELECT clave, phash FROM ocr_cache WHERE config = ? AND phash IS NOT NULL", (config,)
+                ):
+                    distancia = bin(objetivo ^ int(phash_guardado, 16)).count('1')
+                    if distancia < mejor_distancia:
+                        mejor, mejor_distancia = clave_similar, distancia
+                        if distancia == 0:
+                            break
+                if mejor is not None:
+                    fila = conn.execute(
+                        "SELECT clave, resultado FROM ocr_cache WHERE clave = ? AND config = ?", (mejor, config)
+                    ).fetchone()
+
+            if fila is None:
+                conn.close()
+                self.fallos += 1
+                return None
+
+            conn.execute(
+                "UPDATE ocr_cache SET ultimo_uso = ? WHERE clave = ? AND config = ?",
+                (datetime.now().isoformat(), fila[0], config)
+            )
+            conn.commit()
+            conn.close()
+            self.aciertos += 1
+            return json.loads(fila[1])
+
+    def guardar(self, clave, config, resultado, phash=None):
+        """Guarda un resultado OCR y expulsa las entradas menos usadas si se supera el tamaño"""
+        serializado = json.dumps(resultado, ensure_ascii=False)
+        with self._lock:
+            conn = sqlite3.connect(self.cache_file)
+            conn.execute(
+                "INSERT OR REPLACE INTO ocr_cache (clave, config, phash, resultado, tamano, ultimo_uso) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (clave, config, phash, serializado, len(serializado), datetime.now().isoformat())
+            )
+            self._expulsar(conn)
+            conn.commit()
+            conn.close()
+
+    def _expulsar(self, conn):
+        """Elimina las entradas con uso más antiguo hasta quedar bajo max_bytes"""
+        total = conn.execute("SELECT COALESCE(SUM(tamano), 0) FROM ocr_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        exceso = total - self.max_bytes
+        eliminar = []
+        for clave, config, tamano in conn.execute(
+            "SELECT clave, config, tamano FROM ocr_cache ORDER BY ultimo_uso ASC"
+        ):
+            eliminar.append((clave, config))
+            exceso -= tamano
+            if exceso <= 0:
+                break
+        conn.executemany("DELETE FROM ocr_cache WHERE clave = ? AND config = ?", eliminar)
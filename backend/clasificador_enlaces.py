@@ -0,0 +1,115 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+
+FIRMAS = [
+    (b'%PDF', 'pdf'),
+    (b'\x89PNG', 'imagen'),
+    (b'\xff\xd8\xff', 'imagen'),
+    (b'GIF8', 'imagen'),
+    (b'II*\x00', 'imagen'),
+    (b'MM\x00*', 'imagen'),
+]
+
+
+def tipo_por_content_type(content_type):
+    """Traduce un Content-Type al tipo de procesador; None si es ambiguo"""
+    content_type = (content_type or '').split(';')[0].strip().lower()
+    if content_type == 'application/pdf':
+        return 'pdf'
+    if content_type.startswith('image/'):
+        return 'imagen'
+    if content_type in ('text/html', 'application/xhtml+xml'):
+        return 'html'
+    if not content_type or content_type in ('application/octet-stream', 'binary/octet-stream',
+                                            'application/force-download', 'application/download'):
+        return None
+    return 'otro'
+
+
+def tipo_por_firma(primeros_bytes):
+    """Detecta el tipo por los bytes mágicos del inicio del contenido"""
+    for firma, tipo in FIRMAS:
+        if primeros_bytes.startswith(firma):
+            return tipo
+    if primeros_bytes[:4] == b'RIFF' and primeros_bytes[8:12] == b'WEBP':
+        return 'imagen'
+    if primeros_bytes.lstrip().startswith(b'<'):
+        return 'html'
+    return None
+
+
+class ClasificadorEnlaces:
+    """Clasifica enlaces (pdf/imagen/html/otro) con HEAD o GET parcial, en paralelo y con caché"""
+
+    def __init__(self, max_workers=8, timeout=10, bytes_muestra=1024):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.bytes_muestra = bytes_muestra
+        self._cache = {}
+        self._tamanos = {}
+        self._lock = threading.Lock()
+
+    def _clasificar_red(self, url):
+        # 1. HEAD: basta con el Content-Type si no es ambiguo
+        try:
+            response = requests.head(url, headers=HEADERS, timeout=self.timeout, allow_redirects=True)
+            if response.status_code < 400:
+                self._registrar_tamano(url, response.headers.get('Content-Length'))
+                tipo = tipo_por_content_type(response.headers.get('Content-Type'))
+                if tipo:
+                    return tipo
+        except requests.RequestException:
+            pass
+
+        # 2. GET parcial de los primeros bytes (servidores sin HEAD o con octet-stream)
+        headers = dict(HEADERS, Range=f'bytes=0-{self.bytes_muestra - 1}')
+        with requests.get(url, headers=headers, timeout=self.timeout, stream=True) as response:
+            if response.status_code >= 400:
+                return None
+            # Content-Range: bytes 0-1023/TOTAL
+            self._registrar_tamano(url, response.headers.get('Content-Range', '').rpartition('/')[2])
+            primeros = next(response.iter_content(chunk_size=self.bytes_muestra), b'')
+            return tipo_por_firma(primeros) or tipo_por_content_type(response.headers.get('Content-Type'))
+
+    def _registrar_tamano(self, url, valor):
+        if valor and valor.isdigit():
+            with self._lock:
+                self._tamanos[url] = int(valor)
+
+    def tamano(self, url):
+        """Tamaño en bytes reportado por el servidor al clasificar (None si no se conoce)"""
+        return self._tamanos.get(url)
+
+    def clasificar(self, url, tipo_heuristico='html'):
+        """Tipo real del enlace; si la red falla se conserva la estimación heurística"""
+        if not url.startswith('http'):
+            return tipo_heuristico
+
+        with self._lock:
+            if url in self._cache:
+                return self._cache[url]
+
+        try:
+            tipo = self._clasificar_red(url) or tipo_heuristico
+        except Exception:
+            return tipo_heuristico
+
+        with self._lock:
+            self._cache[url] = tipo
+        return tipo
+
+    def clasificar_lote(self, enlaces):
+        """Clasifica en paralelo una lista de dicts con 'url' y 'tipo' heurístico; actualiza 'tipo'"""
+        if not enlaces:
+            return enlaces
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(enlaces))) as pool:
+            tipos = pool.map(lambda e: self.clasificar(e['url'], e.get('tipo', 'html')), enlaces)
+            for enlace, tipo in zip(enlaces, tipos):
+                if tipo != enlace.get('tipo'):
+                    print(f"   🔎 Tipo corregido ({enlace.get('tipo')} → {tipo}): {enlace['url']}")
+                enlace['tipo'] = tipo
+        return enlaces
@@ -0,0 +1,61 @@
+import secrets
+import threading
+from contextlib import contextmanager
+from multiprocessing.managers import BaseManager
+
+from cola_trabajos import ColaTrabajos
+
+
+class _ServidorCola(BaseManager):
+    pass
+
+
+class _ClienteCola(BaseManager):
+    pass
+
+
+def _atender(servidor):
+    try:
+        servidor.serve_forever()
+    except SystemExit:
+        # serve_forever termina con sys.exit() al activar stop_event
+        pass
+
+
+def servir_cola(cola, clave, direccion=('127.0.0.1', 50000)):
+    """Expone la cola por red en un hilo; los trabajadores de otros nodos se conectan con conectar_cola.
+
+    El servidor usa pickle, así que la clave es obligatoria: quien la conoce puede ejecutar código
+    en este equipo. Por defecto sólo escucha en 127.0.0.1; para otros nodos pasar la IP interna.
+    Devuelve el servidor (server.address trae el puerto real si se pidió el 0).
+    """
+    if not clave:
+        raise ValueError("servir_cola requiere una clave de autenticación explícita")
+    _ServidorCola.register('cola', callable=lambda: cola)
+    servidor = _ServidorCola(address=direccion, authkey=clave).get_server()
+    threading.Thread(target=_atender, args=(servidor,), name='broker-cola', daemon=True).start()
+    print(f"📡 Cola de trabajos disponible en {servidor.address[0]}:{servidor.address[1]}")
+    return servidor
+
+
+def conectar_cola(direccion, clave):
+    """Proxy a una cola servida por servir_cola; expone los mismos métodos que ColaTrabajos"""
+    _ClienteCola.register('cola')
+    gestor = _ClienteCola(address=direccion, authkey=clave)
+    gestor.connect()
+    return gestor.cola()
+
+
+@contextmanager
+def broker_local(db_file="jobs.db", **opciones):
+    """Broker en 127.0.0.1 con puerto libre y clave aleatoria, para pruebas y un solo equipo.
+
+    Devuelve (cola, direccion, clave).
+    """
+    cola = ColaTrabajos(db_file, **opciones)
+    clave = secrets.token_bytes(32)
+    servidor = servir_cola(cola, clave, ('127.0.0.1', 0))
+    try:
+        yield cola, servidor.address, clave
+    finally:
+        servidor.stop_event.set()
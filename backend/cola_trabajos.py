@@ -0,0 +1,316 @@
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+# Estados de una tarea (una entidad de una sesión)
+EN_COLA = 'queued'
+ARRENDADA = 'leased'
+HECHA = 'done'
+FALLIDA = 'failed'
+
+
+class ColaTrabajos:
+    """Cola persistente en SQLite de investigaciones: una tarea por entidad y sesión.
+
+    Los trabajadores arriendan tareas por un tiempo limitado y lo renuevan mientras trabajan;
+    si un trabajador muere, la tarea vuelve a la cola al vencer el arriendo. Completar es
+    idempotente: sólo la primera finalización de una tarea cuenta. Sesiones, tareas, resultados
+    y logs viven en el mismo archivo, así que un reinicio del API no pierde nada.
+    """
+
+    def __init__(self, db_file="jobs.db", duracion_arriendo=300, max_intentos=3):
+        self.db_file = db_file
+        self.duracion_arriendo = duracion_arriendo
+        self.max_intentos = max_intentos
+        self._lock = threading.Lock()
+        self._init_db()
+
+    def _conectar(self):
+        conn = sqlite3.connect(self.db_file, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_db(self):
+        conn = self._conectar()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript('''
+            CREATE TABLE IF NOT EXISTS sesiones (
+                session_id TEXT PRIMARY KEY,
+                carpeta TEXT,
+                status TEXT,
+                error TEXT,
+                creado_en TIMESTAMP
+            );
+            CREATE TABLE IF NOT EXISTS tareas (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT,
+                entidad TEXT,
+                estado TEXT,
+                etapa TEXT,
+                intentos INTEGER DEFAULT 0,
+                trabajador TEXT,
+                arriendo_hasta REAL,
+                resultado TEXT,
+                error TEXT,
+                actualizado_en TIMESTAMP,
+                UNIQUE (session_id, entidad)
+            );
+            CREATE INDEX IF NOT EXISTS idx_tareas_estado ON tareas (estado, session_id);
+            CREATE TABLE IF NOT EXISTS logs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT,
+                timestamp TEXT,
+                message TEXT,
+                type TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_logs_sesion ON logs (session_id, id);
+        ''')
+        conn.commit()
+        conn.close()
+
+    # --- Sesiones ---
+
+    def crear_sesion(self, session_id, carpeta):
+        """Registra la sesión (si ya existe conserva su carpeta)"""
+        with self._lock:
+            conn = self._conectar()
+            conn.execute(
+                "INSERT OR IGNORE INTO sesiones (session_id, carpeta, status, creado_en) VALUES (?, ?, 'iniciando', ?)",
+                (session_id, carpeta, datetime.now().isoformat())
+            )
+            conn.commit()
+            conn.close()
+
+    def sesion(self, session_id):
+        conn = self._conectar()
+        fila = conn.execute("SELECT * FROM sesiones WHERE session_id = ?", (session_id,)).fetchone()
+        conn.close()
+        return dict(fila) if fila else None
+
+    def marcar_sesion(self, session_id, status, error=None):
+        with self._lock:
+            conn = self._conectar()
+            conn.execute("UPDATE sesiones SET status = ?, error = ? WHERE session_id = ?", (status, error, session_id))
+            conn.commit()
+            conn.close()
+
+    def sesiones_pendientes(self):
+        """Sesiones con tareas en cola o arrendadas (para reanudarlas tras un reinicio)"""
+        conn = self._conectar()
+        filas = conn.execute(
+            "SELECT DISTINCT session_id FROM tareas WHERE estado IN (?, ?)", (EN_COLA, ARRENDADA)
+        ).fetchall()
+        conn.close()
+        return [fila['session_id'] for fila in filas]
+
+    # --- Tareas ---
+
+    def encolar(self, session_id, entidades):
+        """Agrega entidades a la sesión; las repetidas se ignoran. Devuelve cuántas se agregaron"""
+        ahora = datetime.now().isoformat()
+        with self._lock:
+            conn = self._conectar()
+            antes = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO tareas (session_id, entidad, estado, actualizado_en) VALUES (?, ?, ?, ?)",
+                [(session_id, entidad, EN_COLA, ahora) for entidad in entidades]
+            )
+            agregadas = conn.total_changes - antes
+            if agregadas:
+                conn.execute("UPDATE sesiones SET status = 'iniciando', error = NULL "
+                             "WHERE session_id = ? AND status IN ('completado', 'error')", (session_id,))
+            conn.commit()
+            conn.close()
+        return agregadas
+
+    def _liberar_vencidas(self, conn):
+        """Devuelve a la cola las tareas con arriendo vencido (o las marca fallidas sin intentos)"""
+        ahora = time.time()
+        conn.execute(
+            "UPDATE tareas SET estado = ?, error = 'Arriendo vencido sin más intentos', trabajador = NULL "
+            "WHERE estado = ? AND arriendo_hasta < ? AND intentos >= ?",
+            (FALLIDA, ARRENDADA, ahora, self.max_intentos)
+        )
+        conn.execute(
+            "UPDATE tareas SET estado = ?, trabajador = NULL WHERE estado = ? AND arriendo_hasta < ?",
+            (EN_COLA, ARRENDADA, ahora)
+        )
+
+    def arrendar(self, trabajador, limite=1, session_id=None):
+        """Arrienda hasta `limite` tareas en cola (de una sesión o de cualquiera), en orden de llegada"""
+        with self._lock:
+            conn = self._conectar()
+            conn.execute("BEGIN IMMEDIATE")
+            self._liberar_vencidas(conn)
+            consulta = "SELECT id, session_id, entidad, intentos FROM tareas WHERE estado = ?"
+            parametros = [EN_COLA]
+            if session_id is not None:
+                consulta += " AND session_id = ?"
+                parametros.append(session_id)
+            filas = conn.execute(consulta + " ORDER BY id LIMIT ?", parametros + [limite]).fetchall()
+            arriendo_hasta = time.time() + self.duracion_arriendo
+            conn.executemany(
+                "UPDATE tareas SET estado = ?, trabajador = ?, arriendo_hasta = ?, intentos = intentos + 1, "
+                "actualizado_en = ? WHERE id = ?",
+                [(ARRENDADA, trabajador, arriendo_hasta, datetime.now().isoformat(), fila['id']) for fila in filas]
+            )
+            conn.commit()
+            conn.close()
+        return [dict(fila, intentos=fila['intentos'] + 1) for fila in filas]
+
+    def siguiente_sesion(self):
+        """Sesión de la tarea en cola más antigua, o None si no hay trabajo"""
+        conn = self._conectar()
+        fila = conn.execute("SELECT session_id FROM tareas WHERE estado = ? ORDER BY id LIMIT 1", (EN_COLA,)).fetchone()
+        conn.close()
+        return fila['session_id'] if fila else None
+
+    def intervalo_latido(self):
+        """Cada cuántos segundos debe renovar un trabajador sus arriendos"""
+        return self.duracion_arriendo / 3
+
+    def renovar(self, trabajador):
+        """Extiende el arriendo de todas las tareas del trabajador (latido)"""
+        with self._lock:
+            conn = self._conectar()
+            conn.execute("UPDATE tareas SET arriendo_hasta = ? WHERE estado = ? AND trabajador = ?",
+                         (time.time() + self.duracion_arriendo, ARRENDADA, trabajador))
+            conn.commit()
+            conn.close()
+
+    def marcar_etapa(self, session_id, entidad, etapa):
+        with self._lock:
+            conn = self._conectar()
+            conn.execute("UPDATE tareas SET etapa = ? WHERE session_id = ? AND entidad = ?", (etapa, session_id, entidad))
+            conn.commit()
+            conn.close()
+
+    def completar(self, id_tarea, resultado):
+        """Marca la tarea como hecha con su resultado; False si ya estaba hecha (finalización repetida)"""
+        with self._lock:
+            conn = self._conectar()
+            cursor = conn.execute(
+                "UPDATE tareas SET estado = ?, resultado = ?, error = NULL, etapa = 'completada', "
+                "trabajador = NULL, actualizado_en = ? WHERE id = ? AND estado != ?",
+                (HECHA, json.dumps(resultado, default=str, ensure_ascii=False), datetime.now().isoformat(), id_tarea, HECHA)
+            )
+            conn.commit()
+            conn.close()
+        return cursor.rowcount == 1
+
+    def fallar(self, id_tarea, error, resultado=None, reintentar=True):
+        """Devuelve la tarea a la cola si le quedan intentos; si no, la marca fallida"""
+        with self._lock:
+            conn = self._conectar()
+            fila = conn.execute("SELECT estado, intentos FROM tareas WHERE id = ?", (id_tarea,)).fetchone()
+            if not fila or fila['estado'] in (HECHA, FALLIDA):
+                conn.close()
+                return False
+            estado = EN_COLA if reintentar and fila['intentos'] < self.max_intentos else FALLIDA
+            conn.execute(
+                "UPDATE tareas SET estado = ?, error = ?, resultado = ?, trabajador = NULL, actualizado_en = ? WHERE id = ?",
+                (estado, str(error), json.dumps(resultado, default=str, ensure_ascii=False) if resultado else None,
+                 datetime.now().isoformat(), id_tarea)
+            )
+            conn.commit()
+            conn.close()
+        return True
+
+    def contar(self, session_id):
+        """Tareas de la sesión por estado"""
+        conn = self._conectar()
+        filas = conn.execute("SELECT estado, COUNT(*) AS total FROM tareas WHERE session_id = ? GROUP BY estado",
+                             (session_id,)).fetchall()
+        conn.close()
+        conteo = {EN_COLA: 0, ARRENDADA: 0, HECHA: 0, FALLIDA: 0}
+        conteo.update({fila['estado']: fila['total'] for fila in filas})
+        return conteo
+
+    def contactos_aws(self, session_id):
+        return [c for r in self.resultados(session_id) for c in r.get('contactos_aws', [])]
+
+    def resultados(self, session_id, limite=None):
+        """Resultados guardados de la sesión, en orden de finalización; con limite, sólo los más recientes"""
+        conn = self._conectar()
+        filas = conn.execute(
+            "SELECT resultado FROM tareas WHERE session_id = ? AND resultado IS NOT NULL "
+            "ORDER BY actualizado_en DESC, id DESC LIMIT ?",
+            (session_id, -1 if limite is None else limite)
+        ).fetchall()
+        conn.close()
+        return [json.loads(fila['resultado']) for fila in reversed(filas)]
+
+    def totales_resultados(self, session_id):
+        """(resultados guardados, contactos AWS) de la sesión, contados en SQLite sin cargar los JSON"""
+        conn = self._conectar()
+        fila = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(json_array_length(resultado, '$.contactos_aws')), 0) "
+            "FROM tareas WHERE session_id = ? AND resultado IS NOT NULL",
+            (session_id,)
+        ).fetchone()
+        conn.close()
+        return fila[0], fila[1]
+
+    def estado_sesion(self, session_id, max_resultados=20, max_contactos=100):
+        """Estado de la sesión con el formato que consume el frontend.
+
+        Se consulta en cada sondeo, así que sólo trae conteos y los resultados más recientes; los
+        logs se leen paginados con logs(session_id, desde) y todo el detalle con resultados().
+        """
+        sesion = self.sesion(session_id)
+        if not sesion:
+            return None
+        conteo = self.contar(session_id)
+        total = sum(conteo.values())
+        procesadas = conteo[HECHA] + conteo[FALLIDA]
+
+        conn = self._conectar()
+        etapas = conn.execute("SELECT entidad, etapa FROM tareas WHERE session_id = ? AND etapa IS NOT NULL",
+                              (session_id,)).fetchall()
+        conn.close()
+
+        resultados = self.resultados(session_id, limite=max_resultados)
+        total_resultados, total_contactos_aws = self.totales_resultados(session_id)
+        contactos_aws = [c for r in reversed(resultados) for c in r.get('contactos_aws', [])][:max_contactos]
+        return {
+            'status': sesion['status'],
+            'progress': (procesadas / total) * 100 if total else 0,
+            'total_logs': self.total_logs(session_id),
+            'resultados': resultados,
+            'total_resultados': total_resultados,
+            'total_entidades': total,
+            'entidades_procesadas': procesadas,
+            'tareas': conteo,
+            'progreso_entidades': {fila['entidad']: fila['etapa'] for fila in etapas},
+            'carpeta_busqueda': sesion['carpeta'],
+            'contactos_aws': contactos_aws,
+            'total_contactos_aws': total_contactos_aws,
+            'error': sesion['error']
+        }
+
+    # --- Logs ---
+
+    def agregar_log(self, session_id, mensaje, tipo='info'):
+        with self._lock:
+            conn = self._conectar()
+            conn.execute("INSERT INTO logs (session_id, timestamp, message, type) VALUES (?, ?, ?, ?)",
+                         (session_id, datetime.now().isoformat(), mensaje, tipo))
+            conn.commit()
+            conn.close()
+
+    def logs(self, session_id, desde=0):
+        conn = self._conectar()
+        filas = conn.execute(
+            "SELECT timestamp, message, type FROM logs WHERE session_id = ? ORDER BY id LIMIT -1 OFFSET ?",
+            (session_id, desde)
+        ).fetchall()
+        conn.close()
+        return [dict(fila) for fila in filas]
+
+    def total_logs(self, session_id):
+        conn = self._conectar()
+        total = conn.execute("SELECT COUNT(*) FROM logs WHERE session_id = ?", (session_id,)).fetchone()[0]
+        conn.close()
+        return total
@@ -0,0 +1,60 @@
+import os
+import threading
+from datetime import date
+from contextlib import contextmanager
+
+from resolvedor_urls import ResolvedorURLOficial
+
+
+class PoolNavegadores:
+    """Cupos de navegador compartidos por todas las sesiones del proceso"""
+
+    def __init__(self, max_navegadores=4):
+        self.max_navegadores = max_navegadores
+        self._cupos = threading.BoundedSemaphore(max_navegadores)
+
+    @contextmanager
+    def arrendar(self):
+        self._cupos.acquire()
+        try:
+            yield
+        finally:
+            self._cupos.release()
+
+
+class ContextoSesion:
+    """Estado propio de una sesión de investigación.
+
+    Carpeta de descarga, destino de logs, estadísticas y caché de URLs oficiales de la sesión,
+    el arriendo de navegadores y la fecha objetivo de los datos (parte de la clave para reutilizar
+    investigaciones entre sesiones). Los agentes, catálogos de dominios, palabras clave y cachés
+    SQLite se comparten sin copiarse, así que crear un contexto es barato y varias sesiones
+    pueden correr a la vez sin pisarse la carpeta de descarga.
+    """
+
+    def __init__(self, download_path, log_callback=None, navegadores=None, fecha_objetivo=None):
+        self.download_path = os.path.abspath(download_path)
+        os.makedirs(self.download_path, exist_ok=True)
+        self.log_callback = log_callback or (lambda mensaje, tipo='info': print(mensaje))
+        self.navegadores = navegadores or PoolNavegadores()
+        self.fecha_objetivo = fecha_objetivo or date.today().isoformat()
+        self.estadisticas_urls = ResolvedorURLOficial.estadisticas_vacias()
+        self.urls_oficiales = {}
+        self._lock = threading.Lock()
+
+    def log(self, mensaje, tipo='info'):
+        self.log_callback(mensaje, tipo)
+
+    def navegador(self):
+        """Arriendo de un cupo de navegador del pool compartido (context manager)"""
+        return self.navegadores.arrendar()
+
+    def url_oficial(self, nombre_entidad, resolver):
+        """URL oficial memorizada en la sesión; resolver(nombre) sólo se llama la primera vez"""
+        with self._lock:
+            if nombre_entidad in self.urls_oficiales:
+                return self.urls_oficiales[nombre_entidad]
+        url = resolver(nombre_entidad)
+        with self._lock:
+            self.urls_oficiales[nombre_entidad] = url
+        return url
@@ -1,14 +1,71 @@
+import re
 import threading
+import time
 import pandas as pd
 import os
+import socket
+import uuid
 from datetime import datetime
 from agente_transparencia import AgenteTransparencia
 from agente_contactos import AgenteContactos
+from filtro_aws import FiltroAWS
+from normalizacion_contactos import limpiar_texto, tabla_contactos, tabla_contactos_vacia
+from pipeline import Pipeline, Etapa
+from supervisor_procesos import SupervisorAgentes
+from contexto_sesion import ContextoSesion, PoolNavegadores
+from resiliencia import Circuitos, PoliticaReintentos, es_fallo_del_host
+from vuelo_unico import VueloUnico
+from exportador_excel import LibroStreaming, ContadorGrupos
+from resolvedor_urls import normalizar_nombre_entidad
+
+# Host de la Plataforma Nacional de Transparencia (consulta pública)
+HOST_TRANSPARENCIA = 'consultapublicamx.plataformadetransparencia.org.mx'
+
+# Columnas del resumen del Excel AWS: cargos (en minúsculas) que cuentan en cada una
+MARCAS_CARGO_AWS = {
+    'Directores': re.compile('director'),
+    'Coordinadores': re.compile('coordinador'),
+    'Tecnología': re.compile('tecnologia|sistemas|informatica'),
+    'Finanzas': re.compile('finanzas|administracion'),
+    'Innovación': re.compile('innovacion')
+}
 
 class Coordinador:
-    def __init__(self):
+    def __init__(self, max_workers_transparencia=2, max_workers_contactos=3, max_entidades_en_vuelo=None,
+                 plazo_transparencia=900, plazo_contactos=600, max_navegadores=2,
+                 umbral_fallos_host=3, max_intentos=3, espera_reintento=5, jitter_reintento=0.5,
+                 ttl_resultados=600):
         self.agente_transparencia = AgenteTransparencia()
         self.agente_contactos = AgenteContactos()
+        self.filtro_aws = FiltroAWS()
+        
+        # Límites de concurrencia por agente: la plataforma de transparencia es lenta y vigila
+        # sesiones simultáneas; la búsqueda web aguanta más navegadores en paralelo
+        self.max_workers_transparencia = max_workers_transparencia
+        self.max_workers_contactos = max_workers_contactos
+        self.max_entidades_en_vuelo = max_entidades_en_vuelo or (max_workers_transparencia + max_workers_contactos)
+        
+        # La extracción corre en procesos supervisados con plazo por entidad: un WebDriver o un
+        # Tesseract colgado se mata junto con su Chrome en vez de retener el lote para siempre
+        self.supervisor_transparencia = SupervisorAgentes('transparencia', max_workers_transparencia, plazo_transparencia)
+        self.supervisor_contactos = SupervisorAgentes('contactos', max_workers_contactos, plazo_contactos)
+        
+        # Navegadores del proceso principal (búsqueda de URL oficial) compartidos entre sesiones
+        self.navegadores = PoolNavegadores(max_navegadores)
+        
+        # Circuit breaker por host y reintentos: si la plataforma cae, las entidades esperan a que
+        # se recupere en lugar de fallar una tras otra tras el recorrido completo del navegador
+        self.circuitos = Circuitos(umbral_fallos=umbral_fallos_host)
+        self.politica_reintentos = PoliticaReintentos(max_intentos, espera_reintento, jitter_reintento)
+        
+        # La misma entidad pedida a la vez por varias sesiones (o repetida en una lista) se investiga
+        # una sola vez; los resultados exitosos se reutilizan durante ttl_resultados segundos
+        self.vuelo_unico = VueloUnico(ttl_resultados)
+    
+    def crear_contexto(self, download_path=None, log_callback=None, fecha_objetivo=None):
+        """Contexto de sesión sobre los agentes compartidos: carpeta, logs, caché y navegadores propios"""
+        return ContextoSesion(download_path or self.agente_transparencia.download_path, log_callback,
+                              self.navegadores, fecha_objetivo)
         
     def investigar_entidad(self, nombre_entidad, log_callback):
         """Coordina investigación con ambos agentes en paralelo"""
@@ -43,11 +100,211 @@ class Coordinador:
         
         return resultado
     
-    def _ejecutar_agente_transparencia(self, nombre_entidad, resultado, log_callback):
+    def investigar_entidades(self, entidades, log_callback=None, progreso_callback=None, contexto=None):
+        """Investiga muchas entidades en un pipeline por etapas y genera cada resultado al terminar.
+        
+        resolver → extraer → normalizar → filtrar → guardar, con colas acotadas entre etapas: el
+        navegador se libera en cuanto termina la extracción y el filtrado (Ollama, reglas AWS) y el
+        guardado se solapan con el scraping de otras entidades. Sólo se admiten max_entidades_en_vuelo
+        entidades a la vez y los resultados salen en orden de finalización. progreso_callback recibe
+        (entidad, etapa, completadas, total) con etapa 'transparencia', 'contactos' o 'completada'.
+        Archivos y logs van a la carpeta y al destino del contexto de sesión (uno nuevo si no se da).
+        """
+        contexto = contexto or self.crear_contexto(log_callback=log_callback)
+        log_callback = contexto.log
+        # entidades puede ser un generador (p. ej. tareas arrendadas de la cola): total desconocido
+        total = len(entidades) if hasattr(entidades, '__len__') else None
+        cupo = threading.Semaphore(self.max_entidades_en_vuelo)
+        
+        def log_entidad(nombre_entidad):
+            return lambda mensaje, tipo='info': log_callback(f"   [{nombre_entidad}] {mensaje.strip()}", tipo)
+        
+        def items():
+            pendientes = iter(entidades)
+            while True:
+                # Backpressure: esperar a que termine alguna entidad antes de tomar otra de la fuente
+                # (así una tarea arrendada de la cola no queda retenida mientras no hay cupo)
+                cupo.acquire()
+                nombre_entidad = next(pendientes, None)
+                if nombre_entidad is None:
+                    cupo.release()
+                    return
+                log_callback(f"🔍 Investigando: {nombre_entidad}", "info")
+                resultado = {
+                    'entidad': nombre_entidad,
+                    'timestamp': datetime.now().isoformat(),
+                    'transparencia': {},
+                    'contactos': {}
+                }
+                for fuente in ('transparencia', 'contactos'):
+                    yield {'entidad': nombre_entidad, 'fuente': fuente, 'resultado': resultado, 'contexto': contexto,
+                           'log': log_entidad(nombre_entidad), 'progreso': progreso_callback, 'total': total}
+        
+        pipeline = Pipeline([
+            Etapa('resolver', self._etapa_resolver, workers=4),
+            Etapa('extraer', self._etapa_extraer, ruta=lambda item: item['fuente'],
+                  workers={'transparencia': self.max_workers_transparencia, 'contactos': self.max_workers_contactos}),
+            Etapa('normalizar', self._etapa_normalizar, workers=2),
+            Etapa('filtrar', self._etapa_filtrar, workers=1),
+            Etapa('guardar', self._etapa_guardar, workers=1)
+        ], log_callback=log_callback)
+        
+        faltantes = {}
+        completadas = 0
+        for item in pipeline.ejecutar(items()):
+            resultado = item['resultado']
+            if item.get('errores'):
+                resultado.setdefault('errores', []).extend(item['errores'])
+            clave = id(resultado)
+            faltantes[clave] = faltantes.get(clave, 2) - 1
+            if faltantes[clave] == 0:
+                del faltantes[clave]
+                completadas += 1
+                cupo.release()
+                if progreso_callback:
+                    progreso_callback(resultado['entidad'], 'completada', completadas, total)
+                yield resultado
+    
+    def _etapa_resolver(self, item):
+        """Etapa 1: resolver la URL oficial (sólo contactos) sin ocupar un navegador de extracción"""
+        if item['fuente'] == 'contactos':
+            contexto = item['contexto']
+            with contexto.navegador():
+                item['url_oficial'] = contexto.url_oficial(
+                    item['entidad'],
+                    lambda nombre: self.agente_contactos.buscar_pagina_oficial_avanzada(nombre, contexto.estadisticas_urls)
+                )
+        return item
+    
+    def _etapa_extraer(self, item):
+        """Etapa 2: scraping con el navegador de cada agente; la tabla cruda sigue en memoria.
+        
+        Una sola extracción por (fuente, entidad normalizada, fecha objetivo): llamadas simultáneas se
+        unen a la que está en curso y las repetidas dentro del TTL salen de la caché.
+        """
+        resultado = item['resultado']
+        fuente = item['fuente']
+        if fuente == 'transparencia' or item.get('url_oficial'):
+            clave = (fuente, normalizar_nombre_entidad(item['entidad']), item['contexto'].fecha_objetivo)
+            datos, origen = self.vuelo_unico.ejecutar(clave, lambda: self._extraer_fuente(item))
+            if origen == 'en_vuelo':
+                item['log'](f"🔗 {fuente.capitalize()}: se reutiliza la investigación en curso de la misma entidad", "info")
+            elif origen == 'cache':
+                item['log'](f"💾 {fuente.capitalize()}: resultado reciente en caché, no se repite la investigación", "info")
+            resultado[fuente] = datos
+            if fuente == 'transparencia':
+                item['tabla'] = datos.pop('tabla', None)
+        else:
+            item['log'](f"❌ Búsqueda web falló: No se encontró página oficial")
+            resultado['contactos'] = {
+                'exito': False,
+                'error': 'No se encontró página oficial',
+                'url_directorio': None,
+                'url_oficial': None
+            }
+        if item['progreso']:
+            item['progreso'](item['entidad'], item['fuente'], None, item['total'])
+        return item
+    
+    def _extraer_fuente(self, item):
+        """Extracción de una fuente sobre un resultado propio; devuelve el dict de la fuente"""
+        item = dict(item, resultado={'transparencia': {}, 'contactos': {}})
+        if item['fuente'] == 'transparencia':
+            item['log'](f"🤖 Agente Transparencia: Validando y descargando Excel...")
+            self._extraer_con_reintentos(item, HOST_TRANSPARENCIA, self._ejecutar_agente_transparencia,
+                                         filtrar=False, download_path=item['contexto'].download_path)
+        else:
+            item['log'](f"🌐 Agente Contactos: Buscando en web...")
+            self._ejecutar_agente_contactos(item['entidad'], item['resultado'], item['log'], url_oficial=item['url_oficial'],
+                                            download_path=item['contexto'].download_path)
+        return item['resultado'][item['fuente']]
+    
+    def _extraer_con_reintentos(self, item, host, ejecutar_agente, **opciones):
+        """Ejecuta el agente respetando el circuito del host y reintenta los fallos atribuibles al host.
+        
+        Mientras el circuito está abierto sólo se bloquean los hilos de esta ruta; las demás etapas
+        siguen. Sólo los fallos del host (plazo vencido, red, WebDriver) cuentan para el circuito y
+        se reintentan; un fallo propio de la entidad (p. ej. no existe en la plataforma) significa
+        que el host respondió, así que cuenta como éxito para el circuito y no se reintenta.
+        """
+        circuito = self.circuitos.circuito(host)
+        fuente = item['fuente']
+        for intento in range(1, self.politica_reintentos.max_intentos + 1):
+            if circuito.estado != 'cerrado':
+                item['log'](f"⏸️ {host} en pausa (circuito {circuito.estado}), esperando para continuar")
+            circuito.esperar_turno()
+            ejecutar_agente(item['entidad'], item['resultado'], item['log'], **opciones)
+            datos = item['resultado'][fuente]
+            if datos.get('exito') or not es_fallo_del_host(datos):
+                circuito.registrar_exito()
+                break
+            circuito.registrar_fallo()
+            if intento == self.politica_reintentos.max_intentos:
+                break
+            espera = self.politica_reintentos.espera(intento)
+            item['log'](f"🔁 Reintento {intento + 1}/{self.politica_reintentos.max_intentos} en {espera:.0f}s", "warning")
+            time.sleep(espera)
+        if not datos.get('exito'):
+            datos['intentos'] = intento
+    
+    def _etapa_normalizar(self, item):
+        """Etapa 3: limpiar la tabla de transparencia (espacios, vacíos y 'nan' a NA)"""
+        if item.get('tabla') is not None and not item['tabla'].empty:
+            item['tabla'] = item['tabla'].apply(limpiar_texto)
+        return item
+    
+    def _etapa_filtrar(self, item):
+        """Etapa 4: filtro Ollama por cargo y reglas AWS, fuera del hilo del navegador"""
+        tabla = item.get('tabla')
+        if tabla is None or tabla.empty:
+            return item
+        
+        item['filtrado_ollama'] = True
+        try:
+            tabla = self.agente_transparencia.contact_filter.filter_contacts_batch(tabla)
+        except Exception as e:
+            item['log'](f"⚠️ Error aplicando filtro Ollama, se conservan los datos sin filtrar: {e}", "warning")
+            item['filtrado_ollama'] = False
+        item['tabla'] = tabla
+        
+        item['log'](f"📊 Filtrando contactos de {item['entidad']}...")
+        contactos_aws = self.filtro_aws.filtrar_dataframe(tabla)
+        for contacto in contactos_aws:
+            contacto['entidad'] = item['entidad']
+        item['contactos_aws'] = contactos_aws
+        return item
+    
+    def _etapa_guardar(self, item):
+        """Etapa 5: persistir el directorio filtrado y los contactos AWS de la entidad"""
+        tabla = item.pop('tabla', None)
+        if tabla is None or tabla.empty:
+            return item
+        
+        transparencia = item['resultado']['transparencia']
+        institucion_clean = item['entidad'].replace(' ', '_').replace('/', '_').lower()
+        prefijo = 'directorio_filtered' if item.get('filtrado_ollama') else 'directorio'
+        ruta_archivo = os.path.join(item['contexto'].download_path, f"{prefijo}_{institucion_clean}.csv")
+        tabla.to_csv(ruta_archivo, index=False, encoding='utf-8-sig')
+        transparencia['ruta_archivo'] = ruta_archivo
+        transparencia['archivo_descargado'] = True
+        transparencia['total_registros'] = len(tabla)
+        
+        contactos_aws = item.get('contactos_aws', [])
+        if contactos_aws:
+            pd.DataFrame(contactos_aws).to_csv(ruta_archivo.replace('.csv', '_aws.csv'), index=False)
+        item['resultado']['contactos_aws'] = contactos_aws
+        item['log'](f"💾 Directorio guardado: {os.path.basename(ruta_archivo)} ({len(contactos_aws)} contactos AWS)", "success")
+        return item
+    
+    def _ejecutar_agente_transparencia(self, nombre_entidad, resultado, log_callback, **opciones):
         """Ejecutar agente de transparencia"""
         try:
             log_callback(f"      📋 Validando nombre en plataforma oficial...")
-            datos = self.agente_transparencia.investigar(nombre_entidad)
+            opciones.setdefault('download_path', self.agente_transparencia.download_path)
+            datos = self.supervisor_transparencia.ejecutar(nombre_entidad, **opciones)
+            datos.setdefault('institucion_validada', None)
+            datos.setdefault('similitud', 0)
+            datos.setdefault('archivo_descargado', False)
             resultado['transparencia'] = datos
             
             if datos['exito']:
@@ -63,6 +320,8 @@ class Coordinador:
                 if archivo:
                     nombre_archivo = archivo.split('/')[-1] if '/' in archivo else archivo.split('\\')[-1]
                     log_callback(f"      📥 Excel descargado: {nombre_archivo}")
+                elif not opciones.get('filtrar', True):
+                    log_callback(f"      📥 Tabla extraída: {datos.get('total_registros', 0)} registros, pasa a filtrado")
                 else:
                     log_callback(f"      📥 Excel procesado (verificar carpeta downloads)")
             else:
@@ -79,11 +338,13 @@ class Coordinador:
                 'archivo_descargado': False
             }
     
-    def _ejecutar_agente_contactos(self, nombre_entidad, resultado, log_callback):
+    def _ejecutar_agente_contactos(self, nombre_entidad, resultado, log_callback, **opciones):
         """Ejecutar agente de contactos - Solo URLs"""
         try:
             log_callback(f"      🔍 Buscando URL de directorio...")
-            datos = self.agente_contactos.investigar(nombre_entidad)
+            opciones.setdefault('download_path', self.agente_contactos.download_path)
+            datos = self.supervisor_contactos.ejecutar(nombre_entidad, **opciones)
+            datos.setdefault('url_directorio', None)
             resultado['contactos'] = datos
             
             if datos['exito']:
@@ -166,6 +427,58 @@ class Coordinador:
         
         return contactos_filtrados
     
+    def investigar_desde_cola(self, cola, contexto, session_id, trabajador=None, intervalo_sondeo=2,
+                              esperar_ajenas=True):
+        """Procesa las tareas de una sesión de la cola hasta que no quede ninguna pendiente.
+        
+        Arrienda las entidades a medida que el pipeline admite más, renueva los arriendos con un latido
+        mientras trabaja y completa cada tarea al salir su resultado. Las entidades que se agreguen a la
+        sesión durante la ejecución se recogen en el mismo recorrido. Con esperar_ajenas=False no se
+        espera a las tareas arrendadas por otros trabajadores (modo trabajador de varios nodos).
+        cola puede ser una ColaTrabajos local o un proxy de cola_broker.
+        """
+        trabajador = trabajador or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        tareas = {}
+        terminado = threading.Event()
+        
+        def latido():
+            while not terminado.wait(cola.intervalo_latido()):
+                cola.renovar(trabajador)
+        
+        def entidades():
+            while True:
+                arrendadas = cola.arrendar(trabajador, session_id=session_id)
+                if not arrendadas:
+                    conteo = cola.contar(session_id) if esperar_ajenas else None
+                    if not tareas and (conteo is None or conteo['leased'] == 0):
+                        return
+                    # Quedan tareas en curso (propias o de otro trabajador): pueden llegar más o volver a la cola
+                    if terminado.wait(intervalo_sondeo):
+                        return
+                    continue
+                for tarea in arrendadas:
+                    tareas[tarea['entidad']] = tarea
+                    yield tarea['entidad']
+        
+        def progreso(entidad, etapa, completadas, total):
+            cola.marcar_etapa(session_id, entidad, etapa)
+        
+        threading.Thread(target=latido, name='cola-latido', daemon=True).start()
+        try:
+            for resultado in self.investigar_entidades(entidades(), progreso_callback=progreso, contexto=contexto):
+                tarea = tareas.pop(resultado['entidad'])
+                if resultado.get('errores'):
+                    cola.fallar(tarea['id'], '; '.join(resultado['errores']), resultado)
+                elif resultado['transparencia'].get('exito') or resultado['contactos'].get('exito'):
+                    cola.completar(tarea['id'], resultado)
+                else:
+                    # Ambos agentes fallaron por causas de la entidad: no tiene caso reintentar
+                    error = resultado['transparencia'].get('error') or resultado['contactos'].get('error')
+                    cola.fallar(tarea['id'], error, resultado, reintentar=False)
+                yield resultado
+        finally:
+            terminado.set()
+    
     def investigar_multiples_entidades(self, entidades_texto, log_callback):
         """Investiga múltiples entidades y filtra contactos AWS"""
         entidades = [e.strip() for e in entidades_texto.split('\n') if e.strip()]
@@ -174,24 +487,26 @@ class Coordinador:
             return {"error": "No se proporcionaron entidades para investigar"}
         
         log_callback(f"🚀 Iniciando investigación de {len(entidades)} entidades...")
+        contexto = self.crear_contexto(log_callback=log_callback)
         
         resultados = []
-        todos_contactos = []
+        tablas_contactos = []
         
-        for i, entidad in enumerate(entidades, 1):
-            log_callback(f"\n🔍 [{i}/{len(entidades)}] Investigando: {entidad}")
-            
-            # Investigar entidad individual
-            resultado = self.investigar_entidad(entidad, log_callback)
+        def progreso(entidad, etapa, completadas, total):
+            if etapa == 'completada':
+                log_callback(f"\n✅ [{completadas}/{total}] Completada: {entidad}")
+        
+        # Entidades en paralelo; cada resultado llega en cuanto ambos agentes terminan
+        for resultado in self.investigar_entidades(entidades, progreso_callback=progreso, contexto=contexto):
             resultados.append(resultado)
             
             # Extraer contactos de ambas fuentes
-            contactos_entidad = self._extraer_contactos_resultado(resultado, entidad)
-            todos_contactos.extend(contactos_entidad)
+            tablas_contactos.append(self._extraer_contactos_resultado(resultado, resultado['entidad']))
         
         # Filtrar contactos relevantes para AWS
         log_callback(f"\n🤖 Filtrando contactos relevantes para AWS...")
-        contactos_aws = self.filtrar_contactos_aws(todos_contactos)
+        todos_contactos = pd.concat(tablas_contactos, ignore_index=True) if tablas_contactos else tabla_contactos_vacia()
+        contactos_aws = self.filtrar_contactos_aws(todos_contactos.fillna('').to_dict('records'))
         
         # Agrupar por entidad
         contactos_por_entidad = {}
@@ -202,6 +517,7 @@ class Coordinador:
             contactos_por_entidad[entidad].append(contacto)
         
         log_callback(f"🎯 Contactos AWS encontrados: {len(contactos_aws)}")
+        log_callback(f"🔗 URLs oficiales — {self.agente_contactos.resolvedor_urls.resumen_estadisticas(contexto.estadisticas_urls)}")
         log_callback(f"🎉 Investigación completada")
         
         return {
@@ -214,80 +530,64 @@ class Coordinador:
         }
     
     def _extraer_contactos_resultado(self, resultado, entidad):
-        """Extrae contactos de los resultados de transparencia y web"""
-        contactos = []
+        """Contactos de transparencia y web de una entidad como tabla tipada (columnas COLUMNAS_CONTACTO)"""
+        tablas = []
         
-        # Contactos de transparencia
-        if resultado['transparencia'].get('exito') and 'ruta_archivo' in resultado['transparencia']:
+        # Contactos de transparencia: las variantes de encabezado se resuelven una vez por archivo
+        transparencia = resultado['transparencia']
+        if transparencia.get('exito') and transparencia.get('ruta_archivo'):
             try:
-                df_transp = pd.read_csv(resultado['transparencia']['ruta_archivo'])
-                for _, row in df_transp.iterrows():
-                    contactos.append({
-                        'entidad': entidad,
-                        'nombre': str(row.get('Nombre(s) de la persona servidora pública', '')),
-                        'cargo': str(row.get('Denominación del cargo', '')),
-                        'email': str(row.get('Correo electrónico oficial, en su caso', '')),
-                        'telefono': str(row.get('Teléfono', '')),
-                        'fuente': 'transparencia'
-                    })
-            except Exception:
-                pass
+                df_transp = pd.read_csv(transparencia['ruta_archivo'], dtype=str, keep_default_na=False)
+                tablas.append(tabla_contactos(df_transp, entidad, 'transparencia'))
+            except Exception as e:
+                print(f"⚠️ No se pudo leer {transparencia['ruta_archivo']}: {e}")
         
         # Contactos web
         if resultado['contactos'].get('exito'):
-            contactos_web = resultado['contactos'].get('datos', {}).get('contactos', [])
-            for contacto in contactos_web:
-                contactos.append({
-                    'entidad': entidad,
-                    'nombre': contacto.get('nombre', ''),
-                    'cargo': contacto.get('cargo', ''),
-                    'email': contacto.get('email', ''),
-                    'telefono': contacto.get('telefono', ''),
-                    'fuente': 'web'
-                })
-        
-        return contactos
+            contactos_web = (resultado['contactos'].get('datos') or {}).get('contactos', [])
+            if contactos_web:
+                tablas.append(tabla_contactos(pd.DataFrame(contactos_web), entidad, 'web'))
+        
+        tablas = [tabla for tabla in tablas if not tabla.empty]
+        return pd.concat(tablas, ignore_index=True) if tablas else tabla_contactos_vacia()
     
     def generar_excel_aws(self, contactos_por_entidad, ruta_descarga):
-        """Genera Excel con contactos AWS organizados por entidad"""
+        """Genera Excel con contactos AWS organizados por entidad.
+        
+        Las filas se escriben en streaming (memoria constante) y las hojas o archivos se dividen solos
+        al pasar el límite de filas de Excel; el resumen por entidad se cuenta mientras se escriben.
+        """
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"contactos_aws_{timestamp}.xlsx"
         filepath = f"{ruta_descarga}/{filename}"
         
-        with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
+        resumen = ContadorGrupos(MARCAS_CARGO_AWS)
+        with LibroStreaming(filepath) as libro:
             # Hoja con todos los contactos organizados
-            todos_contactos = []
+            hoja = libro.hoja('Contactos AWS', ['Entidad', 'Nombre', 'Cargo', 'Email', 'Teléfono', 'Relevancia AWS', 'Fuente'])
+            # El resumen se llena al final pero se queda en el primer archivo si el libro se divide
+            hoja_resumen = libro.hoja('Resumen', ['Entidad', 'Total Contactos AWS', 'Directores', 'Coordinadores',
+                                                  'Tecnología', 'Finanzas', 'Innovación'], dividir_archivos=False)
             for entidad, contactos in contactos_por_entidad.items():
                 for contacto in contactos:
-                    todos_contactos.append({
-                        'Entidad': entidad,
-                        'Nombre': contacto['nombre'],
-                        'Cargo': contacto['cargo'],
-                        'Email': contacto['email'],
-                        'Teléfono': contacto['telefono'],
-                        'Relevancia AWS': f"{contacto.get('relevancia_aws', 0)}%",
-                        'Fuente': contacto['fuente']
-                    })
-            
-            df_contactos = pd.DataFrame(todos_contactos)
-            df_contactos.to_excel(writer, sheet_name='Contactos AWS', index=False)
+                    hoja.agregar((
+                        entidad,
+                        contacto.get('nombre'),
+                        contacto.get('cargo'),
+                        contacto.get('email'),
+                        contacto.get('telefono'),
+                        f"{contacto.get('relevancia_aws', 0)}%",
+                        contacto.get('fuente', 'transparencia')
+                    ))
+                    cargo = str(contacto.get('cargo') or '').lower()
+                    resumen.agregar(entidad, {columna: patron.search(cargo) for columna, patron in MARCAS_CARGO_AWS.items()})
             
             # Hoja resumen por entidad
-            resumen_data = []
-            for entidad, contactos in contactos_por_entidad.items():
-                resumen_data.append({
-                    'Entidad': entidad,
-                    'Total Contactos AWS': len(contactos),
-                    'Directores': len([c for c in contactos if 'director' in c['cargo'].lower()]),
-                    'Coordinadores': len([c for c in contactos if 'coordinador' in c['cargo'].lower()]),
-                    'Tecnología': len([c for c in contactos if any(t in c['cargo'].lower() for t in ['tecnologia', 'sistemas', 'informatica'])]),
-                    'Finanzas': len([c for c in contactos if any(f in c['cargo'].lower() for f in ['finanzas', 'administracion'])]),
-                    'Innovación': len([c for c in contactos if 'innovacion' in c['cargo'].lower()])
-                })
-            
-            df_resumen = pd.DataFrame(resumen_data)
-            df_resumen.to_excel(writer, sheet_name='Resumen', index=False)
+            for fila in resumen.filas(orden=list(contactos_por_entidad)):
+                hoja_resumen.agregar(fila)
         
+        if len(libro.rutas) > 1:
+            print(f"📂 Exportación dividida en {len(libro.rutas)} archivos: {', '.join(os.path.basename(r) for r in libro.rutas)}")
         return filepath
     
     def procesar_con_claude_al_final(self, resultados, log_callback):
@@ -0,0 +1,143 @@
+import mmap
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+
+import requests
+
+from clasificador_enlaces import tipo_por_content_type, tipo_por_firma
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+
+# Tamaño máximo por tipo de contenido
+LIMITES_POR_TIPO = {
+    'pdf': 50 * 1024 * 1024,
+    'imagen': 25 * 1024 * 1024,
+    'html': 5 * 1024 * 1024
+}
+
+SUFIJOS = {'pdf': '.pdf', 'imagen': '.img', 'html': '.html'}
+
+
+def rss_proceso():
+    """Memoria residente del proceso en bytes (pico histórico si no hay psutil; None si no se puede medir)"""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    if resource is not None:
+        # ru_maxrss está en KB en Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    return None
+
+
+def _mayor(actual, medida):
+    if medida is not None and (actual is None or medida > actual):
+        return medida
+    return actual
+
+
+class ArchivoDescargado:
+    """Contenido descargado en un archivo temporal; se elimina al salir del bloque with"""
+
+    def __init__(self, url, ruta, tipo, tamano, content_type, segundos, pico_rss):
+        self.url = url
+        self.ruta = ruta
+        self.tipo = tipo
+        self.tamano = tamano
+        self.content_type = content_type
+        self.segundos = segundos
+        self.pico_rss = pico_rss
+
+    @contextmanager
+    def mapear(self):
+        """Memory map de solo lectura del archivo"""
+        with open(self.ruta, 'rb') as archivo:
+            with mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ) as datos:
+                yield datos
+
+    def eliminar(self):
+        try:
+            os.remove(self.ruta)
+        except OSError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.eliminar()
+
+
+def descargar(url, tipo, max_bytes=None, timeout=30, chunk_size=64 * 1024, intervalo_rss=1024 * 1024):
+    """Descarga en streaming a un archivo temporal validando tipo y tamaño.
+
+    Aborta antes de leer el cuerpo si el Content-Type o el Content-Length no corresponden,
+    y al primer fragmento si los bytes mágicos delatan otro tipo. Devuelve un ArchivoDescargado o None.
+    Si la conexión falla a medio cuerpo, el temporal se elimina y la excepción se propaga.
+    La memoria residente se muestrea cada intervalo_rss bytes escritos.
+    """
+    max_bytes = max_bytes or LIMITES_POR_TIPO.get(tipo, LIMITES_POR_TIPO['html'])
+    inicio = time.monotonic()
+    pico_rss = rss_proceso()
+
+    with requests.get(url, headers=HEADERS, timeout=timeout, stream=True) as response:
+        if response.status_code != 200:
+            print(f"   ⚠️ Descarga fallida ({response.status_code}): {url}")
+            return None
+
+        content_type = response.headers.get('Content-Type', '')
+        tipo_declarado = tipo_por_content_type(content_type)
+        if tipo_declarado and tipo_declarado != tipo:
+            print(f"   ⚠️ Content-Type inesperado ({content_type}) para {tipo}, se omite: {url}")
+            return None
+
+        longitud = response.headers.get('Content-Length', '')
+        if longitud.isdigit() and int(longitud) > max_bytes:
+            print(f"   ⚠️ Documento de {int(longitud) / (1024 * 1024):.1f} MB excede "
+                  f"{max_bytes / (1024 * 1024):.1f} MB, se omite: {url}")
+            return None
+
+        fd, ruta = tempfile.mkstemp(suffix=SUFIJOS.get(tipo, ''))
+        total = 0
+        siguiente_muestra = intervalo_rss
+        motivo = None
+        try:
+            with os.fdopen(fd, 'wb') as archivo:
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    if total == 0:
+                        tipo_real = tipo_por_firma(chunk)
+                        if tipo_real and tipo_real != tipo:
+                            motivo = f"el contenido es {tipo_real}, no {tipo}"
+                            break
+                    total += len(chunk)
+                    if total > max_bytes:
+                        motivo = f"excede {max_bytes / (1024 * 1024):.1f} MB"
+                        break
+                    archivo.write(chunk)
+                    if total >= siguiente_muestra:
+                        siguiente_muestra = total + intervalo_rss
+                        pico_rss = _mayor(pico_rss, rss_proceso())
+        except BaseException:
+            os.remove(ruta)
+            raise
+    pico_rss = _mayor(pico_rss, rss_proceso())
+
+    if motivo:
+        os.remove(ruta)
+        print(f"   ⚠️ Descarga abortada ({motivo}): {url}")
+        return None
+
+    descarga = ArchivoDescargado(url, ruta, tipo, total, content_type, time.monotonic() - inicio, pico_rss)
+    rss_texto = f", pico RSS {pico_rss / (1024 * 1024):.0f} MB" if pico_rss is not None else ""
+    print(f"   📥 Descargado {total / (1024 * 1024):.1f} MB en {descarga.segundos:.1f}s{rss_texto}")
+    return descarga
@@ -0,0 +1,193 @@
+import gzip
+import re
+import xml.etree.ElementTree as ET
+from urllib.parse import urljoin, urlparse
+
+import requests
+
+from escaner_enlaces import EscanerEnlaces
+from extractor_contactos import PATRON_EMAIL
+from resolvedor_urls import normalizar_nombre_entidad
+
+SEPARADORES_URL = re.compile(r'[-_/.?=&]+')
+PATRON_TITULO = re.compile(r'<(title|h1)[^>]*>(.*?)</\1>', re.IGNORECASE | re.DOTALL)
+HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+
+# Ubicaciones habituales cuando robots.txt no declara sitemaps (genérico, WordPress, Joomla)
+RUTAS_SITEMAP = [
+    '/sitemap.xml', '/sitemap_index.xml', '/wp-sitemap.xml',
+    '/index.php?option=com_jmap&view=sitemap&format=xml'
+]
+
+
+class _LectorFragmentos:
+    """Expone un iterador de fragmentos como archivo y corta al superar max_bytes (protege de gzip bomb).
+
+    Los bytes iniciales (ya leídos para detectar gzip) cuentan para el límite.
+    """
+
+    def __init__(self, fragmentos, max_bytes, inicial=b''):
+        self.fragmentos = fragmentos
+        self.restante = max_bytes - len(inicial)
+        self.buffer = inicial
+
+    def read(self, n=-1):
+        while (n is None or n < 0 or len(self.buffer) < n) and self.restante >= 0:
+            fragmento = next(self.fragmentos, None)
+            if fragmento is None:
+                break
+            self.buffer += fragmento
+            self.restante -= len(fragmento)
+        if self.restante < 0:
+            raise ValueError("sitemap excede el tamaño máximo")
+        if n is None or n < 0:
+            n = len(self.buffer)
+        datos, self.buffer = self.buffer[:n], self.buffer[n:]
+        return datos
+
+
+def _etiqueta(elemento):
+    return elemento.tag.rsplit('}', 1)[-1]
+
+
+def leer_robots(url_base, timeout=10):
+    """Sitemaps declarados y Crawl-delay (para User-agent: *) de robots.txt"""
+    resultado = {'sitemaps': [], 'crawl_delay': None}
+    try:
+        response = requests.get(urljoin(url_base, '/robots.txt'), headers=HEADERS, timeout=timeout)
+        if response.status_code != 200 or 'html' in response.headers.get('Content-Type', ''):
+            return resultado
+    except requests.RequestException:
+        return resultado
+
+    agentes = []
+    en_reglas = False
+    for linea in response.text.splitlines():
+        linea = linea.split('#', 1)[0].strip()
+        if ':' not in linea:
+            continue
+        clave, valor = (parte.strip() for parte in linea.split(':', 1))
+        clave = clave.lower()
+        if clave == 'user-agent':
+            # Un User-agent tras reglas abre un grupo nuevo
+            if en_reglas:
+                agentes = []
+                en_reglas = False
+            agentes.append(valor)
+        elif clave == 'sitemap':
+            resultado['sitemaps'].append(urljoin(url_base, valor))
+        else:
+            en_reglas = True
+            if clave == 'crawl-delay' and '*' in agentes:
+                try:
+                    resultado['crawl_delay'] = float(valor)
+                except ValueError:
+                    pass
+    return resultado
+
+
+class DescubridorSitemap:
+    """Descubre páginas de directorio en robots.txt y sitemaps antes de abrir el navegador"""
+
+    def __init__(self, escaner=None, timeout=15, max_bytes=50 * 1024 * 1024,
+                 max_urls=1000000, max_sitemaps=20, umbral_confianza=5, max_confirmaciones=3,
+                 min_emails_confirmacion=3):
+        self.escaner = escaner or EscanerEnlaces()
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.max_urls = max_urls
+        self.max_sitemaps = max_sitemaps
+        self.umbral_confianza = umbral_confianza
+        self.max_confirmaciones = max_confirmaciones
+        self.min_emails_confirmacion = min_emails_confirmacion
+
+    def recorrer_sitemap(self, url_sitemap):
+        """Genera ('sitemap', url) o ('url', url) leyendo el XML en streaming (admite .gz)"""
+        with requests.get(url_sitemap, headers=HEADERS, timeout=self.timeout, stream=True) as response:
+            if response.status_code != 200 or 'html' in response.headers.get('Content-Type', ''):
+                return
+            fragmentos = response.iter_content(chunk_size=64 * 1024)
+            primero = next(fragmentos, b'')
+            flujo = _LectorFragmentos(fragmentos, self.max_bytes, primero)
+            if primero[:2] == b'\x1f\x8b':
+                # .xml.gz: descomprimir al vuelo, también con límite de bytes descomprimidos
+                gz = gzip.GzipFile(fileobj=flujo)
+                flujo = _LectorFragmentos(iter(lambda: gz.read(64 * 1024), b''), self.max_bytes)
+
+            raiz = None
+            for evento, elemento in ET.iterparse(flujo, events=('start', 'end')):
+                if evento == 'start':
+                    if raiz is None:
+                        raiz = elemento
+                    continue
+                etiqueta = _etiqueta(elemento)
+                if etiqueta in ('url', 'sitemap'):
+                    loc = next((hijo.text for hijo in elemento if _etiqueta(hijo) == 'loc' and hijo.text), None)
+                    if loc:
+                        yield ('sitemap' if etiqueta == 'sitemap' else 'url'), loc.strip()
+                    # Liberar lo ya procesado para mantener memoria constante
+                    raiz.clear()
+
+    def confirmar_directorio(self, url, max_bytes=512 * 1024):
+        """Segunda señal barata: la página (HTML) tiene correos o una palabra de directorio en title/h1"""
+        try:
+            with requests.get(url, headers=HEADERS, timeout=self.timeout, stream=True) as response:
+                if response.status_code != 200 or 'html' not in response.headers.get('Content-Type', ''):
+                    return False
+                contenido = b''
+                for fragmento in response.iter_content(chunk_size=64 * 1024):
+                    contenido += fragmento
+                    if len(contenido) >= max_bytes:
+                        break
+        except requests.RequestException:
+            return False
+        html = contenido.decode(response.encoding or 'utf-8', errors='ignore')
+        if len(set(PATRON_EMAIL.findall(html))) >= self.min_emails_confirmacion:
+            return True
+        titulos = ' '.join(texto for _, texto in PATRON_TITULO.findall(html))
+        return bool(self.escaner.patron_directorio.search(normalizar_nombre_entidad(re.sub(r'<[^>]+>', ' ', titulos))))
+
+    def descubrir(self, url_base, max_candidatos=10):
+        """Candidatos de directorio puntuados por palabras clave y Crawl-delay del sitio"""
+        robots = leer_robots(url_base, self.timeout)
+        pendientes = robots['sitemaps'] or [urljoin(url_base, ruta) for ruta in RUTAS_SITEMAP]
+        vistos = set()
+        mejores = {}
+        urls_leidas = 0
+
+        while pendientes and len(vistos) < self.max_sitemaps and urls_leidas < self.max_urls:
+            url_sitemap = pendientes.pop(0)
+            if url_sitemap in vistos:
+                continue
+            vistos.add(url_sitemap)
+            try:
+                for tipo, loc in self.recorrer_sitemap(url_sitemap):
+                    if tipo == 'sitemap':
+                        pendientes.append(loc)
+                        continue
+                    urls_leidas += 1
+                    if urls_leidas > self.max_urls:
+                        break
+                    # Filtro rápido sobre la URL cruda; solo las coincidencias se puntúan completas
+                    if not self.escaner.patron_directorio.search(SEPARADORES_URL.sub(' ', loc.lower())):
+                        continue
+                    resultado = self.escaner.puntuar({'href': loc}, url_base)
+                    if resultado and resultado[0] > mejores.get(loc, {}).get('puntaje', 0):
+                        mejores[loc] = {'url': loc, 'puntaje': resultado[0], 'palabras': resultado[1]}
+            except (requests.RequestException, ET.ParseError, ValueError, OSError) as e:
+                print(f"   ⚠️ Sitemap no legible {url_sitemap}: {e}")
+
+        # Confiable (permite omitir los menús) sólo con puntaje suficiente y una segunda señal de la página
+        candidatos = sorted(mejores.values(), key=lambda c: c['puntaje'], reverse=True)[:max_candidatos]
+        for candidato in candidatos:
+            candidato['confiable'] = False
+        por_confirmar = [c for c in candidatos if c['puntaje'] >= self.umbral_confianza][:self.max_confirmaciones]
+        for candidato in por_confirmar:
+            if self.confirmar_directorio(candidato['url']):
+                candidato['confiable'] = True
+                break
+
+        if vistos:
+            print(f"🗺️ Sitemaps leídos: {len(vistos)}, URLs: {urls_leidas}, candidatos: {len(candidatos)}"
+                  f" ({urlparse(url_base).netloc})")
+        return {'candidatos': candidatos, 'crawl_delay': robots['crawl_delay']}
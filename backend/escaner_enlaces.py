@@ -0,0 +1,144 @@
+import re
+from urllib.parse import urljoin, urlparse
+
+from extractor_contactos import regex_trie
+from proveedores_busqueda import DOMINIOS_DESCARTADOS
+from resolvedor_urls import normalizar_nombre_entidad
+
+# Peso de cada palabra clave (texto normalizado, sin acentos); las más específicas pesan más
+PESOS_DIRECTORIO = {
+    'directorio': 10, 'directorio institucional': 12, 'directorio de funcionarios': 12,
+    'directorio de personal': 12, 'directorio telefonico': 11, 'organigrama': 9,
+    'funcionarios': 7, 'servidores publicos': 6, 'autoridades': 6, 'personal directivo': 6,
+    'quien es quien': 6, 'estructura organizacional': 5, 'estructura organica': 5,
+    'estructura administrativa': 5, 'conocenos': 3, 'conozcanos': 3, 'quienes somos': 3,
+    'staff': 3, 'personal': 2, 'gobierno': 1
+}
+
+# Contacto general de la dependencia: no es un directorio de funcionarios
+PALABRAS_EVITAR = [
+    'contacto', 'contactanos', 'atencion al publico', 'tramites', 'servicios', 'quejas',
+    'sugerencias', 'contacto general', 'informacion general', 'atencion ciudadana', 'mesa de ayuda'
+]
+
+# Factor por campo en el que aparece la palabra clave
+FACTORES_CAMPO = {'texto': 1.0, 'etiqueta': 0.8, 'ruta': 0.6, 'menu': 0.3}
+
+SELECTORES_MENU = ['nav', 'header', '[role=navigation]', '.menu', '.navbar', '.nav', '#menu',
+                   '.main-menu', '.dropdown-menu', '.submenu']
+
+# Un solo execute_script: todos los enlaces con su texto, atributos y ruta de menú padre
+SCRIPT_ENLACES = """
+var selectorMenu = arguments[0].join(',');
+return Array.prototype.map.call(document.querySelectorAll('a[href]'), function(a) {
+    var ruta = [];
+    var el = a.parentElement;
+    while (el && el !== document.body) {
+        if (el.tagName === 'LI') {
+            var etiqueta = el.querySelector(':scope > a, :scope > span, :scope > button');
+            if (etiqueta && etiqueta !== a) {
+                ruta.unshift((etiqueta.textContent || '').trim().slice(0, 60));
+            }
+        }
+        el = el.parentElement;
+    }
+    return {
+        href: a.href,
+        texto: a.textContent || '',
+        aria: a.getAttribute('aria-label') || '',
+        titulo: a.getAttribute('title') || '',
+        menu: ruta,
+        en_menu: a.closest(selectorMenu) !== null
+    };
+});
+"""
+
+
+def _patron_palabras(palabras):
+    return re.compile(r'\b(?:' + regex_trie(sorted(palabras)) + r')\b')
+
+
+def _mismo_sitio(url, url_base):
+    host = urlparse(url).netloc.lower().removeprefix('www.')
+    return host == urlparse(url_base).netloc.lower().removeprefix('www.')
+
+
+class EscanerEnlaces:
+    """Escanea todos los enlaces de la página en un solo viaje al navegador y los puntúa"""
+
+    def __init__(self, pesos=None, palabras_evitar=None):
+        self.pesos = pesos or PESOS_DIRECTORIO
+        self.patron_directorio = _patron_palabras(self.pesos)
+        self.patron_evitar = _patron_palabras(
+            [normalizar_nombre_entidad(p) for p in (palabras_evitar or PALABRAS_EVITAR)]
+        )
+
+    def puntuar(self, enlace, url_base):
+        """Puntaje de un enlace crudo (href, texto, aria, titulo, menu); None si se descarta"""
+        href = enlace.get('href') or ''
+        if not href or href.startswith(('mailto:', 'tel:', 'javascript:')):
+            return None
+        if any(d in urlparse(href).netloc for d in DOMINIOS_DESCARTADOS):
+            return None
+
+        campos = {
+            'texto': normalizar_nombre_entidad(enlace.get('texto') or ''),
+            'etiqueta': normalizar_nombre_entidad(f"{enlace.get('aria') or ''} {enlace.get('titulo') or ''}"),
+            'ruta': normalizar_nombre_entidad(re.sub(r'[-_/.?=&]+', ' ', urlparse(href).path)),
+            'menu': normalizar_nombre_entidad(' '.join(enlace.get('menu') or []))
+        }
+
+        # La ruta sólo se revisa en su último segmento: /servicios/directorio sigue siendo válido,
+        # /directorio-de-tramites no
+        ultimo_segmento = normalizar_nombre_entidad(
+            re.sub(r'[-_.?=&]+', ' ', urlparse(href).path.rstrip('/').rsplit('/', 1)[-1]))
+        if any(self.patron_evitar.search(texto) for texto in (campos['texto'], campos['etiqueta'], ultimo_segmento)):
+            return None
+
+        puntaje = 0.0
+        palabras = set()
+        for campo, texto in campos.items():
+            encontradas = set(self.patron_directorio.findall(texto))
+            puntaje += FACTORES_CAMPO[campo] * sum(self.pesos[p] for p in encontradas)
+            palabras |= encontradas
+
+        if not puntaje:
+            return None
+        if enlace.get('en_menu'):
+            puntaje += 1
+        if not _mismo_sitio(href, url_base):
+            puntaje *= 0.5
+        return round(puntaje, 2), sorted(palabras)
+
+    def candidatos(self, enlaces_crudos, url_base, min_puntaje=1):
+        """Filtra y ordena enlaces crudos por puntaje, sin duplicados por URL"""
+        mejores = {}
+        for enlace in enlaces_crudos:
+            resultado = self.puntuar(enlace, url_base)
+            if not resultado or resultado[0] < min_puntaje:
+                continue
+            puntaje, palabras = resultado
+            url = urljoin(url_base, enlace['href']).split('#')[0]
+            # Anclas a la misma página (p. ej. desplegables de menú) no son un destino
+            if not url or url.rstrip('/') == url_base.split('#')[0].rstrip('/'):
+                continue
+            if url in mejores and mejores[url]['puntaje'] >= puntaje:
+                continue
+            mejores[url] = {
+                'url': url,
+                'texto': ' '.join((enlace.get('texto') or enlace.get('aria') or enlace.get('titulo') or '').split()),
+                'menu': ' > '.join(enlace.get('menu') or []),
+                'puntaje': puntaje,
+                'palabras': palabras,
+                'en_menu': bool(enlace.get('en_menu'))
+            }
+        return sorted(mejores.values(), key=lambda c: c['puntaje'], reverse=True)
+
+    def escanear(self, driver, url_base, min_puntaje=1):
+        """Lee todos los enlaces de la página cargada en el driver y devuelve candidatos priorizados"""
+        try:
+            enlaces_crudos = driver.execute_script(SCRIPT_ENLACES, SELECTORES_MENU) or []
+        except Exception as e:
+            print(f"   ⚠️ Error escaneando enlaces: {e}")
+            return []
+        return self.candidatos(enlaces_crudos, url_base, min_puntaje)
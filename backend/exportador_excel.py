@@ -0,0 +1,157 @@
+import os
+from collections import Counter
+
+from openpyxl import Workbook
+
+# Filas máximas de una hoja de Excel (incluye el encabezado)
+LIMITE_FILAS_EXCEL = 1_048_576
+
+
+class HojaStreaming:
+    """Hoja que se escribe fila por fila; al llenarse continúa en 'Nombre (2)', 'Nombre (3)'...
+
+    Con dividir_archivos=False la hoja se queda en el archivo donde se creó aunque el libro ya
+    continúe en otro (p. ej. un resumen que se escribe al final pero debe ir en la primera parte);
+    sus filas no cuentan para el límite por archivo y ese archivo se guarda hasta el final.
+    """
+
+    def __init__(self, libro, nombre, encabezados, dividir_archivos=True):
+        self.libro = libro
+        self.nombre = nombre
+        self.encabezados = list(encabezados)
+        self.dividir_archivos = dividir_archivos
+        self.total_filas = 0
+        self._ws = None
+        self._archivo = None
+        self._filas = 0
+        self._parte = 0
+
+    def _nueva_parte(self):
+        self._parte += 1
+        titulo = self.nombre if self._parte == 1 else f"{self.nombre[:25]} ({self._parte})"
+        if self._archivo is None or self.dividir_archivos:
+            self._archivo = self.libro._numero_archivo
+        if not self.dividir_archivos:
+            self.libro._partes_fijas.add(self._archivo)
+        self._ws = self.libro._libros[self._archivo - 1].create_sheet(titulo)
+        self._ws.append(self.encabezados)
+        self._filas = 1
+
+    def agregar(self, fila):
+        if self.dividir_archivos:
+            self.libro._reservar_fila()
+            if self._archivo != self.libro._numero_archivo:
+                self._nueva_parte()
+        if self._ws is None or self._filas >= self.libro.max_filas_hoja:
+            self._nueva_parte()
+        self._ws.append(fila)
+        self._filas += 1
+        self.total_filas += 1
+
+    def agregar_dataframe(self, df, tamano_bloque=50_000):
+        """Agrega un DataFrame por bloques, con NA/NaN como celdas vacías"""
+        for inicio in range(0, len(df), tamano_bloque):
+            bloque = df.iloc[inicio:inicio + tamano_bloque].astype(object)
+            for fila in bloque.where(bloque.notna(), None).itertuples(index=False, name=None):
+                self.agregar(fila)
+        return self
+
+
+class LibroStreaming:
+    """Libro de Excel en modo write_only (memoria constante: las filas van directo a disco).
+
+    Las hojas se reparten en varias al pasar max_filas_hoja y el libro en varios archivos
+    (nombre_parte2.xlsx, ...) al pasar max_filas_archivo filas en total. Cada archivo se guarda y
+    se libera en cuanto el libro pasa al siguiente, salvo los que tienen una hoja con
+    dividir_archivos=False, que se guardan al final.
+    """
+
+    def __init__(self, ruta, max_filas_hoja=LIMITE_FILAS_EXCEL, max_filas_archivo=4 * LIMITE_FILAS_EXCEL):
+        self.ruta = ruta
+        self.max_filas_hoja = max_filas_hoja
+        self.max_filas_archivo = max_filas_archivo
+        self.rutas = []
+        self._libros = []
+        self._guardados = {}
+        self._partes_fijas = set()
+        self._numero_archivo = 0
+        self._abrir_archivo()
+
+    def _abrir_archivo(self):
+        for numero, libro in enumerate(self._libros, start=1):
+            if libro is not None and numero not in self._partes_fijas:
+                self._guardar_archivo(numero)
+        self._libros.append(Workbook(write_only=True))
+        self._numero_archivo = len(self._libros)
+        self._filas_archivo = 0
+
+    def _ruta_archivo(self, numero):
+        if numero == 1:
+            return self.ruta
+        base, extension = os.path.splitext(self.ruta)
+        return f"{base}_parte{numero}{extension}"
+
+    def _reservar_fila(self):
+        if self.max_filas_archivo and self._filas_archivo >= self.max_filas_archivo:
+            self._abrir_archivo()
+        self._filas_archivo += 1
+
+    def hoja(self, nombre, encabezados, dividir_archivos=True):
+        """Crea la hoja de inmediato (fija su orden en el libro) y la devuelve para agregar filas"""
+        hoja = HojaStreaming(self, nombre, encabezados, dividir_archivos)
+        hoja._nueva_parte()
+        return hoja
+
+    def escribir_dataframe(self, nombre, df, tamano_bloque=50_000):
+        """Escribe un DataFrame en una hoja nueva por bloques, con NA/NaN como celdas vacías"""
+        return self.hoja(nombre, [str(col) for col in df.columns]).agregar_dataframe(df, tamano_bloque)
+
+    def _guardar_archivo(self, numero):
+        ruta = self._ruta_archivo(numero)
+        self._libros[numero - 1].save(ruta)
+        self._libros[numero - 1] = None
+        self._guardados[numero] = ruta
+
+    def guardar(self):
+        """Guarda los archivos que siguen abiertos y devuelve las rutas de todos"""
+        for numero, libro in enumerate(self._libros, start=1):
+            if libro is not None:
+                self._guardar_archivo(numero)
+        self.rutas = [self._guardados[numero] for numero in sorted(self._guardados)]
+        return self.rutas
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, *exc):
+        if tipo is None:
+            self.guardar()
+
+
+class ContadorGrupos:
+    """Resumen por grupo acumulado fila por fila: total de filas y cuántas cumplen cada marca.
+
+    Sólo guarda un Counter por columna, así la memoria depende del número de grupos y no de filas.
+    """
+
+    def __init__(self, columnas):
+        self.columnas = list(columnas)
+        self.totales = Counter()
+        self.conteos = {columna: Counter() for columna in self.columnas}
+
+    def agregar(self, grupo, marcas):
+        """Cuenta una fila del grupo; marcas: {columna: bool}"""
+        self.totales[grupo] += 1
+        for columna, marca in marcas.items():
+            if marca:
+                self.conteos[columna][grupo] += 1
+
+    def filas(self, orden=None):
+        """(grupo, total, conteo de cada columna...) en el orden dado (grupos sin filas en cero)
+        o, sin orden, en el de aparición"""
+        for grupo in (self.totales if orden is None else orden):
+            yield (grupo, self.totales[grupo], *(self.conteos[columna][grupo] for columna in self.columnas))
+
+    def total(self, columna=None):
+        """Total de filas, o de filas con la marca de la columna"""
+        return sum((self.totales if columna is None else self.conteos[columna]).values())
@@ -0,0 +1,194 @@
+import re
+import unicodedata
+
+PATRON_EMAIL = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+PATRON_TELEFONO = re.compile(r'(?<![\d@])(?:\+?52[ .-]?)?\(?\d{2,3}\)?[ .-]?\d{3,4}[ .-]?\d{4}(?!\d)')
+PATRON_EXTENSION = re.compile(r'\b(?:ext|extensi[oó]n)\.?[ \t]*:?[ \t]*\d{2,5}\b', re.IGNORECASE)
+# Cada palabra inicia con mayúscula (se admiten partículas como "de la"); sólo el título es insensible a mayúsculas
+_PALABRA_NOMBRE = r"[A-ZÁÉÍÓÚÑ][A-Za-zÁÉÍÓÚÑáéíóúñü'.-]+"
+PATRON_NOMBRE = re.compile(
+    r"^(?:(?i:lic|ing|mtr[oa]|dr[a]?|c|arq|prof(?:r[a]?)?|mvz|cp)\.?\s+)?"
+    + _PALABRA_NOMBRE + r"(?:\s+(?:(?:de|del|la|las|los|y)\s+)*" + _PALABRA_NOMBRE + r"){1,5}$"
+)
+
+# Palabras de menús y pies de página que nunca forman parte de un nombre de persona
+PALABRAS_NO_NOMBRE = {
+    'mapa', 'sitio', 'politica', 'privacidad', 'aviso', 'avisos', 'terminos', 'condiciones', 'inicio',
+    'contacto', 'contactanos', 'mas', 'informacion', 'ver', 'leer', 'tramites', 'servicios', 'transparencia',
+    'directorio', 'gobierno', 'acerca', 'noticias', 'enlaces', 'derechos', 'reservados', 'accesibilidad',
+    'buscar', 'menu', 'portal', 'ayuda', 'preguntas', 'frecuentes', 'redes', 'sociales', 'siguenos',
+    'comunicados', 'prensa', 'datos', 'abiertos', 'oficina', 'secretaria', 'direccion', 'horario', 'atencion'
+}
+
+# Buzones de área o de pie de página (parte local sin puntos, guiones ni dígitos): no son de una persona
+BUZONES_GENERICOS = {
+    'contacto', 'contactanos', 'info', 'informacion', 'atencion', 'atencionciudadana', 'transparencia',
+    'unidaddetransparencia', 'webmaster', 'comunicacion', 'comunicacionsocial', 'prensa', 'difusion',
+    'soporte', 'ayuda', 'quejas', 'denuncias', 'oficialia', 'oficialiadepartes', 'buzon', 'noreply', 'admin'
+}
+
+# Raíces de cargos; el sufijo [aeo]s? cubre género y número (directora, jefes...) pero no "directorio"
+RAICES_CARGO = [
+    'director', 'subdirector', 'coordinador', 'jef', 'secretari', 'subsecretari',
+    'titular', 'responsable', 'encargad', 'gerent', 'president', 'delegad',
+    'administrador', 'tesorer', 'contralor', 'procurador', 'comisionad', 'vocal'
+]
+
+
+def regex_trie(palabras):
+    """Construye una alternancia en forma de trie (un autómata) a partir de una lista de palabras"""
+    trie = {}
+    for palabra in palabras:
+        nodo = trie
+        for caracter in palabra:
+            nodo = nodo.setdefault(caracter, {})
+        nodo[''] = True
+
+    def a_regex(nodo):
+        fin = '' in nodo
+        ramas = [re.escape(c) + a_regex(hijo) for c, hijo in sorted(nodo.items()) if c]
+        if not ramas:
+            return ''
+        cuerpo = ramas[0] if len(ramas) == 1 and not fin else '(?:' + '|'.join(ramas) + ')'
+        return cuerpo + ('?' if fin else '')
+
+    return a_regex(trie)
+
+
+def es_nombre_propio(texto):
+    """Línea con forma de nombre de persona que no es una frase de navegación"""
+    if len(texto) > 80 or not PATRON_NOMBRE.match(texto):
+        return False
+    plano = unicodedata.normalize('NFKD', texto.lower()).encode('ascii', 'ignore').decode()
+    return not any(palabra.strip(".'-") in PALABRAS_NO_NOMBRE for palabra in plano.split())
+
+
+def es_buzon_generico(email):
+    """contacto@, info@, transparencia@... en vez del correo de una persona"""
+    local = email.split('@')[0].lower()
+    return re.sub(r'[\d._+-]', '', local) in BUZONES_GENERICOS
+
+
+class ExtractorContactos:
+    """Tokenizador de contactos en una sola pasada, compilado una vez y reutilizable"""
+
+    def __init__(self, raices_cargo=None, ventana_lineas=3):
+        self.ventana_lineas = ventana_lineas
+        raices = raices_cargo or RAICES_CARGO
+        self.patron_tokens = re.compile(
+            '(?P<email>' + PATRON_EMAIL.pattern + ')'
+            '|(?P<extension>' + PATRON_EXTENSION.pattern + ')'
+            '|(?P<telefono>' + PATRON_TELEFONO.pattern + ')'
+            '|(?P<cargo>\\b' + regex_trie(raices) + '(?:[aeo]s?)?\\b)'
+            '|(?P<salto>\\n)',
+            re.IGNORECASE
+        )
+
+    def tokenizar(self, texto):
+        """Recorre el texto una vez y devuelve tokens (tipo, valor, inicio, fin, linea).
+
+        Las líneas sin tokens que parecen un nombre propio generan un token 'nombre' y las
+        líneas en blanco un token 'bloque' (separación entre bloques de texto).
+        """
+        tokens = []
+        linea = 0
+        inicio_linea = 0
+        tokens_en_linea = 0
+        cargo_en_linea = False
+
+        def cerrar_linea(fin):
+            texto_linea = texto[inicio_linea:fin].strip()
+            if tokens_en_linea == 0 and not texto_linea:
+                tokens.append(('bloque', '', inicio_linea, fin, linea))
+            elif tokens_en_linea == 0 and es_nombre_propio(texto_linea):
+                tokens.append(('nombre', texto_linea, inicio_linea, fin, linea))
+
+        for match in self.patron_tokens.finditer(texto):
+            tipo = match.lastgroup
+            if tipo == 'salto':
+                cerrar_linea(match.start())
+                linea += 1
+                inicio_linea = match.end()
+                tokens_en_linea = 0
+                cargo_en_linea = False
+                continue
+            if tipo == 'cargo':
+                tokens_en_linea += 1
+                if cargo_en_linea:
+                    continue
+                cargo_en_linea = True
+                # El cargo es la línea completa donde aparece la palabra clave
+                fin_linea = texto.find('\n', match.end())
+                valor = texto[inicio_linea:fin_linea if fin_linea >= 0 else len(texto)].strip()
+            elif tipo == 'extension':
+                valor = re.sub(r'\D', '', match.group())
+            else:
+                valor = match.group().strip()
+            tokens.append((tipo, valor, match.start(), match.end(), linea))
+            if tipo != 'cargo':
+                tokens_en_linea += 1
+        cerrar_linea(len(texto))
+        return tokens
+
+    def extraer(self, texto, url_fuente, fuente_tipo='texto', simples_si_vacio=False):
+        """Arma contactos agrupando tokens cercanos en vez de reiniciar línea por línea.
+
+        La ventana no cruza líneas en blanco, y un buzón genérico (contacto@, info@...) sólo se
+        asigna a una persona si está en su misma línea.
+        """
+        contactos = []
+        actual = None
+        emails, telefonos = [], []
+
+        def nuevo(linea):
+            return {'nombre': '', 'cargo': '', 'email': '', 'telefono': '', 'extension': '',
+                    'fuente_url': url_fuente, 'fuente_tipo': fuente_tipo, '_linea': linea}
+
+        def emitir(contacto):
+            if contacto and (contacto['email'] or contacto['telefono']) and (contacto['nombre'] or contacto['cargo']):
+                contacto.pop('_linea')
+                contactos.append(contacto)
+
+        for tipo, valor, _inicio, _fin, linea in self.tokenizar(texto):
+            if tipo == 'bloque':
+                emitir(actual)
+                actual = None
+                continue
+            if tipo == 'email':
+                emails.append(valor)
+                if es_buzon_generico(valor) and (actual is None or linea != actual['_linea']):
+                    continue
+            elif tipo == 'telefono':
+                telefonos.append(valor)
+
+            # Cerrar el contacto si el token está lejos, o si ya tiene datos de contacto
+            # y llega otra persona o un campo repetido; sin datos aún, gana el token más cercano
+            if actual is not None:
+                lejos = linea - actual['_linea'] > self.ventana_lineas
+                completo = actual['email'] or actual['telefono']
+                ocupado = tipo != 'extension' and actual[tipo]
+                persona_nueva = tipo in ('nombre', 'cargo')
+                if lejos or (completo and (ocupado or persona_nueva)):
+                    emitir(actual)
+                    actual = None
+
+            if actual is None:
+                if tipo == 'extension':
+                    continue
+                actual = nuevo(linea)
+
+            actual[tipo] = valor
+            actual['_linea'] = linea
+
+        emitir(actual)
+
+        # Sin estructura reconocible: devolver emails/teléfonos sueltos
+        if not contactos and simples_si_vacio:
+            for email in emails[:10]:
+                contactos.append({'nombre': '', 'cargo': '', 'email': email, 'telefono': '',
+                                  'fuente_url': url_fuente, 'fuente_tipo': 'email_simple'})
+            for telefono in telefonos[:5]:
+                contactos.append({'nombre': '', 'cargo': '', 'email': '', 'telefono': telefono,
+                                  'fuente_url': url_fuente, 'fuente_tipo': 'telefono_simple'})
+
+        return contactos
@@ -116,65 +116,7 @@ class FiltroAWS:
         try:
             # Leer CSV
             df = pd.read_csv(archivo_csv)
-            print(f"📋 Total contactos: {len(df)}")
-            
-            # Buscar columnas relevantes
-            columnas = {
-                'nombre': None,
-                'cargo': None,
-                'area': None,
-                'email': None,
-                'telefono': None
-            }
-            
-            # Mapear columnas
-            for col in df.columns:
-                col_lower = col.lower()
-                if 'nombre' in col_lower and 'persona' in col_lower:
-                    columnas['nombre'] = col
-                elif 'cargo' in col_lower or 'denominaci' in col_lower:
-                    columnas['cargo'] = col
-                elif 'area' in col_lower or 'adscripci' in col_lower:
-                    columnas['area'] = col
-                elif 'correo' in col_lower or 'email' in col_lower:
-                    columnas['email'] = col
-                elif 'tel' in col_lower or 'fono' in col_lower:
-                    columnas['telefono'] = col
-            
-            print(f"🔍 Columnas encontradas: {columnas}")
-            
-            # Procesar contactos
-            contactos_aws = []
-            
-            for _, row in df.iterrows():
-                # Extraer datos
-                nombre = self.extraer_valor(row, columnas['nombre'])
-                cargo = self.extraer_valor(row, columnas['cargo'])
-                area = self.extraer_valor(row, columnas['area'])
-                email = self.extraer_valor(row, columnas['email'])
-                telefono = self.extraer_valor(row, columnas['telefono'])
-                
-                # Calcular relevancia
-                relevancia = self.calcular_relevancia(cargo, area)
-                
-                # Filtrar por relevancia mínima
-                if relevancia >= min_relevancia:
-                    razon = self.generar_razon(cargo, area, relevancia)
-                    
-                    contactos_aws.append({
-                        'nombre': nombre,
-                        'cargo': cargo,
-                        'area': area,
-                        'email': email,
-                        'telefono': telefono,
-                        'relevancia_aws': relevancia,
-                        'razon': razon
-                    })
-            
-            # Ordenar por relevancia
-            contactos_aws.sort(key=lambda x: x['relevancia_aws'], reverse=True)
-            
-            print(f"✅ Contactos AWS encontrados: {len(contactos_aws)}")
+            contactos_aws = self.filtrar_dataframe(df, min_relevancia)
             
             # Guardar resultados
             if contactos_aws:
@@ -189,6 +131,70 @@ class FiltroAWS:
             print(f"❌ Error procesando archivo: {e}")
             return []
     
+    def filtrar_dataframe(self, df, min_relevancia=60):
+        """Filtra por relevancia los contactos de un DataFrame ya cargado"""
+        print(f"📋 Total contactos: {len(df)}")
+        
+        # Buscar columnas relevantes
+        columnas = {
+            'nombre': None,
+            'cargo': None,
+            'area': None,
+            'email': None,
+            'telefono': None
+        }
+        
+        # Mapear columnas
+        for col in df.columns:
+            col_lower = col.lower()
+            if 'nombre' in col_lower and 'persona' in col_lower:
+                columnas['nombre'] = col
+            elif 'cargo' in col_lower or 'denominaci' in col_lower:
+                columnas['cargo'] = col
+            elif 'area' in col_lower or 'adscripci' in col_lower:
+                columnas['area'] = col
+            elif 'correo' in col_lower or 'email' in col_lower:
+                columnas['email'] = col
+            elif 'tel' in col_lower or 'fono' in col_lower:
+                columnas['telefono'] = col
+        
+        print(f"🔍 Columnas encontradas: {columnas}")
+        
+        # Procesar contactos
+        contactos_aws = []
+        
+        for _, row in df.iterrows():
+            # Extraer datos
+            nombre = self.extraer_valor(row, columnas['nombre'])
+            cargo = self.extraer_valor(row, columnas['cargo'])
+            area = self.extraer_valor(row, columnas['area'])
+            email = self.extraer_valor(row, columnas['email'])
+            telefono = self.extraer_valor(row, columnas['telefono'])
+            
+            # Calcular relevancia
+            relevancia = self.calcular_relevancia(cargo, area)
+            
+            # Filtrar por relevancia mínima
+            if relevancia >= min_relevancia:
+                razon = self.generar_razon(cargo, area, relevancia)
+                
+                contactos_aws.append({
+                    'nombre': nombre,
+                    'cargo': cargo,
+                    'area': area,
+                    'email': email,
+                    'telefono': telefono,
+                    'relevancia_aws': relevancia,
+                    'razon': razon
+                })
+        
+        # Ordenar por relevancia
+        contactos_aws.sort(key=lambda x: x['relevancia_aws'], reverse=True)
+        
+        print(f"✅ Contactos AWS encontrados: {len(contactos_aws)}")
+        
+        return contactos_aws
+    
     def extraer_valor(self, row, columna):
         """Extrae valor de una columna con manejo de errores"""
         if columna is None:
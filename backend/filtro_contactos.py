@@ -3,6 +3,7 @@ import os
 import re
 from datetime import datetime
 from fuzzywuzzy import fuzz
+from exportador_excel import LibroStreaming, ContadorGrupos
 
 class FiltroContactos:
     def __init__(self, download_path="downloads"):
@@ -242,10 +243,18 @@ class FiltroContactos:
         log_callback(f"🔍 Leyendo archivos CSV de transparencia y web...", "info")
         log_callback(f"🔄 Eliminando contactos duplicados...", "info")
         
-        with pd.ExcelWriter(archivo_salida, engine='openpyxl') as writer:
-            # Hoja resumen
-            resumen_data = []
-            todos_contactos = []
+        columnas = ['nombre', 'apellido', 'cargo', 'telefono', 'email', 'tipo_cargo', 'fuente', 'institucion']
+        hojas_por_tipo = {'empresarial': 'Cargos_Empresariales', 'tecnologia': 'Cargos_Tecnologia'}
+        
+        # Streaming: cada institución se escribe al procesarse y sólo se retienen los conteos del resumen
+        resumen = ContadorGrupos(['Cargos_Empresariales', 'Cargos_Tecnologia', 'Fuente_Transparencia', 'Fuente_Web'])
+        with LibroStreaming(archivo_salida) as libro:
+            # El resumen se llena al final pero se queda en el primer archivo si el libro se divide
+            hoja_resumen = libro.hoja('Resumen', ['Institucion', 'Total_Contactos', 'Cargos_Empresariales',
+                                                  'Cargos_Tecnologia', 'Fuente_Transparencia', 'Fuente_Web'],
+                                      dividir_archivos=False)
+            hoja_todos = libro.hoja('Todos_Contactos', columnas)
+            hojas_tipo = {}
             
             for institucion in instituciones:
                 log_callback(f"🏢 Procesando institución: {institucion}", "info")
@@ -253,61 +262,46 @@ class FiltroContactos:
                 
                 log_callback(f"📊 {institucion}: {len(contactos)} contactos importantes encontrados", "info")
                 
-                # Agregar institución a cada contacto
                 for contacto in contactos:
                     contacto['institucion'] = institucion
-                    todos_contactos.append(contacto)
-                
-                # Estadísticas por institución
-                empresariales = len([c for c in contactos if c['tipo_cargo'] == 'empresarial'])
-                tecnologia = len([c for c in contactos if c['tipo_cargo'] == 'tecnologia'])
-                
-                resumen_data.append({
-                    'Institucion': institucion,
-                    'Total_Contactos': len(contactos),
-                    'Cargos_Empresariales': empresariales,
-                    'Cargos_Tecnologia': tecnologia,
-                    'Fuente_Transparencia': len([c for c in contactos if c['fuente'] == 'transparencia']),
-                    'Fuente_Web': len([c for c in contactos if c['fuente'] == 'web'])
-                })
-            
-            # Crear DataFrames
-            df_resumen = pd.DataFrame(resumen_data)
-            df_contactos = pd.DataFrame(todos_contactos)
-            
-            # Escribir hojas
-            df_resumen.to_excel(writer, sheet_name='Resumen', index=False)
+                    fila = tuple(contacto.get(col) for col in columnas)
+                    hoja_todos.agregar(fila)
+                    
+                    # Hojas por tipo de cargo en la misma pasada (se crean con su primera fila)
+                    tipo = contacto['tipo_cargo']
+                    if tipo in hojas_por_tipo:
+                        if tipo not in hojas_tipo:
+                            hojas_tipo[tipo] = libro.hoja(hojas_por_tipo[tipo], columnas)
+                        hojas_tipo[tipo].agregar(fila)
+                    
+                    resumen.agregar(institucion, {
+                        'Cargos_Empresariales': tipo == 'empresarial',
+                        'Cargos_Tecnologia': tipo == 'tecnologia',
+                        'Fuente_Transparencia': contacto['fuente'] == 'transparencia',
+                        'Fuente_Web': contacto['fuente'] == 'web'
+                    })
             
-            if not df_contactos.empty:
-                # Hoja con todos los contactos
-                df_contactos.to_excel(writer, sheet_name='Todos_Contactos', index=False)
-                
-                # Hoja solo cargos empresariales
-                df_empresariales = df_contactos[df_contactos['tipo_cargo'] == 'empresarial']
-                if not df_empresariales.empty:
-                    df_empresariales.to_excel(writer, sheet_name='Cargos_Empresariales', index=False)
-                
-                # Hoja solo cargos de tecnología
-                df_tecnologia = df_contactos[df_contactos['tipo_cargo'] == 'tecnologia']
-                if not df_tecnologia.empty:
-                    df_tecnologia.to_excel(writer, sheet_name='Cargos_Tecnologia', index=False)
+            # Estadísticas por institución
+            for fila in resumen.filas(orden=list(instituciones)):
+                hoja_resumen.agregar(fila)
         
         # Estadísticas finales
-        total_empresariales = len([c for c in todos_contactos if c.get('tipo_cargo') == 'empresarial'])
-        total_tecnologia = len([c for c in todos_contactos if c.get('tipo_cargo') == 'tecnologia'])
+        total_contactos = resumen.total()
+        total_empresariales = resumen.total('Cargos_Empresariales')
+        total_tecnologia = resumen.total('Cargos_Tecnologia')
         
         log_callback(f"💾 Archivo Excel generado exitosamente", "success")
         log_callback(f"📁 Nombre: {os.path.basename(archivo_salida)}", "info")
-        log_callback(f"📊 Total contactos importantes: {len(todos_contactos)}", "success")
+        log_callback(f"📊 Total contactos importantes: {total_contactos}", "success")
         log_callback(f"🏢 Cargos empresariales: {total_empresariales}", "info")
         log_callback(f"💻 Cargos tecnología: {total_tecnologia}", "info")
-        log_callback(f"📂 Hojas creadas: Resumen, Todos_Contactos, Cargos_Empresariales, Cargos_Tecnologia", "info")
+        log_callback(f"📂 Hojas creadas: {', '.join(['Resumen', 'Todos_Contactos'] + [hojas_por_tipo[t] for t in hojas_tipo])}", "info")
         
         print(f"📊 Reporte generado: {archivo_salida}")
         print(f"📁 Ubicación: {os.path.abspath(archivo_salida)}")
         print(f"📊 Resumen del filtrado:")
         print(f"   - Instituciones procesadas: {len(instituciones)}")
-        print(f"   - Contactos importantes encontrados: {len(todos_contactos)}")
+        print(f"   - Contactos importantes encontrados: {total_contactos}")
         print(f"   - Cargos empresariales: {total_empresariales}")
         print(f"   - Cargos tecnología: {total_tecnologia}")
         print(f"   - Archivos CSV procesados: {sum(len(os.listdir(self.download_path)) for _ in [1] if os.path.exists(self.download_path))}")
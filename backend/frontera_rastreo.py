@@ -0,0 +1,127 @@
+import heapq
+import itertools
+import time
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
+
+# Parámetros de seguimiento que no cambian el contenido de la página
+PARAMETROS_SEGUIMIENTO = {'fbclid', 'gclid', 'dclid', 'msclkid', 'mc_cid', 'mc_eid', '_ga', '_gl'}
+
+# Ajuste de prioridad por tipo de contenido: los directorios suelen publicarse como PDF o tabla HTML
+BONO_TIPO = {'pdf': 2, 'html': 1, 'imagen': 0}
+
+
+def canonicalizar_url(url):
+    """URL canónica para deduplicar: sin fragmento, www, puerto por defecto, barra final ni tracking.
+
+    http y https comparten clave (los sitios suelen servir la misma página por ambos).
+    """
+    partes = urlparse(url.strip())
+    esquema = partes.scheme.lower() or 'http'
+    if esquema == 'http':
+        esquema = 'https'
+    host = (partes.hostname or '').lower().removeprefix('www.')
+    if partes.port and partes.port not in (80, 443):
+        host = f"{host}:{partes.port}"
+    ruta = partes.path.rstrip('/') or '/'
+    query = urlencode(sorted(
+        (k, v) for k, v in parse_qsl(partes.query, keep_blank_values=True)
+        if not k.lower().startswith('utm_') and k.lower() not in PARAMETROS_SEGUIMIENTO
+    ))
+    return urlunparse((esquema, host, ruta, '', query, ''))
+
+
+def mismo_sitio(url, url_base):
+    """True si la URL pertenece al mismo host (ignorando www) o a un subdominio del sitio"""
+    host = (urlparse(url).hostname or '').removeprefix('www.')
+    base = (urlparse(url_base).hostname or '').removeprefix('www.')
+    return host == base or host.endswith('.' + base)
+
+
+class PresupuestoSitio:
+    """Límites por sitio de páginas visitadas, bytes descargados y segundos de rastreo.
+
+    Cada página HTML abre su propio Chrome, así que el límite de páginas se mantiene en 5 como
+    el recorrido anterior; el orden best-first hace que esas 5 sean las más prometedoras.
+    """
+
+    def __init__(self, max_paginas=5, max_bytes=150 * 1024 * 1024, max_segundos=300):
+        self.max_paginas = max_paginas
+        self.max_bytes = max_bytes
+        self.max_segundos = max_segundos
+        self.paginas = 0
+        self.bytes = 0
+        self.inicio = time.monotonic()
+
+    def consumir(self, paginas=1, bytes_descargados=0):
+        self.paginas += paginas
+        self.bytes += bytes_descargados or 0
+
+    def motivo_agotado(self):
+        """Razón por la que se agotó el presupuesto, o None si aún queda"""
+        if self.paginas >= self.max_paginas:
+            return f"{self.paginas} páginas"
+        if self.bytes >= self.max_bytes:
+            return f"{self.bytes / (1024 * 1024):.1f} MB"
+        if time.monotonic() - self.inicio >= self.max_segundos:
+            return f"{self.max_segundos}s"
+        return None
+
+
+class FronteraRastreo:
+    """Cola de prioridad best-first de enlaces por relevancia, con URLs canónicas y conjunto de visitados"""
+
+    def __init__(self, url_base, presupuesto=None, max_profundidad=2, penalizacion_profundidad=3,
+                 penalizacion_externo=5):
+        self.url_base = url_base
+        self.presupuesto = presupuesto or PresupuestoSitio()
+        self.max_profundidad = max_profundidad
+        self.penalizacion_profundidad = penalizacion_profundidad
+        self.penalizacion_externo = penalizacion_externo
+        self._heap = []
+        self._contador = itertools.count()
+        self._encolados = set()
+        self.visitados = set()
+
+    def clave(self, enlace):
+        return enlace.get('clave') or canonicalizar_url(enlace['url'])
+
+    def prioridad(self, enlace, profundidad):
+        """Relevancia por palabras clave, ajustada por tipo, profundidad y dominio"""
+        prioridad = float(enlace.get('relevancia') or 0)
+        prioridad += BONO_TIPO.get(enlace.get('tipo'), 0)
+        prioridad -= self.penalizacion_profundidad * profundidad
+        # Los enlaces a otros sitios se siguen (directorios alojados fuera), pero después de los propios
+        if not mismo_sitio(enlace['url'], self.url_base):
+            prioridad -= self.penalizacion_externo
+        if enlace.get('confiable'):
+            prioridad += 10
+        return prioridad
+
+    def agregar(self, enlace, profundidad=0):
+        """Encola el enlace si es nuevo y está dentro de la profundidad máxima"""
+        if profundidad > self.max_profundidad or enlace.get('tipo') == 'otro':
+            return False
+        clave = self.clave(enlace)
+        if clave in self._encolados or clave in self.visitados:
+            return False
+        self._encolados.add(clave)
+        enlace['profundidad'] = profundidad
+        heapq.heappush(self._heap, (-self.prioridad(enlace, profundidad), next(self._contador), enlace))
+        return True
+
+    def siguiente(self):
+        """Enlace más prometedor aún no visitado; None si la cola o el presupuesto se agotaron"""
+        motivo = self.presupuesto.motivo_agotado()
+        if motivo:
+            print(f"   ⏹️ Presupuesto del sitio agotado ({motivo}), {len(self._heap)} enlaces sin visitar")
+            return None
+        while self._heap:
+            _, _, enlace = heapq.heappop(self._heap)
+            clave = self.clave(enlace)
+            if clave not in self.visitados:
+                self.visitados.add(clave)
+                return enlace
+        return None
+
+    def __len__(self):
+        return len(self._heap)
@@ -0,0 +1,199 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from PIL import Image
+import pytesseract
+
+from preprocesamiento_ocr import preprocesar
+
+
+def _ocr_imagen(imagen, lang, config, offset_x=0, offset_y=0, banda=None):
+    """Ejecuta Tesseract en un worker: devuelve texto y cajas de palabras en una sola pasada.
+
+    banda=(y_min, y_max) en coordenadas de la imagen: sólo se conservan las palabras cuyo centro
+    vertical cae dentro, para que una franja no repita las líneas del solapamiento con su vecina.
+    """
+    datos = pytesseract.image_to_data(imagen, lang=lang, config=config,
+                                      output_type=pytesseract.Output.DICT)
+    cajas = []
+    lineas = []
+    linea_actual = None
+    palabras = []
+    for i, palabra in enumerate(datos['text']):
+        palabra = (palabra or '').strip()
+        if not palabra:
+            continue
+        if banda is not None:
+            centro = datos['top'][i] + datos['height'][i] / 2
+            if not banda[0] <= centro < banda[1]:
+                continue
+        clave_linea = (datos['block_num'][i], datos['par_num'][i], datos['line_num'][i])
+        if clave_linea != linea_actual:
+            if palabras:
+                lineas.append(' '.join(palabras))
+            palabras = []
+            linea_actual = clave_linea
+        palabras.append(palabra)
+        cajas.append({
+            'texto': palabra,
+            'x': datos['left'][i] + offset_x,
+            'y': datos['top'][i] + offset_y,
+            'ancho': datos['width'][i],
+            'alto': datos['height'][i],
+            'confianza': float(datos['conf'][i])
+        })
+    if palabras:
+        lineas.append(' '.join(palabras))
+    return {'texto': '\n'.join(lineas), 'cajas': cajas}
+
+
+def _ocr_pagina_pdf(ruta_pdf, num_pagina, dpi, lang, config, max_pixeles=None):
+    """Rasteriza una página de PDF al DPI indicado (reducido si excede max_pixeles) y le aplica OCR en el worker"""
+    import fitz  # PyMuPDF
+    doc = fitz.open(ruta_pdf)
+    try:
+        pagina = doc.load_page(num_pagina)
+        pixeles = pagina.rect.width * pagina.rect.height * (dpi / 72) ** 2
+        if max_pixeles and pixeles > max_pixeles:
+            dpi = max(1, int(dpi * (max_pixeles / pixeles) ** 0.5))
+        pix = pagina.get_pixmap(dpi=dpi)
+        imagen = Image.frombytes('RGB' if pix.alpha == 0 else 'RGBA', (pix.width, pix.height), pix.samples)
+    finally:
+        doc.close()
+    return _ocr_imagen(imagen, lang, config)
+
+
+def _preprocesar_imagen(imagen, opciones):
+    """Preprocesamiento NumPy dentro del worker; ante un error se usa la imagen original"""
+    try:
+        return preprocesar(imagen, **opciones)
+    except Exception as e:
+        print(f"   ⚠️ Error preprocesando imagen: {e}")
+        return imagen
+
+
+class MotorOCR:
+    """Servicio de OCR sobre un pool de procesos, compartido por los flujos de PDF e imagen"""
+
+    def __init__(self, max_workers=None, dpi=300, max_pixeles=40_000_000,
+                 umbral_mosaico=12_000_000, alto_franja=2000, solapamiento=80, lang='spa'):
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 2) - 1)
+        self.dpi = dpi
+        self.max_pixeles = max_pixeles
+        self.umbral_mosaico = umbral_mosaico
+        self.alto_franja = alto_franja
+        self.solapamiento = solapamiento
+        self.lang = lang
+        self._pool = None
+        # Hilos que esperan a los workers y combinan franjas, para que quien pide OCR nunca espere
+        self._despachador = None
+        self._lock = threading.Lock()
+        self._pendientes = 0
+        self._completados = 0
+
+    def _obtener_pool(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._pool
+
+    def _obtener_despachador(self):
+        with self._lock:
+            if self._despachador is None:
+                self._despachador = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='ocr')
+            return self._despachador
+
+    def cerrar(self):
+        with self._lock:
+            if self._despachador is not None:
+                self._despachador.shutdown(wait=False, cancel_futures=True)
+                self._despachador = None
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+    def _enviar(self, funcion, *args):
+        futuro = self._obtener_pool().submit(funcion, *args)
+        with self._lock:
+            self._pendientes += 1
+        futuro.add_done_callback(self._tarea_terminada)
+        return futuro
+
+    def _tarea_terminada(self, _futuro):
+        with self._lock:
+            self._pendientes -= 1
+            self._completados += 1
+
+    @property
+    def profundidad_cola(self):
+        """Tareas de OCR enviadas que aún no terminan"""
+        return self._pendientes
+
+    def metricas(self):
+        return {'profundidad_cola': self._pendientes, 'completados': self._completados,
+                'workers': self.max_workers}
+
+    def limitar_pixeles(self, imagen):
+        """Reduce la imagen si supera el máximo de píxeles permitido"""
+        ancho, alto = imagen.size
+        if ancho * alto <= self.max_pixeles:
+            return imagen
+        factor = (self.max_pixeles / (ancho * alto)) ** 0.5
+        return imagen.resize((max(1, int(ancho * factor)), max(1, int(alto * factor))),
+                             Image.Resampling.LANCZOS)
+
+    def enviar_imagen(self, imagen, config=''):
+        """Encola el OCR de una imagen; devuelve una lista de futuros (uno por franja)"""
+        imagen = self.limitar_pixeles(imagen)
+        ancho, alto = imagen.size
+
+        if ancho * alto <= self.umbral_mosaico:
+            return [self._enviar(_ocr_imagen, imagen, self.lang, config)]
+
+        # Imagen muy grande: dividir en franjas horizontales con solapamiento. Cada palabra del
+        # solapamiento se asigna a una sola franja, según si su centro queda antes o después de la mitad
+        futuros = []
+        mitad = self.solapamiento / 2
+        for y in range(0, alto, self.alto_franja):
+            y_fin = min(alto, y + self.alto_franja + self.solapamiento)
+            franja = imagen.crop((0, y, ancho, y_fin))
+            banda = (mitad if y else 0, self.alto_franja + mitad if y_fin < alto else float('inf'))
+            futuros.append(self._enviar(_ocr_imagen, franja, self.lang, config, 0, y, banda))
+        return futuros
+
+    def enviar_pagina_pdf(self, ruta_pdf, num_pagina, config=''):
+        """Encola el OCR de una página de PDF; la rasterización ocurre en el worker"""
+        return self._enviar(_ocr_pagina_pdf, ruta_pdf, num_pagina, self.dpi, self.lang, config, self.max_pixeles)
+
+    @staticmethod
+    def combinar(resultados):
+        """Une los resultados de varias franjas en un solo texto con sus cajas"""
+        return {
+            'texto': '\n'.join(r['texto'] for r in resultados if r['texto']),
+            'cajas': [caja for r in resultados for caja in r['cajas']]
+        }
+
+    def reconocer_imagen(self, imagen, config='', preproceso=None):
+        """OCR de una imagen sin bloquear: devuelve un Future con el texto y las cajas de todas las franjas.
+
+        preproceso: opciones de preprocesamiento_ocr.preprocesar; se aplica en un worker del pool
+        antes de dividir en franjas, así el hilo que pide el OCR no hace trabajo de CPU.
+        """
+        return self._obtener_despachador().submit(self._reconocer, imagen, config, preproceso)
+
+    def _reconocer(self, imagen, config, preproceso):
+        if preproceso is not None:
+            imagen = self._enviar(_preprocesar_imagen, imagen, preproceso).result()
+        return self.combinar([f.result() for f in self.enviar_imagen(imagen, config)])
+
+    def reconocer_paginas_pdf(self, ruta_pdf, paginas, config=''):
+        """OCR en paralelo de varias páginas de un PDF; devuelve {página: resultado}"""
+        futuros = {num: self.enviar_pagina_pdf(ruta_pdf, num, config) for num in paginas}
+        resultados = {}
+        for num, futuro in futuros.items():
+            try:
+                resultados[num] = futuro.result()
+            except Exception as e:
+                print(f"   ⚠️ Error en OCR de página {num + 1}: {e}")
+        return resultados
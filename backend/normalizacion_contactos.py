@@ -0,0 +1,136 @@
+import pandas as pd
+
+COLUMNAS_TEXTO = ['nombre', 'cargo', 'email', 'telefono', 'extension']
+VALORES_VACIOS = ['', 'nan', 'none', 'null', 'n/a', 'nat', '<na>']
+
+# Variantes de encabezado por campo, en orden de preferencia (minúsculas y sin acentos)
+VARIANTES_COLUMNAS = {
+    'nombre': ['nombre(s) de la persona servidora', 'nombre', 'servidor publico', 'funcionario'],
+    'primer_apellido': ['primer apellido'],
+    'segundo_apellido': ['segundo apellido'],
+    'cargo': ['denominacion del cargo', 'cargo', 'puesto', 'denominacion'],
+    'area': ['area de adscripcion', 'adscripcion', 'area', 'unidad administrativa'],
+    'email': ['correo electronico', 'correo', 'email', 'e-mail'],
+    'telefono': ['telefono', 'conmutador', 'tel'],
+    'extension': ['extension', 'ext']
+}
+
+# Columnas de la tabla de contactos (todas de tipo string de pandas)
+COLUMNAS_CONTACTO = ['entidad', 'nombre', 'cargo', 'area', 'email', 'telefono', 'extension', 'fuente']
+
+
+def limpiar_texto(serie):
+    """Recorta y colapsa espacios; vacíos y 'nan'/'None' pasan a NA (sin convertir NaN en 'nan')"""
+    serie = serie.astype('string').str.replace(r'\s+', ' ', regex=True).str.strip()
+    return serie.mask(serie.str.lower().isin(VALORES_VACIOS))
+
+
+def quitar_acentos(serie):
+    return serie.str.normalize('NFKD').str.encode('ascii', 'ignore').str.decode('ascii')
+
+
+def resolver_columnas(columnas, variantes=VARIANTES_COLUMNAS):
+    """Asigna a cada campo la primera columna que coincide con sus variantes (cada columna se usa una vez).
+
+    Se resuelve una sola vez por tabla; devuelve {campo: nombre de columna o None}.
+    """
+    claves = quitar_acentos(pd.Series(list(columnas), dtype='string').str.lower().str.strip()).tolist()
+    usadas = set()
+    mapeo = {}
+    for campo, opciones in variantes.items():
+        mapeo[campo] = None
+        for opcion in opciones:
+            indice = next((i for i, clave in enumerate(claves) if opcion in clave and i not in usadas), None)
+            if indice is not None:
+                mapeo[campo] = list(columnas)[indice]
+                usadas.add(indice)
+                break
+    return mapeo
+
+
+def tabla_contactos(df, entidad, fuente, mapeo=None):
+    """Tabla tipada de contactos a partir de cualquier variante de directorio.
+
+    Selecciona y limpia columnas completas (sin iterar filas): los vacíos quedan como NA en lugar
+    del texto 'nan', y nombre más apellidos se unen cuando vienen separados.
+    """
+    mapeo = mapeo or resolver_columnas(df.columns)
+    vacia = pd.Series(pd.NA, index=df.index, dtype='string')
+
+    def columna(campo):
+        return limpiar_texto(df[mapeo[campo]]) if mapeo.get(campo) is not None else vacia
+
+    nombre = columna('nombre')
+    for apellido in ('primer_apellido', 'segundo_apellido'):
+        if mapeo.get(apellido) is not None:
+            nombre = limpiar_texto(nombre.str.cat(columna(apellido), sep=' ', na_rep=''))
+
+    tabla = pd.DataFrame({
+        'entidad': pd.Series(entidad, index=df.index, dtype='string'),
+        'nombre': nombre,
+        'cargo': columna('cargo'),
+        'area': columna('area'),
+        'email': columna('email'),
+        'telefono': columna('telefono'),
+        'extension': columna('extension'),
+        'fuente': pd.Series(fuente, index=df.index, dtype='string')
+    }, columns=COLUMNAS_CONTACTO)
+    # Filas sin ningún dato de contacto no aportan nada
+    return tabla.dropna(subset=['nombre', 'cargo', 'email', 'telefono'], how='all').reset_index(drop=True)
+
+
+def tabla_contactos_vacia():
+    return pd.DataFrame({col: pd.Series(dtype='string') for col in COLUMNAS_CONTACTO})
+
+
+def normalizar_contactos(df):
+    """Normaliza columnas de contacto con operaciones vectorizadas.
+
+    Emails en minúsculas sin 'mailto:', teléfonos a 10 dígitos con la extensión aparte,
+    y una clave de nombre sin acentos ni mayúsculas para deduplicar.
+    """
+    df = df.copy()
+    for col in COLUMNAS_TEXTO:
+        df[col] = limpiar_texto(df[col]) if col in df.columns else pd.Series(pd.NA, index=df.index, dtype='string')
+
+    df['email'] = df['email'].str.lower().str.replace(r'^mailto:', '', regex=True)
+    df['email'] = df['email'].where(df['email'].str.contains('@', na=False))
+
+    # Extensión escrita dentro del teléfono ("55 1234 5678 ext. 123")
+    extension_en_telefono = df['telefono'].str.extract(r'(?i)(?:ext|extensi[oó]n|x)\.?\s*:?\s*(\d{1,6})\s*$')[0]
+    telefono = df['telefono'].str.replace(r'(?i)(?:ext|extensi[oó]n|x)\.?\s*:?\s*\d{1,6}\s*$', '', regex=True)
+    digitos = telefono.str.replace(r'\D', '', regex=True)
+    # Lada nacional de 10 dígitos: se descarta el prefijo de país (52) y el 1 de celulares antiguos
+    digitos = digitos.where(digitos.str.len() <= 10, digitos.str[-10:])
+    df['telefono'] = digitos.mask(digitos.str.len() < 7)
+    df['extension'] = df['extension'].str.replace(r'\D', '', regex=True).fillna(extension_en_telefono)
+    df['extension'] = df['extension'].mask(df['extension'] == '')
+
+    df['_nombre_clave'] = quitar_acentos(df['nombre'].str.lower()).str.replace(r'[^a-z ]', '', regex=True).str.strip()
+    return df
+
+
+def deduplicar_contactos(df):
+    """Deduplica por clave compuesta y combina los campos de los duplicados.
+
+    La clave es el email; sin email, teléfono + extensión + nombre. Un contacto sin email cuyo
+    teléfono y nombre coinciden con uno que sí lo tiene se une a ese. De cada grupo se toma,
+    campo por campo, el primer valor no vacío.
+    """
+    if df.empty:
+        return df
+
+    telefono_nombre = (df['telefono'].fillna('') + 'x' + df['extension'].fillna('')
+                       + '|' + df['_nombre_clave'].fillna(''))
+    telefono_nombre = telefono_nombre.mask(df['telefono'].isna())
+
+    con_email = df['email'].notna() & telefono_nombre.notna()
+    email_por_telefono = (pd.Series(df.loc[con_email, 'email'].values, index=telefono_nombre[con_email].values)
+                          .groupby(level=0).first())
+
+    clave = df['email'].fillna(telefono_nombre.map(email_por_telefono)).fillna(telefono_nombre)
+    df = df.assign(_clave=clave)
+
+    # groupby().first() toma el primer valor no nulo de cada columna: fusión campo por campo
+    combinados = df.groupby('_clave', sort=False, dropna=True).first().reset_index(drop=True)
+    return combinados.drop(columns=['_nombre_clave'])
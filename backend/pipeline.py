@@ -0,0 +1,119 @@
+import queue
+import threading
+
+# Marca de fin de flujo entre etapas
+FIN = object()
+
+
+class Etapa:
+    """Etapa del pipeline: una función aplicada por su propio pool de hilos.
+
+    workers puede ser un entero o un dict {ruta: workers}; en ese caso ruta(item) elige el pool,
+    para que recursos con cuellos de botella distintos (p. ej. cada navegador) no se bloqueen entre sí.
+    La función recibe un item y devuelve el item (o None para descartarlo).
+    """
+
+    def __init__(self, nombre, funcion, workers=1, ruta=None):
+        self.nombre = nombre
+        self.funcion = funcion
+        self.workers = workers if isinstance(workers, dict) else {None: workers}
+        self.ruta = ruta
+
+    def total_workers(self):
+        return sum(self.workers.values())
+
+
+class Pipeline:
+    """Etapas encadenadas por colas acotadas; cada etapa procesa en paralelo con las demás"""
+
+    def __init__(self, etapas, capacidad=4, log_callback=None):
+        self.etapas = etapas
+        self.capacidad = capacidad
+        self.log_callback = log_callback or (lambda mensaje, tipo='info': print(mensaje))
+
+    def ejecutar(self, items):
+        """Genera los items que salen de la última etapa, en orden de finalización.
+
+        Las colas acotadas dan backpressure: si quien consume no avanza, las etapas se detienen.
+        Un error en una etapa no pierde el item: se anota en item['errores'] y sigue su camino.
+        Un error del iterador items se relanza después de vaciar los items que ya estaban en curso.
+        """
+        colas = []
+        for etapa in self.etapas:
+            colas.append({ruta: queue.Queue(self.capacidad) for ruta in etapa.workers})
+        salida = queue.Queue(self.capacidad)
+        hilos = []
+
+        def enviar(indice, item):
+            if indice == len(self.etapas):
+                salida.put(item)
+                return
+            etapa = self.etapas[indice]
+            ruta = etapa.ruta(item) if etapa.ruta else None
+            colas[indice][ruta].put(item)
+
+        def cerrar(indice):
+            if indice == len(self.etapas):
+                salida.put(FIN)
+                return
+            for ruta, cantidad in self.etapas[indice].workers.items():
+                for _ in range(cantidad):
+                    colas[indice][ruta].put(FIN)
+
+        for indice, etapa in enumerate(self.etapas):
+            restantes = [etapa.total_workers()]
+            candado = threading.Lock()
+
+            def trabajar(indice=indice, etapa=etapa, cola=None, restantes=restantes, candado=candado):
+                while True:
+                    item = cola.get()
+                    if item is FIN:
+                        break
+                    try:
+                        resultado = etapa.funcion(item)
+                    except Exception as e:
+                        self.log_callback(f"⚠️ Error en etapa {etapa.nombre}: {e}", "warning")
+                        item.setdefault('errores', []).append(f"{etapa.nombre}: {e}")
+                        resultado = item
+                    if resultado is not None:
+                        enviar(indice + 1, resultado)
+                # El último hilo de la etapa propaga el fin a la siguiente
+                with candado:
+                    restantes[0] -= 1
+                    ultimo = restantes[0] == 0
+                if ultimo:
+                    cerrar(indice + 1)
+
+            for ruta, cantidad in etapa.workers.items():
+                for numero in range(cantidad):
+                    hilo = threading.Thread(
+                        target=trabajar, kwargs={'cola': colas[indice][ruta]},
+                        name=f"{etapa.nombre}-{ruta or ''}{numero}", daemon=True
+                    )
+                    hilo.start()
+                    hilos.append(hilo)
+
+        # Si el iterador de entrada falla, el pipeline se cierra igual y el error se relanza al final
+        error_entrada = []
+
+        def alimentar():
+            try:
+                for item in items:
+                    enviar(0, item)
+            except BaseException as e:
+                error_entrada.append(e)
+            finally:
+                cerrar(0)
+
+        threading.Thread(target=alimentar, name='pipeline-entrada', daemon=True).start()
+
+        while True:
+            item = salida.get()
+            if item is FIN:
+                break
+            yield item
+
+        for hilo in hilos:
+            hilo.join()
+        if error_entrada:
+            raise error_entrada[0]
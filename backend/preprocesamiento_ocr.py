@@ -0,0 +1,164 @@
+import numpy as np
+from PIL import Image
+
+# Se incluye en la clave de la caché OCR: cambiarla invalida resultados previos
+VERSION_PREPROCESO = 3
+
+# DPI declarados por debajo de esto son valores de pantalla (72, 96...), no de escaneo: no se confía en ellos
+DPI_MINIMO_CONFIABLE = 150
+
+
+def a_gris(imagen):
+    """Convierte una imagen PIL a un arreglo uint8 en escala de grises"""
+    if imagen.mode != 'L':
+        imagen = imagen.convert('L')
+    return np.asarray(imagen, dtype=np.uint8)
+
+
+def estadisticas_imagen(arr):
+    """Estadísticas baratas sobre una muestra de la imagen para elegir parámetros"""
+    muestra = arr[::4, ::4].astype(np.float32)
+    media = float(muestra.mean())
+    return {
+        'media': media,
+        'desviacion': float(muestra.std()),
+        'fraccion_extremos': float(np.mean((muestra < 40) | (muestra > 215))),
+        'fondo_oscuro': media < 110
+    }
+
+
+def recortar_bordes(arr, margen=10):
+    """Elimina márgenes vacíos y barras negras de escaneo alrededor del contenido"""
+    oscuro = arr < 128
+    frac_filas = oscuro.mean(axis=1)
+    frac_cols = oscuro.mean(axis=0)
+    filas = np.flatnonzero((frac_filas > 0.002) & (frac_filas < 0.9))
+    cols = np.flatnonzero((frac_cols > 0.002) & (frac_cols < 0.9))
+    if filas.size == 0 or cols.size == 0:
+        return arr
+    alto, ancho = arr.shape
+    return arr[max(0, filas[0] - margen):min(alto, filas[-1] + margen + 1),
+               max(0, cols[0] - margen):min(ancho, cols[-1] + margen + 1)]
+
+
+def estimar_altura_texto(arr):
+    """Estima la altura de los caracteres a partir de las corridas verticales de tinta"""
+    paso = max(1, arr.shape[1] // 400)
+    tinta = (arr[:, ::paso] < 128).astype(np.int8)
+    bordes = np.diff(np.pad(tinta, ((1, 1), (0, 0))), axis=0).T
+    inicios = np.argwhere(bordes == 1)[:, 1]
+    fines = np.argwhere(bordes == -1)[:, 1]
+    longitudes = fines - inicios
+    longitudes = longitudes[(longitudes > 2) & (longitudes < arr.shape[0] // 4)]
+    if longitudes.size < 20:
+        return None
+    return float(np.percentile(longitudes, 90))
+
+
+def normalizar_resolucion(imagen, dpi_objetivo=300, dpi_origen=None, altura_texto=None,
+                          altura_objetivo=32, max_pixeles=40_000_000):
+    """Escala la imagen hacia el DPI objetivo (por metadatos o por altura estimada del texto)"""
+    if dpi_origen:
+        escala = dpi_objetivo / dpi_origen
+    elif altura_texto:
+        escala = altura_objetivo / altura_texto
+    else:
+        return imagen
+
+    ancho, alto = imagen.size
+    escala = min(max(escala, 0.25), 4.0, (max_pixeles / (ancho * alto)) ** 0.5)
+    if abs(escala - 1) < 0.15:
+        return imagen
+    return imagen.resize((max(1, int(ancho * escala)), max(1, int(alto * escala))),
+                         Image.Resampling.LANCZOS)
+
+
+def estimar_inclinacion(arr, angulo_max=5.0, paso=0.25):
+    """Inclinación (grados, antihoraria) que maximiza la nitidez del perfil de proyección horizontal"""
+    factor = max(1, max(arr.shape) // 1000)
+    ys, xs = np.nonzero(arr[::factor, ::factor] < 128)
+    if ys.size < 100:
+        return 0.0
+    if ys.size > 200_000:
+        indices = np.random.default_rng(0).choice(ys.size, 200_000, replace=False)
+        ys, xs = ys[indices], xs[indices]
+
+    ys = ys.astype(np.float32)
+    xs = xs.astype(np.float32)
+    mejor_angulo, mejor_puntaje = 0.0, -1.0
+    for angulo in np.arange(-angulo_max, angulo_max + paso / 2, paso):
+        rad = np.deg2rad(angulo)
+        filas = np.round(ys * np.cos(rad) + xs * np.sin(rad)).astype(np.int64)
+        perfil = np.bincount(filas - filas.min()).astype(np.float64)
+        puntaje = float(np.sum(np.diff(perfil) ** 2))
+        if puntaje > mejor_puntaje:
+            mejor_angulo, mejor_puntaje = float(angulo), puntaje
+    return mejor_angulo
+
+
+def umbral_adaptativo(arr, ventana, k, alto_bloque=512):
+    """Binarización de Sauvola con imágenes integrales (sin bucles por píxel).
+
+    Se procesa por bloques de filas para que la memoria dependa del ancho y no del total de píxeles.
+    """
+    radio = ventana // 2
+    rellena = np.pad(arr, radio, mode='edge')
+    salida = np.empty_like(arr, dtype=np.uint8)
+    for y in range(0, arr.shape[0], alto_bloque):
+        y_fin = min(arr.shape[0], y + alto_bloque)
+        salida[y:y_fin] = _sauvola_bloque(rellena[y:y_fin + 2 * radio], arr[y:y_fin], radio, k)
+    return salida
+
+
+def _sauvola_bloque(rellena, arr, radio, k):
+    """Sauvola sobre un bloque de filas; rellena trae radio filas y columnas extra por lado"""
+    rellena = rellena.astype(np.float64)
+    integral = np.zeros((rellena.shape[0] + 1, rellena.shape[1] + 1))
+    integral[1:, 1:] = rellena.cumsum(axis=0).cumsum(axis=1)
+    integral_sq = np.zeros_like(integral)
+    integral_sq[1:, 1:] = (rellena ** 2).cumsum(axis=0).cumsum(axis=1)
+
+    alto, ancho = arr.shape
+    v = 2 * radio + 1
+
+    def suma_ventana(tabla):
+        return (tabla[v:v + alto, v:v + ancho] - tabla[:alto, v:v + ancho]
+                - tabla[v:v + alto, :ancho] + tabla[:alto, :ancho])
+
+    area = float(v * v)
+    media = suma_ventana(integral) / area
+    varianza = np.maximum(suma_ventana(integral_sq) / area - media ** 2, 0)
+    umbral = media * (1 + k * (np.sqrt(varianza) / 128.0 - 1))
+    return np.where(arr > umbral, 255, 0).astype(np.uint8)
+
+
+def preprocesar(imagen, dpi_objetivo=300, max_pixeles=40_000_000):
+    """Pipeline completo: gris → recorte → resolución → enderezado → binarización adaptativa"""
+    arr = a_gris(imagen)
+    stats = estadisticas_imagen(arr)
+    if stats['fondo_oscuro']:
+        arr = 255 - arr
+
+    arr = recortar_bordes(arr)
+
+    dpi = imagen.info.get('dpi')
+    dpi_origen = dpi[0] if dpi and dpi[0] and dpi[0] >= DPI_MINIMO_CONFIABLE else None
+    altura_texto = None if dpi_origen else estimar_altura_texto(arr)
+    gris = normalizar_resolucion(Image.fromarray(arr), dpi_objetivo, dpi_origen, altura_texto,
+                                 max_pixeles=max_pixeles)
+    arr = np.asarray(gris, dtype=np.uint8)
+
+    angulo = estimar_inclinacion(arr)
+    if abs(angulo) >= 0.25:
+        arr = np.asarray(Image.fromarray(arr).rotate(-angulo, resample=Image.Resampling.BILINEAR,
+                                                      expand=True, fillcolor=255), dtype=np.uint8)
+
+    # Imagen casi bitonal (escaneo limpio): no vale la pena umbralizar
+    if stats['fraccion_extremos'] > 0.97:
+        return Image.fromarray(np.where(arr > 128, 255, 0).astype(np.uint8))
+
+    # Ventana proporcional al tamaño de letra; k menor con poco contraste
+    altura = estimar_altura_texto(arr) or 30
+    ventana = int(max(15, min(101, 2 * altura))) | 1
+    k = 0.34 if stats['desviacion'] > 50 else 0.2
+    return Image.fromarray(umbral_adaptativo(arr, ventana, k))
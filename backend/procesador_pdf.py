@@ -0,0 +1,106 @@
+import os
+import mmap
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import PyPDF2
+
+from descargas import descargar
+
+
+def _extraer_rango_paginas(ruta_pdf, inicio, fin, min_caracteres):
+    """Extrae el texto de las páginas [inicio, fin) en un proceso worker.
+
+    Devuelve una lista de (num_pagina, texto, requiere_ocr).
+    """
+    resultados = []
+    with open(ruta_pdf, 'rb') as archivo:
+        with mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ) as datos:
+            reader = PyPDF2.PdfReader(datos)
+            for num in range(inicio, min(fin, len(reader.pages))):
+                try:
+                    texto = reader.pages[num].extract_text() or ''
+                except Exception:
+                    texto = ''
+                resultados.append((num, texto, len(texto.strip()) < min_caracteres))
+    return resultados
+
+
+class ProcesadorPDF:
+    """Extrae texto de PDFs por página en un pool de procesos con límites de páginas y bytes"""
+
+    def __init__(self, max_workers=None, max_paginas=200, max_bytes=50 * 1024 * 1024,
+                 paginas_por_tarea=4, min_caracteres_texto=30):
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 2) - 1)
+        self.max_paginas = max_paginas
+        self.max_bytes = max_bytes
+        self.paginas_por_tarea = paginas_por_tarea
+        self.min_caracteres_texto = min_caracteres_texto
+        self._pool = None
+
+    def _obtener_pool(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._pool
+
+    def cerrar(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def contar_paginas(self, ruta_pdf):
+        with open(ruta_pdf, 'rb') as archivo:
+            with mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ) as datos:
+                return len(PyPDF2.PdfReader(datos).pages)
+
+    def procesar_archivo(self, ruta_pdf, extraer_contactos, ocr_paginas=None):
+        """Genera los contactos de cada página conforme se van extrayendo.
+
+        extraer_contactos(texto) -> lista de contactos de una página.
+        ocr_paginas(ruta_pdf, paginas) -> {num_pagina: texto} para páginas sin capa de texto.
+        """
+        total_paginas = self.contar_paginas(ruta_pdf)
+        paginas = min(total_paginas, self.max_paginas)
+        print(f"   📄 PDF con {total_paginas} páginas (procesando {paginas})")
+
+        pool = self._obtener_pool()
+        futuros = [
+            pool.submit(_extraer_rango_paginas, ruta_pdf, inicio,
+                        min(inicio + self.paginas_por_tarea, paginas), self.min_caracteres_texto)
+            for inicio in range(0, paginas, self.paginas_por_tarea)
+        ]
+
+        paginas_ocr = []
+        for futuro in as_completed(futuros):
+            try:
+                resultados = futuro.result()
+            except Exception as e:
+                print(f"   ⚠️ Error extrayendo páginas: {e}")
+                continue
+            for num, texto, requiere_ocr in resultados:
+                if requiere_ocr:
+                    paginas_ocr.append(num)
+                    continue
+                contactos = extraer_contactos(texto)
+                if contactos:
+                    yield num, contactos
+
+        # Páginas escaneadas: decisión por página, sólo éstas van a OCR
+        if paginas_ocr and ocr_paginas is not None:
+            print(f"   🖼️ {len(paginas_ocr)} páginas sin capa de texto, enviando a OCR")
+            for num, texto in ocr_paginas(ruta_pdf, sorted(paginas_ocr)).items():
+                contactos = extraer_contactos(texto)
+                if contactos:
+                    yield num, contactos
+
+    def procesar_url(self, url_pdf, extraer_contactos, ocr_paginas=None, al_descargar=None):
+        """Descarga el PDF en streaming y genera los contactos por página.
+
+        al_descargar(bytes) se llama con el tamaño descargado (p. ej. para el presupuesto del sitio).
+        """
+        descarga = descargar(url_pdf, 'pdf', self.max_bytes)
+        if not descarga:
+            return
+        if al_descargar is not None:
+            al_descargar(descarga.tamano)
+        with descarga:
+            yield from self.procesar_archivo(descarga.ruta, extraer_contactos, ocr_paginas)
@@ -0,0 +1,296 @@
+import json
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime, timedelta
+from urllib.parse import urlparse, unquote, quote_plus
+
+import requests
+from bs4 import BeautifulSoup
+
+from resolvedor_urls import normalizar_nombre_entidad
+
+DOMINIOS_DESCARTADOS = ['youtube.com', 'facebook.com', 'twitter.com', 'x.com', 'instagram.com', 'wikipedia.org']
+HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+
+
+def limpiar_url_google(url):
+    """Limpia URLs de redirección de Google (/url?q=...)"""
+    if url and '/url?q=' in url:
+        try:
+            return unquote(url.split('/url?q=')[1].split('&')[0])
+        except Exception:
+            pass
+    return url
+
+
+def es_dominio_oficial(url):
+    """True si la URL pertenece a un dominio gubernamental mexicano"""
+    dominio = urlparse(url or '').netloc.lower()
+    return dominio.endswith('.gob.mx') or dominio.endswith('.gov.mx')
+
+
+def es_resultado_confiable(resultado, posicion_maxima=3):
+    """Un resultado es confiable si es .gob.mx y aparece entre los primeros lugares"""
+    return es_dominio_oficial(resultado['url']) and resultado['posicion'] <= posicion_maxima
+
+
+def crear_resultado(url, titulo, posicion, proveedor):
+    return {'url': url, 'titulo': titulo or '', 'posicion': posicion, 'proveedor': proveedor}
+
+
+class LimitadorTasa:
+    """Garantiza un intervalo mínimo entre llamadas a un mismo proveedor"""
+
+    def __init__(self, intervalo_segundos=0):
+        self.intervalo = intervalo_segundos
+        self._lock = threading.Lock()
+        self._ultima = 0.0
+
+    def esperar(self):
+        if self.intervalo <= 0:
+            return
+        with self._lock:
+            restante = self._ultima + self.intervalo - time.monotonic()
+            if restante > 0:
+                time.sleep(restante)
+            self._ultima = time.monotonic()
+
+
+class ProveedorBusqueda:
+    """Interfaz de proveedor: buscar() devuelve resultados ordenados por posición"""
+
+    nombre = 'base'
+
+    def __init__(self, intervalo_segundos=0):
+        self.limitador = LimitadorTasa(intervalo_segundos)
+
+    def buscar(self, consulta, max_resultados=10):
+        self.limitador.esperar()
+        try:
+            resultados = self._buscar(consulta, max_resultados)
+        except Exception as e:
+            print(f"   ⚠️ Proveedor {self.nombre} falló: {e}")
+            return []
+        resultados = [r for r in resultados
+                      if r['url'] and not any(d in r['url'] for d in DOMINIOS_DESCARTADOS)]
+        return resultados[:max_resultados]
+
+    def _buscar(self, consulta, max_resultados):
+        raise NotImplementedError
+
+
+class ProveedorNavegador(ProveedorBusqueda):
+    """Búsqueda en Google a través de Selenium"""
+
+    nombre = 'navegador'
+
+    def __init__(self, crear_driver, intervalo_segundos=5):
+        super().__init__(intervalo_segundos)
+        self.crear_driver = crear_driver
+
+    def _buscar(self, consulta, max_resultados):
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.common.keys import Keys
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+
+        driver = self.crear_driver(headless=False)
+        try:
+            print("📄 Usando Selenium para búsqueda...")
+            driver.get("https://www.google.com")
+            time.sleep(2)
+
+            # Manejar cookies
+            try:
+                cookie_btn = driver.find_element(By.XPATH, "//button[contains(text(), 'Acepto') or contains(text(), 'Accept')]")
+                cookie_btn.click()
+                time.sleep(1)
+            except Exception:
+                pass
+
+            search_box = WebDriverWait(driver, 10).until(
+                EC.presence_of_element_located((By.NAME, "q"))
+            )
+            search_box.clear()
+            search_box.send_keys(consulta)
+            search_box.send_keys(Keys.RETURN)
+            time.sleep(3)
+
+            resultados = []
+            for titulo in driver.find_elements(By.CSS_SELECTOR, "h3"):
+                try:
+                    link = titulo.find_element(By.XPATH, "./ancestor::a")
+                    url = limpiar_url_google(link.get_attribute("href"))
+                    resultados.append(crear_resultado(url, titulo.text, len(resultados) + 1, self.nombre))
+                except Exception:
+                    continue
+                if len(resultados) >= max_resultados:
+                    break
+            return resultados
+        finally:
+            driver.quit()
+
+
+class ProveedorHTTP(ProveedorBusqueda):
+    """Búsqueda en Google por HTTP parseando los enlaces /url?q="""
+
+    nombre = 'http'
+
+    def __init__(self, intervalo_segundos=2, timeout=15):
+        super().__init__(intervalo_segundos)
+        self.timeout = timeout
+
+    def _buscar(self, consulta, max_resultados):
+        print("📄 Usando requests para búsqueda...")
+        url = f"https://www.google.com/search?q={quote_plus(consulta)}"
+        response = requests.get(url, headers=HEADERS, timeout=self.timeout)
+        soup = BeautifulSoup(response.content, 'html.parser')
+
+        resultados = []
+        for link in soup.find_all('a', href=True):
+            href = link['href']
+            if '/url?q=' in href:
+                url_real = limpiar_url_google(href)
+                if url_real.startswith('http'):
+                    resultados.append(crear_resultado(url_real, link.text, len(resultados) + 1, self.nombre))
+        return resultados
+
+
+class ProveedorFixture(ProveedorBusqueda):
+    """Resultados fijos desde un JSON {consulta: [url | {url, titulo}]} para pruebas y benchmarks sin red"""
+
+    nombre = 'fixture'
+
+    def __init__(self, fixture):
+        super().__init__(0)
+        if isinstance(fixture, str):
+            with open(fixture, encoding='utf-8') as archivo:
+                fixture = json.load(archivo)
+        self.fixture = {normalizar_nombre_entidad(k): v for k, v in fixture.items()}
+
+    def _buscar(self, consulta, max_resultados):
+        resultados = []
+        for item in self.fixture.get(normalizar_nombre_entidad(consulta), []):
+            if isinstance(item, str):
+                item = {'url': item}
+            resultados.append(crear_resultado(item['url'], item.get('titulo', ''), len(resultados) + 1, self.nombre))
+        return resultados
+
+
+class ProveedorCache(ProveedorBusqueda):
+    """Envuelve a otro proveedor guardando sus resultados en SQLite"""
+
+    nombre = 'cache'
+
+    def __init__(self, proveedor, cache_file="search_cache.db", ttl_dias=7):
+        super().__init__(0)
+        self.proveedor = proveedor
+        self.cache_file = cache_file
+        self.ttl = timedelta(days=ttl_dias)
+        conn = sqlite3.connect(self.cache_file)
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS search_cache (
+                consulta TEXT PRIMARY KEY,
+                resultados TEXT,
+                creado_en TIMESTAMP
+            )
+        ''')
+        conn.commit()
+        conn.close()
+
+    def _buscar(self, consulta, max_resultados):
+        clave = normalizar_nombre_entidad(consulta)
+        conn = sqlite3.connect(self.cache_file)
+        fila = conn.execute(
+            "SELECT resultados, creado_en FROM search_cache WHERE consulta = ?", (clave,)
+        ).fetchone()
+        conn.close()
+
+        if fila and datetime.now() - datetime.fromisoformat(fila[1]) <= self.ttl:
+            return json.loads(fila[0])
+
+        resultados = self.proveedor.buscar(consulta, max_resultados)
+        if resultados:
+            conn = sqlite3.connect(self.cache_file)
+            conn.execute(
+                "INSERT OR REPLACE INTO search_cache (consulta, resultados, creado_en) VALUES (?, ?, ?)",
+                (clave, json.dumps(resultados), datetime.now().isoformat())
+            )
+            conn.commit()
+            conn.close()
+        return resultados
+
+
+class ProveedorConFallback(ProveedorBusqueda):
+    """Prueba los proveedores en orden hasta que uno devuelva resultados"""
+
+    nombre = 'fallback'
+
+    def __init__(self, proveedores):
+        super().__init__(0)
+        self.proveedores = proveedores
+
+    def _buscar(self, consulta, max_resultados):
+        for proveedor in self.proveedores:
+            resultados = proveedor.buscar(consulta, max_resultados)
+            if resultados:
+                return resultados
+        return []
+
+
+class ProveedorConcurrente(ProveedorBusqueda):
+    """Consulta varios proveedores en paralelo y se queda con el primero que da un resultado .gob.mx confiable.
+
+    Con espera_escalonada, cada proveedor se lanza sólo cuando el anterior terminó sin un resultado
+    confiable o no respondió en esos segundos (hedge escalonado): así el navegador, que es caro y no
+    se puede cancelar a media búsqueda, no arranca si la búsqueda HTTP ya resolvió. Sin ella se lanzan
+    todos a la vez.
+    """
+
+    nombre = 'concurrente'
+
+    def __init__(self, proveedores, es_confiable=es_resultado_confiable, espera_escalonada=None):
+        super().__init__(0)
+        self.proveedores = proveedores
+        self.es_confiable = es_confiable
+        self.espera_escalonada = espera_escalonada
+
+    def _buscar(self, consulta, max_resultados):
+        pool = ThreadPoolExecutor(max_workers=len(self.proveedores))
+        por_lanzar = list(self.proveedores)
+        pendientes = set()
+        todos = []
+
+        def lanzar():
+            pendientes.add(pool.submit(por_lanzar.pop(0).buscar, consulta, max_resultados))
+
+        try:
+            lanzar()
+            while por_lanzar and self.espera_escalonada is None:
+                lanzar()
+            while pendientes:
+                listos, pendientes = wait(pendientes, timeout=self.espera_escalonada if por_lanzar else None,
+                                          return_when=FIRST_COMPLETED)
+                for futuro in listos:
+                    resultados = futuro.result()
+                    if any(self.es_confiable(r) for r in resultados):
+                        return resultados
+                    todos.extend(resultados)
+                # Venció la espera o ya no queda nadie buscando: lanzar el siguiente proveedor
+                if por_lanzar and (not listos or not pendientes):
+                    lanzar()
+        finally:
+            # No esperar a los proveedores más lentos
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        # Sin resultado confiable: combinar por posición sin duplicados
+        todos.sort(key=lambda r: r['posicion'])
+        vistos = set()
+        combinados = []
+        for resultado in todos:
+            if resultado['url'] not in vistos:
+                vistos.add(resultado['url'])
+                combinados.append(resultado)
+        return combinados
@@ -0,0 +1,126 @@
+import random
+import re
+import threading
+import time
+
+
+# Mensajes de red o del navegador cuando el agente no clasificó el error
+PATRON_ERROR_HOST = re.compile(
+    r'timeout|timed out|net::err|connection|conexi[oó]n|webdriver|chrome not reachable|disconnected|max retries',
+    re.IGNORECASE
+)
+
+
+def es_fallo_del_host(datos):
+    """True si el fallo se debe al host (plazo vencido, red, navegador) y no a la entidad consultada"""
+    if datos.get('timeout'):
+        return True
+    if datos.get('tipo_error'):
+        return datos['tipo_error'] == 'host'
+    return bool(PATRON_ERROR_HOST.search(datos.get('error') or ''))
+
+
+class CircuitoHost:
+    """Circuit breaker de un host: cerrado → abierto tras N fallos seguidos → medio abierto.
+
+    Abierto, nadie trabaja contra el host hasta que vence la espera (exponencial por cada
+    apertura seguida). Medio abierto, pasa una sola prueba: si sale bien el circuito se cierra
+    y se libera a los que esperaban; si falla vuelve a abrirse con el doble de espera.
+    """
+
+    def __init__(self, host, umbral_fallos=3, espera_base=30, espera_maxima=600):
+        self.host = host
+        self.umbral_fallos = umbral_fallos
+        self.espera_base = espera_base
+        self.espera_maxima = espera_maxima
+        self.estado = 'cerrado'
+        self.fallos_consecutivos = 0
+        self.aperturas = 0
+        self.abierto_hasta = 0.0
+        self.exitos = 0
+        self.fallos = 0
+        self._prueba_en_curso = False
+        self._condicion = threading.Condition()
+
+    def esperar_turno(self):
+        """Bloquea mientras el circuito esté abierto o haya una prueba en curso"""
+        with self._condicion:
+            while True:
+                if self.estado == 'cerrado':
+                    return
+                if self.estado == 'abierto':
+                    restante = self.abierto_hasta - time.monotonic()
+                    if restante > 0:
+                        self._condicion.wait(restante)
+                        continue
+                    self.estado = 'medio_abierto'
+                if not self._prueba_en_curso:
+                    self._prueba_en_curso = True
+                    print(f"🟡 Circuito {self.host}: medio abierto, probando")
+                    return
+                self._condicion.wait()
+
+    def registrar_exito(self):
+        with self._condicion:
+            self.exitos += 1
+            self.fallos_consecutivos = 0
+            if self.estado != 'cerrado':
+                print(f"🟢 Circuito {self.host}: cerrado")
+            self.estado = 'cerrado'
+            self.aperturas = 0
+            self._prueba_en_curso = False
+            self._condicion.notify_all()
+
+    def registrar_fallo(self):
+        with self._condicion:
+            self.fallos += 1
+            self.fallos_consecutivos += 1
+            if self.estado == 'medio_abierto' or (self.estado == 'cerrado'
+                                                   and self.fallos_consecutivos >= self.umbral_fallos):
+                self._abrir()
+            self._prueba_en_curso = False
+            self._condicion.notify_all()
+
+    def _abrir(self):
+        espera = min(self.espera_base * 2 ** self.aperturas, self.espera_maxima)
+        self.aperturas += 1
+        self.estado = 'abierto'
+        self.abierto_hasta = time.monotonic() + espera
+        print(f"🔴 Circuito {self.host}: abierto tras {self.fallos_consecutivos} fallos seguidos, pausa de {espera:.0f}s")
+
+    def tasa_fallos(self):
+        total = self.exitos + self.fallos
+        return self.fallos / total if total else 0.0
+
+
+class Circuitos:
+    """Un CircuitoHost por host, creado al primer uso"""
+
+    def __init__(self, **parametros):
+        self.parametros = parametros
+        self._circuitos = {}
+
+    def circuito(self, host):
+        if host not in self._circuitos:
+            # Dos hilos pueden construir un circuito a la vez; setdefault deja sólo el primero registrado
+            self._circuitos.setdefault(host, CircuitoHost(host, **self.parametros))
+        return self._circuitos[host]
+
+    def resumen(self):
+        return {host: {'estado': c.estado, 'exitos': c.exitos, 'fallos': c.fallos,
+                       'tasa_fallos': round(c.tasa_fallos(), 2)}
+                for host, c in self._circuitos.items()}
+
+
+class PoliticaReintentos:
+    """Intentos máximos y espera exponencial con jitter entre intentos"""
+
+    def __init__(self, max_intentos=3, espera_base=5, jitter=0.5):
+        self.max_intentos = max_intentos
+        self.espera_base = espera_base
+        self.jitter = jitter
+
+    def espera(self, intento):
+        """Segundos antes del intento siguiente a `intento` (1, 2, ...)"""
+        espera = self.espera_base * 2 ** (intento - 1)
+        return espera * (1 + random.uniform(-self.jitter, self.jitter))
@@ -0,0 +1,232 @@
+import sqlite3
+import csv
+import re
+import threading
+import unicodedata
+from datetime import datetime, timedelta
+from urllib.parse import urlparse
+
+
+def normalizar_nombre_entidad(nombre):
+    """Normaliza un nombre de entidad: minúsculas, sin acentos ni espacios repetidos"""
+    if not nombre:
+        return ''
+    texto = unicodedata.normalize('NFKD', str(nombre))
+    texto = ''.join(c for c in texto if not unicodedata.combining(c))
+    texto = re.sub(r'[^a-z0-9 ]', ' ', texto.lower())
+    return re.sub(r'\s+', ' ', texto).strip()
+
+
+# Portales oficiales de los gobiernos estatales
+DOMINIOS_ESTATALES = {
+    'aguascalientes': 'https://www.aguascalientes.gob.mx',
+    'baja california': 'https://www.bajacalifornia.gob.mx',
+    'baja california sur': 'https://www.bcs.gob.mx',
+    'campeche': 'https://www.campeche.gob.mx',
+    'coahuila': 'https://www.coahuila.gob.mx',
+    'colima': 'https://www.col.gob.mx',
+    'chiapas': 'https://www.chiapas.gob.mx',
+    'chihuahua': 'https://www.chihuahua.gob.mx',
+    'ciudad de mexico': 'https://www.cdmx.gob.mx',
+    'durango': 'https://www.durango.gob.mx',
+    'guanajuato': 'https://www.guanajuato.gob.mx',
+    'guerrero': 'https://www.guerrero.gob.mx',
+    'hidalgo': 'https://www.hidalgo.gob.mx',
+    'jalisco': 'https://www.jalisco.gob.mx',
+    'estado de mexico': 'https://www.edomex.gob.mx',
+    'michoacan': 'https://www.michoacan.gob.mx',
+    'morelos': 'https://www.morelos.gob.mx',
+    'nayarit': 'https://www.nayarit.gob.mx',
+    'nuevo leon': 'https://www.nl.gob.mx',
+    'oaxaca': 'https://www.oaxaca.gob.mx',
+    'puebla': 'https://www.puebla.gob.mx',
+    'queretaro': 'https://www.queretaro.gob.mx',
+    'quintana roo': 'https://www.qroo.gob.mx',
+    'san luis potosi': 'https://www.slp.gob.mx',
+    'sinaloa': 'https://www.sinaloa.gob.mx',
+    'sonora': 'https://www.sonora.gob.mx',
+    'tabasco': 'https://www.tabasco.gob.mx',
+    'tamaulipas': 'https://www.tamaulipas.gob.mx',
+    'tlaxcala': 'https://www.tlaxcala.gob.mx',
+    'veracruz': 'https://www.veracruz.gob.mx',
+    'yucatan': 'https://www.yucatan.gob.mx',
+    'zacatecas': 'https://www.zacatecas.gob.mx'
+}
+
+# Dependencias federales con sitio conocido (nombre normalizado -> URL)
+DOMINIOS_FEDERALES = {
+    'secretaria de educacion publica': 'https://www.gob.mx/sep',
+    'secretaria de salud': 'https://www.gob.mx/salud',
+    'secretaria de hacienda y credito publico': 'https://www.gob.mx/shcp',
+    'secretaria de economia': 'https://www.gob.mx/se',
+    'secretaria de gobernacion': 'https://www.gob.mx/segob',
+    'secretaria de relaciones exteriores': 'https://www.gob.mx/sre',
+    'secretaria de la defensa nacional': 'https://www.gob.mx/sedena',
+    'secretaria de marina': 'https://www.gob.mx/semar',
+    'secretaria de seguridad y proteccion ciudadana': 'https://www.gob.mx/sspc',
+    'secretaria de medio ambiente y recursos naturales': 'https://www.gob.mx/semarnat',
+    'secretaria de energia': 'https://www.gob.mx/sener',
+    'secretaria de agricultura y desarrollo rural': 'https://www.gob.mx/agricultura',
+    'secretaria de infraestructura comunicaciones y transportes': 'https://www.gob.mx/sct',
+    'secretaria del trabajo y prevision social': 'https://www.gob.mx/stps',
+    'secretaria de desarrollo agrario territorial y urbano': 'https://www.gob.mx/sedatu',
+    'secretaria de cultura': 'https://www.gob.mx/cultura',
+    'secretaria de turismo': 'https://www.gob.mx/sectur',
+    'secretaria de bienestar': 'https://www.gob.mx/bienestar',
+    'secretaria de la funcion publica': 'https://www.gob.mx/sfp',
+    'instituto mexicano del seguro social': 'https://www.imss.gob.mx',
+    'instituto de seguridad y servicios sociales de los trabajadores del estado': 'https://www.gob.mx/issste',
+    'servicio de administracion tributaria': 'https://www.sat.gob.mx',
+    'comision federal de electricidad': 'https://www.cfe.mx',
+    'petroleos mexicanos': 'https://www.pemex.com'
+}
+
+# Prefijos que identifican al gobierno estatal en sí (no a una dependencia)
+PREFIJOS_GOBIERNO_ESTATAL = ['gobierno del estado de', 'gobierno de', 'poder ejecutivo del estado de']
+
+
+class ResolvedorURLOficial:
+    """Resuelve la URL oficial de una entidad: caché persistente → registro local → búsqueda en vivo"""
+
+    def __init__(self, cache_file="url_cache.db", ttl_dias=30):
+        self.cache_file = cache_file
+        self.ttl = timedelta(days=ttl_dias)
+        self._lock = threading.Lock()
+        self._init_cache()
+        self.reiniciar_estadisticas()
+
+    def _init_cache(self):
+        """Inicializa la tabla SQLite de entidad → URL oficial"""
+        conn = sqlite3.connect(self.cache_file)
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS url_cache (
+                entidad TEXT PRIMARY KEY,
+                url TEXT,
+                origen TEXT,
+                verificado_en TIMESTAMP
+            )
+        ''')
+        conn.commit()
+        conn.close()
+
+    @staticmethod
+    def estadisticas_vacias():
+        return {'cache': 0, 'registro': 0, 'busqueda': 0, 'sin_resultado': 0}
+
+    def reiniciar_estadisticas(self):
+        """Reinicia los contadores de aciertos/fallos del lote actual"""
+        with self._lock:
+            self.estadisticas = self.estadisticas_vacias()
+
+    def _contar(self, clave, estadisticas=None):
+        with self._lock:
+            self.estadisticas[clave] += 1
+            if estadisticas is not None:
+                estadisticas[clave] += 1
+
+    def resumen_estadisticas(self, estadisticas=None):
+        """Texto corto con los aciertos del lote (o de las estadísticas de una sesión)"""
+        e = estadisticas if estadisticas is not None else self.estadisticas
+        total = sum(e.values())
+        aciertos = e['cache'] + e['registro']
+        tasa = (aciertos / total * 100) if total else 0
+        return (f"caché: {e['cache']}, registro: {e['registro']}, búsqueda en vivo: {e['busqueda']}, "
+                f"sin resultado: {e['sin_resultado']} ({tasa:.0f}% sin navegador)")
+
+    def consultar_cache(self, nombre_entidad):
+        """Devuelve la URL en caché si sigue vigente según el TTL"""
+        clave = normalizar_nombre_entidad(nombre_entidad)
+        conn = sqlite3.connect(self.cache_file)
+        fila = conn.execute(
+            "SELECT url, verificado_en FROM url_cache WHERE entidad = ?", (clave,)
+        ).fetchone()
+        conn.close()
+
+        if not fila:
+            return None
+        url, verificado_en = fila
+        try:
+            if datetime.now() - datetime.fromisoformat(verificado_en) > self.ttl:
+                return None
+        except (TypeError, ValueError):
+            return None
+        return url
+
+    def guardar_en_cache(self, nombre_entidad, url, origen='busqueda', verificado_en=None):
+        """Guarda o actualiza la URL oficial de una entidad"""
+        clave = normalizar_nombre_entidad(nombre_entidad)
+        if not clave or not url:
+            return
+        verificado_en = verificado_en or datetime.now().isoformat()
+        with self._lock:
+            conn = sqlite3.connect(self.cache_file)
+            conn.execute(
+                "INSERT OR REPLACE INTO url_cache (entidad, url, origen, verificado_en) VALUES (?, ?, ?, ?)",
+                (clave, url, origen, verificado_en)
+            )
+            conn.commit()
+            conn.close()
+
+    def consultar_registro(self, nombre_entidad):
+        """Busca la entidad en el registro local de dominios .gob.mx"""
+        clave = normalizar_nombre_entidad(nombre_entidad)
+
+        if clave in DOMINIOS_FEDERALES:
+            return DOMINIOS_FEDERALES[clave]
+
+        # Gobierno estatal: "Gobierno del Estado de Nayarit" → portal estatal
+        for prefijo in PREFIJOS_GOBIERNO_ESTATAL:
+            if clave.startswith(prefijo + ' '):
+                estado = clave[len(prefijo):].strip()
+                if estado in DOMINIOS_ESTATALES:
+                    return DOMINIOS_ESTATALES[estado]
+
+        if clave in DOMINIOS_ESTATALES:
+            return DOMINIOS_ESTATALES[clave]
+
+        return None
+
+    def resolver(self, nombre_entidad, busqueda_en_vivo=None, estadisticas=None):
+        """Resuelve la URL oficial en orden: caché, registro y por último búsqueda en vivo.
+
+        estadisticas: contadores adicionales de la sesión, además de los globales del resolvedor.
+        """
+        url = self.consultar_cache(nombre_entidad)
+        if url:
+            print(f"   💾 URL oficial desde caché: {url}")
+            self._contar('cache', estadisticas)
+            return url
+
+        url = self.consultar_registro(nombre_entidad)
+        if url:
+            print(f"   📚 URL oficial desde registro local: {url}")
+            self._contar('registro', estadisticas)
+            self.guardar_en_cache(nombre_entidad, url, origen='registro')
+            return url
+
+        if busqueda_en_vivo is not None:
+            url = busqueda_en_vivo(nombre_entidad)
+            if url:
+                self._contar('busqueda', estadisticas)
+                self.guardar_en_cache(nombre_entidad, url, origen='busqueda')
+                return url
+
+        self._contar('sin_resultado', estadisticas)
+        return None
+
+    def precargar_desde_csv(self, ruta_csv):
+        """Precarga la caché desde un CSV con columnas entidad,url[,verificado_en]"""
+        cargadas = 0
+        with open(ruta_csv, newline='', encoding='utf-8-sig') as archivo:
+            lector = csv.DictReader(archivo)
+            for fila in lector:
+                entidad = (fila.get('entidad') or '').strip()
+                url = (fila.get('url') or '').strip()
+                if not entidad or not urlparse(url).netloc:
+                    continue
+                self.guardar_en_cache(entidad, url, origen='csv',
+                                      verificado_en=(fila.get('verificado_en') or '').strip() or None)
+                cargadas += 1
+
+        print(f"💾 Caché de URLs precargada: {cargadas} entidades desde {ruta_csv}")
+        return cargadas
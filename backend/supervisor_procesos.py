@@ -0,0 +1,173 @@
+import os
+import queue
+import signal
+import subprocess
+import time
+import multiprocessing
+from multiprocessing import util
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+def _crear_agente(tipo):
+    if tipo == 'transparencia':
+        from agente_transparencia import AgenteTransparencia
+        return AgenteTransparencia()
+    from agente_contactos import AgenteContactos
+    return AgenteContactos()
+
+
+def _bucle_trabajador(tipo, conexion):
+    """Proceso trabajador: crea su propio agente y atiende tareas hasta recibir None.
+
+    En POSIX abre su propia sesión para que el supervisor pueda matar el grupo completo
+    (trabajador, chromedriver y Chrome) con killpg.
+    """
+    if hasattr(os, 'setsid'):
+        os.setsid()
+    agente = _crear_agente(tipo)
+
+    while True:
+        try:
+            tarea = conexion.recv()
+        except EOFError:
+            # El supervisor terminó
+            break
+        if tarea is None:
+            break
+        nombre_entidad, download_path, opciones = tarea
+        try:
+            if download_path:
+                agente.set_download_path(download_path)
+            if tipo == 'contactos' and not opciones.get('url_oficial'):
+                # Resolver primero para que, si se vence el plazo, quede al menos la URL oficial
+                opciones['url_oficial'] = agente.buscar_pagina_oficial_avanzada(nombre_entidad)
+                if opciones['url_oficial']:
+                    conexion.send(('parcial', {'url_oficial': opciones['url_oficial'],
+                                               'url_directorio': opciones['url_oficial']}))
+            datos = agente.investigar(nombre_entidad, **opciones)
+        except Exception as e:
+            datos = {'exito': False, 'error': str(e)}
+        conexion.send(('resultado', datos))
+
+
+def terminar_arbol(pid):
+    """Mata un proceso y todos sus descendientes (p. ej. chromedriver y Chrome)"""
+    if psutil is not None:
+        try:
+            padre = psutil.Process(pid)
+            procesos = padre.children(recursive=True) + [padre]
+        except psutil.NoSuchProcess:
+            return
+        for proceso in procesos:
+            try:
+                proceso.kill()
+            except psutil.NoSuchProcess:
+                pass
+        psutil.wait_procs(procesos, timeout=5)
+    elif os.name == 'nt':
+        subprocess.run(['taskkill', '/F', '/T', '/PID', str(pid)], capture_output=True)
+    else:
+        try:
+            os.killpg(os.getpgid(pid), signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+
+class _Trabajador:
+    def __init__(self, contexto, tipo):
+        self.conexion, conexion_hijo = contexto.Pipe()
+        self.proceso = contexto.Process(target=_bucle_trabajador, args=(tipo, conexion_hijo),
+                                        name=f"agente-{tipo}")
+        self.proceso.start()
+        conexion_hijo.close()
+
+    def cerrar(self):
+        try:
+            self.conexion.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.proceso.join(10)
+        if self.proceso.is_alive():
+            self.matar()
+
+    def matar(self):
+        terminar_arbol(self.proceso.pid)
+        self.proceso.join(5)
+        self.conexion.close()
+
+
+class SupervisorAgentes:
+    """Pool de procesos trabajadores de un agente con plazo máximo por entidad.
+
+    Si una entidad excede el plazo, el trabajador y su árbol de Chrome se matan, se devuelve
+    el resultado parcial con el motivo y el trabajador se reemplaza por uno nuevo.
+    """
+
+    def __init__(self, tipo, max_workers=2, plazo_segundos=600):
+        self.tipo = tipo
+        self.max_workers = max_workers
+        self.plazo_segundos = plazo_segundos
+        self._contexto = multiprocessing.get_context('spawn')
+        self._libres = queue.Queue()
+        for _ in range(max_workers):
+            # Los trabajadores se crean al primer uso
+            self._libres.put(None)
+        self._todos = []
+        # Los trabajadores no son daemon (el agente de contactos usa su propio pool de procesos),
+        # así que hay que cerrarlos antes de que multiprocessing espere por ellos al salir
+        util.Finalize(self, self.cerrar, exitpriority=10)
+
+    def ejecutar(self, nombre_entidad, download_path=None, **opciones):
+        """Investiga la entidad en un proceso trabajador respetando el plazo.
+
+        Cualquier salida (resultado, plazo vencido, proceso caído o una excepción como un error
+        al serializar las opciones) devuelve el lugar al pool: el mismo trabajador si terminó
+        su tarea, o None para crear uno nuevo tras matar el anterior.
+        """
+        trabajador = self._libres.get()
+        terminado = False
+        try:
+            if trabajador is None:
+                trabajador = _Trabajador(self._contexto, self.tipo)
+                self._todos.append(trabajador)
+
+            parcial = {}
+            limite = time.monotonic() + self.plazo_segundos
+            try:
+                trabajador.conexion.send((nombre_entidad, download_path, opciones))
+                while True:
+                    restante = limite - time.monotonic()
+                    if restante <= 0 or not trabajador.conexion.poll(restante):
+                        break
+                    tipo_mensaje, datos = trabajador.conexion.recv()
+                    if tipo_mensaje == 'parcial':
+                        parcial.update(datos)
+                        continue
+                    terminado = True
+                    return datos
+                motivo = f"Tiempo límite de {self.plazo_segundos}s excedido"
+            except (EOFError, BrokenPipeError, OSError) as e:
+                motivo = f"El proceso del agente terminó inesperadamente: {e}"
+
+            print(f"⏱️ [{self.tipo}] {nombre_entidad}: {motivo}; reiniciando trabajador")
+            return dict(parcial, exito=False, error=motivo, timeout=True)
+        finally:
+            if terminado:
+                self._libres.put(trabajador)
+            else:
+                # Vencido, caído o interrumpido: matar el árbol completo y reemplazar el trabajador
+                try:
+                    if trabajador is not None:
+                        self._todos.remove(trabajador)
+                        trabajador.matar()
+                finally:
+                    self._libres.put(None)
+
+    def cerrar(self):
+        for trabajador in list(self._todos):
+            trabajador.cerrar()
+        self._todos.clear()
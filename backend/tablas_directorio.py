@@ -0,0 +1,71 @@
+from bs4 import BeautifulSoup
+
+try:
+    import lxml  # noqa: F401
+    PARSER_HTML = 'lxml'
+except ImportError:
+    PARSER_HTML = 'html.parser'
+
+INDICADORES_DIRECTORIO = ['nombre', 'cargo', 'email', 'correo', 'telefono', 'teléfono', 'director', 'coordinador']
+
+COLUMNAS_DIRECTORIO = {
+    'nombre': ['nombre', 'funcionario', 'servidor'],
+    'cargo': ['cargo', 'puesto', 'denominaci'],
+    'email': ['email', 'correo', 'e-mail'],
+    'telefono': ['telefono', 'teléfono', 'tel', 'conmutador']
+}
+
+
+def _texto_celda(celda):
+    return ' '.join(celda.get_text(' ', strip=True).split())
+
+
+def analizar_tablas(html, min_indicadores=3):
+    """Parsea un snapshot de page_source y puntúa todas las tablas en una sola pasada.
+
+    Devuelve una lista (en orden de documento) de dicts con índice, filas de texto,
+    encabezados, puntaje y si parece un directorio.
+    """
+    soup = BeautifulSoup(html, PARSER_HTML)
+    tablas = []
+    for indice, tabla in enumerate(soup.find_all('table')):
+        filas = []
+        encabezados = None
+        for fila in tabla.find_all('tr'):
+            # Ignorar filas de tablas anidadas
+            if fila.find_parent('table') is not tabla:
+                continue
+            celdas = fila.find_all(['th', 'td'], recursive=False)
+            if not celdas:
+                continue
+            textos = [_texto_celda(c) for c in celdas]
+            if encabezados is None and fila.find('th', recursive=False) is not None:
+                encabezados = [t.lower() for t in textos]
+                continue
+            filas.append(textos)
+
+        if encabezados is None and filas:
+            encabezados = [t.lower() for t in filas.pop(0)]
+
+        texto_tabla = ' '.join(encabezados or []) + ' ' + ' '.join(' '.join(f) for f in filas[:50])
+        texto_tabla = texto_tabla.lower()
+        puntaje = sum(1 for ind in INDICADORES_DIRECTORIO if ind in texto_tabla)
+        tablas.append({
+            'indice': indice,
+            'encabezados': encabezados or [],
+            'filas': filas,
+            'puntaje': puntaje,
+            'es_directorio': puntaje >= min_indicadores and bool(filas)
+        })
+    return tablas
+
+
+def mapear_columnas(encabezados, columnas=COLUMNAS_DIRECTORIO):
+    """Asigna a cada campo el índice de la primera columna cuyo encabezado coincide"""
+    indices = {}
+    for campo, palabras in columnas.items():
+        indices[campo] = next(
+            (i for i, encabezado in enumerate(encabezados) if any(p in encabezado for p in palabras)),
+            None
+        )
+    return indices
@@ -0,0 +1,33 @@
+from cache_ocr import CacheOCR, clave_config
+
+
+def test_acierto_exacto_y_por_config(tmp_path):
+    cache = CacheOCR(str(tmp_path / "ocr.db"))
+    config = clave_config(tipo='pdf', dpi=300, max_pixeles=40_000_000)
+    cache.guardar('h1', config, {'texto': 'uno', 'cajas': []})
+
+    assert cache.obtener('h1', config) == {'texto': 'uno', 'cajas': []}
+    assert cache.obtener('h1', clave_config(tipo='pdf', dpi=300, max_pixeles=10_000_000)) is None
+    assert (cache.aciertos, cache.fallos) == (1, 1)
+
+
+def test_copia_perceptual_usa_la_mas_cercana(tmp_path):
+    cache = CacheOCR(str(tmp_path / "ocr.db"), distancia_perceptual=4)
+    cache.guardar('lejana', 'c', {'texto': 'lejana'}, phash='000000000000000f')
+    cache.guardar('cercana', 'c', {'texto': 'cercana'}, phash='0000000000000001')
+    cache.guardar('fuera', 'c', {'texto': 'fuera'}, phash='00000000000000ff')
+
+    assert cache.obtener('otra', 'c', phash='0000000000000000') == {'texto': 'cercana'}
+    assert cache.obtener('otra', 'c', phash='ffffffffffffffff') is None
+
+
+def test_expulsa_las_menos_usadas(tmp_path):
+    cache = CacheOCR(str(tmp_path / "ocr.db"), max_bytes=70)
+    cache.guardar('a', 'c', {'texto': 'a' * 20})
+    cache.guardar('b', 'c', {'texto': 'b' * 20})
+    cache.obtener('a', 'c')
+    cache.guardar('d', 'c', {'texto': 'd' * 20})
+
+    assert cache.obtener('b', 'c') is None
+    assert cache.obtener('a', 'c') is not None
+    assert cache.obtener('d', 'c') is not None
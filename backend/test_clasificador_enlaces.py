@@ -0,0 +1,97 @@
+import pytest
+import requests
+
+import clasificador_enlaces
+from clasificador_enlaces import ClasificadorEnlaces, tipo_por_content_type, tipo_por_firma
+
+
+class RespuestaFalsa:
+    def __init__(self, status_code=200, headers=None, contenido=b''):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.contenido = contenido
+
+    def iter_content(self, chunk_size):
+        yield self.contenido[:chunk_size]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+@pytest.fixture
+def red(monkeypatch):
+    """Registra las peticiones y responde con los dicts {url: RespuestaFalsa} de head y get"""
+    servidor = {'head': {}, 'get': {}, 'peticiones': []}
+
+    def atender(metodo):
+        def responder(url, **kwargs):
+            servidor['peticiones'].append((metodo, url))
+            respuesta = servidor[metodo].get(url)
+            if respuesta is None:
+                raise requests.ConnectionError(url)
+            return respuesta
+        return responder
+
+    monkeypatch.setattr(clasificador_enlaces.requests, 'head', atender('head'))
+    monkeypatch.setattr(clasificador_enlaces.requests, 'get', atender('get'))
+    return servidor
+
+
+def test_tipo_por_firma():
+    assert tipo_por_firma(b'%PDF-1.7\n') == 'pdf'
+    assert tipo_por_firma(b'\x89PNG\r\n\x1a\n') == 'imagen'
+    assert tipo_por_firma(b'\xff\xd8\xff\xe0') == 'imagen'
+    assert tipo_por_firma(b'RIFF\x00\x00\x00\x00WEBPVP8 ') == 'imagen'
+    assert tipo_por_firma(b'\n  <!DOCTYPE html>') == 'html'
+    assert tipo_por_firma(b'PK\x03\x04') is None
+
+
+def test_tipo_por_content_type():
+    assert tipo_por_content_type('application/pdf; charset=binary') == 'pdf'
+    assert tipo_por_content_type('image/jpeg') == 'imagen'
+    assert tipo_por_content_type('text/html; charset=utf-8') == 'html'
+    assert tipo_por_content_type('application/octet-stream') is None
+    assert tipo_por_content_type(None) is None
+    assert tipo_por_content_type('application/zip') == 'otro'
+
+
+def test_head_con_content_type_claro(red):
+    red['head']['https://sitio.gob.mx/directorio'] = RespuestaFalsa(
+        headers={'Content-Type': 'application/pdf', 'Content-Length': '2048'})
+    clasificador = ClasificadorEnlaces()
+
+    assert clasificador.clasificar('https://sitio.gob.mx/directorio') == 'pdf'
+    assert clasificador.tamano('https://sitio.gob.mx/directorio') == 2048
+    assert red['peticiones'] == [('head', 'https://sitio.gob.mx/directorio')]
+
+
+def test_octet_stream_se_resuelve_con_bytes_magicos(red):
+    url = 'https://sitio.gob.mx/descarga?id=7'
+    red['head'][url] = RespuestaFalsa(headers={'Content-Type': 'application/octet-stream'})
+    red['get'][url] = RespuestaFalsa(206, {'Content-Range': 'bytes 0-1023/50000'}, b'\x89PNG\r\n\x1a\n' + b'0' * 2000)
+    clasificador = ClasificadorEnlaces()
+
+    assert clasificador.clasificar(url, 'html') == 'imagen'
+    assert clasificador.tamano(url) == 50000
+    # Segunda consulta: sale de la caché, sin red
+    assert clasificador.clasificar(url, 'html') == 'imagen'
+    assert red['peticiones'] == [('head', url), ('get', url)]
+
+
+def test_sin_red_conserva_la_heuristica(red):
+    clasificador = ClasificadorEnlaces()
+    assert clasificador.clasificar('https://caido.gob.mx/a.pdf', 'pdf') == 'pdf'
+    assert clasificador.clasificar('javascript:void(0)', 'html') == 'html'
+
+
+def test_clasificar_lote_corrige_tipos(red):
+    red['head']['https://sitio.gob.mx/a.pdf'] = RespuestaFalsa(headers={'Content-Type': 'text/html'})
+    red['head']['https://sitio.gob.mx/b'] = RespuestaFalsa(headers={'Content-Type': 'image/png'})
+    enlaces = [{'url': 'https://sitio.gob.mx/a.pdf', 'tipo': 'pdf'}, {'url': 'https://sitio.gob.mx/b', 'tipo': 'html'}]
+
+    ClasificadorEnlaces(max_workers=2).clasificar_lote(enlaces)
+
+    assert [e['tipo'] for e in enlaces] == ['html', 'imagen']
@@ -0,0 +1,29 @@
+import multiprocessing
+
+import pytest
+
+from cola_broker import broker_local, conectar_cola, servir_cola
+from cola_trabajos import ColaTrabajos, HECHA
+
+
+def test_cola_remota_comparte_tareas_con_el_broker(tmp_path):
+    with broker_local(str(tmp_path / "jobs.db")) as (cola, direccion, clave):
+        cola.crear_sesion('s1', str(tmp_path))
+        cola.encolar('s1', ['Entidad A'])
+
+        remota = conectar_cola(direccion, clave)
+        [tarea] = remota.arrendar('nodo-2')
+        assert tarea['entidad'] == 'Entidad A'
+        assert remota.completar(tarea['id'], {'entidad': 'Entidad A'})
+        assert cola.contar('s1')[HECHA] == 1
+
+
+def test_clave_incorrecta_no_conecta(tmp_path):
+    with broker_local(str(tmp_path / "jobs.db")) as (_, direccion, _clave):
+        with pytest.raises(multiprocessing.AuthenticationError):
+            conectar_cola(direccion, b'otra clave')
+
+
+def test_servir_sin_clave_falla(tmp_path):
+    with pytest.raises(ValueError):
+        servir_cola(ColaTrabajos(str(tmp_path / "jobs.db")), None)
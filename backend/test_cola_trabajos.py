@@ -0,0 +1,113 @@
+import time
+
+from cola_trabajos import ColaTrabajos, EN_COLA, ARRENDADA, HECHA, FALLIDA
+
+
+def nueva_cola(tmp_path, **opciones):
+    cola = ColaTrabajos(str(tmp_path / "jobs.db"), **opciones)
+    cola.crear_sesion('s1', str(tmp_path))
+    return cola
+
+
+def test_arriendo_vencido_vuelve_a_la_cola(tmp_path):
+    """Si el trabajador muere sin renovar, otro trabajador recupera la tarea"""
+    cola = nueva_cola(tmp_path, duracion_arriendo=0.05)
+    cola.encolar('s1', ['Entidad A'])
+
+    [tarea] = cola.arrendar('w1')
+    assert cola.arrendar('w2') == []
+    time.sleep(0.1)
+
+    [recuperada] = cola.arrendar('w2')
+    assert recuperada['id'] == tarea['id']
+    assert recuperada['intentos'] == 2
+    assert cola.contar('s1')[ARRENDADA] == 1
+
+
+def test_renovar_mantiene_el_arriendo(tmp_path):
+    cola = nueva_cola(tmp_path, duracion_arriendo=0.2)
+    cola.encolar('s1', ['Entidad A'])
+    cola.arrendar('w1')
+    for _ in range(3):
+        time.sleep(0.1)
+        cola.renovar('w1')
+        assert cola.arrendar('w2') == []
+
+
+def test_arriendo_vencido_sin_intentos_queda_fallido(tmp_path):
+    cola = nueva_cola(tmp_path, duracion_arriendo=0.05, max_intentos=1)
+    cola.encolar('s1', ['Entidad A'])
+    cola.arrendar('w1')
+    time.sleep(0.1)
+
+    assert cola.arrendar('w2') == []
+    assert cola.contar('s1')[FALLIDA] == 1
+
+
+def test_completar_es_idempotente(tmp_path):
+    cola = nueva_cola(tmp_path)
+    cola.encolar('s1', ['Entidad A'])
+    [tarea] = cola.arrendar('w1')
+
+    assert cola.completar(tarea['id'], {'entidad': 'Entidad A', 'contactos_aws': [{'nombre': 'x'}]})
+    assert not cola.completar(tarea['id'], {'entidad': 'Entidad A', 'contactos_aws': []})
+    assert not cola.fallar(tarea['id'], 'tarde')
+
+    assert cola.contar('s1')[HECHA] == 1
+    assert cola.resultados('s1') == [{'entidad': 'Entidad A', 'contactos_aws': [{'nombre': 'x'}]}]
+
+
+def test_fallar_reintenta_hasta_max_intentos(tmp_path):
+    cola = nueva_cola(tmp_path, max_intentos=2)
+    cola.encolar('s1', ['Entidad A'])
+
+    [tarea] = cola.arrendar('w1')
+    cola.fallar(tarea['id'], 'timeout')
+    assert cola.contar('s1')[EN_COLA] == 1
+
+    [tarea] = cola.arrendar('w1')
+    cola.fallar(tarea['id'], 'timeout')
+    assert cola.contar('s1')[FALLIDA] == 1
+
+
+def test_encolar_ignora_repetidas(tmp_path):
+    cola = nueva_cola(tmp_path)
+    assert cola.encolar('s1', ['A', 'B']) == 2
+    assert cola.encolar('s1', ['B', 'C']) == 1
+    assert sum(cola.contar('s1').values()) == 3
+
+
+def test_reinicio_conserva_tareas_y_resultados(tmp_path):
+    """Una cola nueva sobre el mismo archivo ve sesiones pendientes y recupera arriendos huérfanos"""
+    cola = nueva_cola(tmp_path, duracion_arriendo=0.05)
+    cola.encolar('s1', ['A', 'B'])
+    [hecha, huerfana] = cola.arrendar('w1', limite=2)
+    cola.completar(hecha['id'], {'entidad': 'A'})
+    cola.agregar_log('s1', 'antes del reinicio')
+    del cola
+
+    reiniciada = ColaTrabajos(str(tmp_path / "jobs.db"), duracion_arriendo=0.05)
+    assert reiniciada.sesiones_pendientes() == ['s1']
+    assert reiniciada.resultados('s1') == [{'entidad': 'A'}]
+    assert reiniciada.logs('s1')[0]['message'] == 'antes del reinicio'
+
+    time.sleep(0.1)
+    [recuperada] = reiniciada.arrendar('w2')
+    assert recuperada['id'] == huerfana['id']
+
+
+def test_estado_sesion_solo_trae_lo_reciente(tmp_path):
+    cola = nueva_cola(tmp_path)
+    cola.encolar('s1', [f'E{i}' for i in range(5)])
+    for tarea in cola.arrendar('w1', limite=5):
+        cola.completar(tarea['id'], {'entidad': tarea['entidad'], 'contactos_aws': [{'nombre': 'x'}] * 2})
+    cola.agregar_log('s1', 'hola')
+
+    estado = cola.estado_sesion('s1', max_resultados=2, max_contactos=3)
+    assert [r['entidad'] for r in estado['resultados']] == ['E3', 'E4']
+    assert estado['total_resultados'] == 5
+    assert estado['total_contactos_aws'] == 10
+    assert len(estado['contactos_aws']) == 3
+    assert estado['total_logs'] == 1
+    assert 'logs' not in estado
+    assert estado['progress'] == 100
@@ -0,0 +1,84 @@
+import threading
+import time
+
+import pytest
+
+from coordinador import Coordinador
+
+
+class Contador:
+    """Cuenta llamadas simultáneas y recuerda el máximo alcanzado"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.activos = 0
+        self.maximo = 0
+
+    def __enter__(self):
+        with self.lock:
+            self.activos += 1
+            self.maximo = max(self.maximo, self.activos)
+
+    def __exit__(self, *exc):
+        with self.lock:
+            self.activos -= 1
+
+
+@pytest.fixture
+def coordinador(tmp_path, monkeypatch):
+    # Los agentes crean sus carpetas y cachés SQLite en el directorio actual
+    monkeypatch.chdir(tmp_path)
+    coordinador = Coordinador(max_workers_transparencia=1, max_workers_contactos=2, max_entidades_en_vuelo=3)
+    coordinador.simultaneos = {'transparencia': Contador(), 'contactos': Contador()}
+
+    def resolver(item):
+        item['url_oficial'] = 'https://ejemplo.gob.mx'
+        return item
+
+    def agente(fuente):
+        def ejecutar(nombre_entidad, resultado, log_callback, **opciones):
+            with coordinador.simultaneos[fuente]:
+                time.sleep(0.02)
+            resultado[fuente] = {'exito': True, 'entidad': nombre_entidad}
+        return ejecutar
+
+    monkeypatch.setattr(coordinador, '_etapa_resolver', resolver)
+    monkeypatch.setattr(coordinador, '_ejecutar_agente_transparencia', agente('transparencia'))
+    monkeypatch.setattr(coordinador, '_ejecutar_agente_contactos', agente('contactos'))
+    return coordinador
+
+
+def test_investigar_entidades_respeta_los_limites_por_agente(coordinador, tmp_path):
+    entidades = [f'Entidad {i}' for i in range(6)]
+    progreso = []
+    contexto = coordinador.crear_contexto(str(tmp_path), lambda *args: None)
+
+    resultados = list(coordinador.investigar_entidades(
+        entidades, progreso_callback=lambda *args: progreso.append(args), contexto=contexto))
+
+    assert sorted(r['entidad'] for r in resultados) == entidades
+    for resultado in resultados:
+        assert resultado['transparencia'] == {'exito': True, 'entidad': resultado['entidad']}
+        assert resultado['contactos'] == {'exito': True, 'entidad': resultado['entidad']}
+    assert coordinador.simultaneos['transparencia'].maximo == 1
+    assert coordinador.simultaneos['contactos'].maximo == 2
+    completadas = [p for p in progreso if p[1] == 'completada']
+    assert [p[2] for p in completadas] == [1, 2, 3, 4, 5, 6]
+    assert {p[3] for p in progreso} == {6}
+
+
+def test_no_admite_mas_entidades_de_las_que_caben_en_vuelo(coordinador, tmp_path):
+    admitidas = []
+
+    def entidades():
+        for i in range(8):
+            admitidas.append(i)
+            yield f'Entidad {i}'
+
+    contexto = coordinador.crear_contexto(str(tmp_path), lambda *args: None)
+    generador = coordinador.investigar_entidades(entidades(), contexto=contexto)
+    next(generador)
+    # Backpressure: sin consumir más resultados sólo se toman de la fuente 3 en vuelo + 1 completada
+    time.sleep(0.3)
+    assert len(admitidas) == 4
+    assert len(list(generador)) == 7
@@ -0,0 +1,90 @@
+import os
+import tempfile
+
+import pytest
+import requests
+
+import descargas
+
+
+class RespuestaFalsa:
+    def __init__(self, fragmentos, content_type='', status_code=200, longitud=None, error=None):
+        self.status_code = status_code
+        self.headers = {'Content-Type': content_type}
+        if longitud is not None:
+            self.headers['Content-Length'] = str(longitud)
+        self.fragmentos = fragmentos
+        self.error = error
+
+    def iter_content(self, chunk_size):
+        yield from self.fragmentos
+        if self.error:
+            raise self.error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+@pytest.fixture
+def servir(monkeypatch, tmp_path):
+    """Responde a descargas.requests.get con una RespuestaFalsa y deja los temporales en tmp_path"""
+    monkeypatch.setattr(tempfile, 'tempdir', str(tmp_path))
+
+    def configurar(respuesta):
+        monkeypatch.setattr(descargas.requests, 'get', lambda *args, **kwargs: respuesta)
+    return configurar
+
+
+def test_descarga_completa(servir, tmp_path):
+    servir(RespuestaFalsa([b'%PDF-1.7 ', b'x' * 100], 'application/pdf'))
+
+    with descargas.descargar('https://sitio.gob.mx/d.pdf', 'pdf') as descarga:
+        assert descarga.tamano == 109
+        with open(descarga.ruta, 'rb') as archivo:
+            assert archivo.read(4) == b'%PDF'
+    assert os.listdir(tmp_path) == []
+
+
+def test_content_type_distinto_no_descarga(servir, tmp_path):
+    servir(RespuestaFalsa([b'<html>'], 'text/html'))
+    assert descargas.descargar('https://sitio.gob.mx/d.pdf', 'pdf') is None
+    assert os.listdir(tmp_path) == []
+
+
+def test_content_length_excesivo_no_descarga(servir, tmp_path):
+    servir(RespuestaFalsa([b'%PDF'], 'application/pdf', longitud=2000))
+    assert descargas.descargar('https://sitio.gob.mx/d.pdf', 'pdf', max_bytes=1000) is None
+    assert os.listdir(tmp_path) == []
+
+
+def test_bytes_magicos_distintos_abortan(servir, tmp_path):
+    servir(RespuestaFalsa([b'<!DOCTYPE html>', b'...'], 'application/octet-stream'))
+    assert descargas.descargar('https://sitio.gob.mx/d.pdf', 'pdf') is None
+    assert os.listdir(tmp_path) == []
+
+
+def test_exceso_sin_content_length_aborta_y_limpia(servir, tmp_path):
+    servir(RespuestaFalsa([b'%PDF'] + [b'x' * 400] * 5))
+    assert descargas.descargar('https://sitio.gob.mx/d.pdf', 'pdf', max_bytes=1000) is None
+    assert os.listdir(tmp_path) == []
+
+
+def test_error_de_red_a_medio_cuerpo_elimina_el_temporal(servir, tmp_path):
+    servir(RespuestaFalsa([b'%PDF', b'x' * 100], error=requests.exceptions.ChunkedEncodingError('reset')))
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        descargas.descargar('https://sitio.gob.mx/d.pdf', 'pdf')
+    assert os.listdir(tmp_path) == []
+
+
+def test_rss_se_muestrea_por_intervalo(servir, monkeypatch):
+    llamadas = []
+    monkeypatch.setattr(descargas, 'rss_proceso', lambda: llamadas.append(1) or 100)
+    servir(RespuestaFalsa([b'%PDF'] + [b'x' * 1024] * 100))
+
+    with descargas.descargar('https://sitio.gob.mx/d.pdf', 'pdf', chunk_size=1024, intervalo_rss=10 * 1024):
+        pass
+    # una medición inicial, una por cada 10 KB y una al cerrar
+    assert len(llamadas) == 12
@@ -0,0 +1,118 @@
+import gzip
+
+import pytest
+
+import descubrimiento_sitemap
+from descubrimiento_sitemap import DescubridorSitemap, _LectorFragmentos, leer_robots
+
+
+class RespuestaFalsa:
+    def __init__(self, contenido=b'', content_type='application/xml', status_code=200):
+        self.contenido = contenido
+        self.status_code = status_code
+        self.headers = {'Content-Type': content_type}
+        self.encoding = 'utf-8'
+
+    @property
+    def text(self):
+        return self.contenido.decode()
+
+    def iter_content(self, chunk_size):
+        for inicio in range(0, len(self.contenido), chunk_size):
+            yield self.contenido[inicio:inicio + chunk_size]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+@pytest.fixture
+def sitio(monkeypatch):
+    """Sirve un dict {url: RespuestaFalsa} en lugar de la red; lo demás responde 404"""
+    paginas = {}
+    monkeypatch.setattr(descubrimiento_sitemap.requests, 'get',
+                        lambda url, **kwargs: paginas.get(url, RespuestaFalsa(status_code=404)))
+    return paginas
+
+
+def urlset(*urls):
+    locs = ''.join(f'<url><loc>{url}</loc></url>' for url in urls)
+    return f'<?xml version="1.0"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{locs}</urlset>'.encode()
+
+
+def test_lector_cuenta_los_bytes_iniciales():
+    lector = _LectorFragmentos(iter([b'67890']), 10, inicial=b'12345')
+    assert lector.read() == b'1234567890'
+
+    lector = _LectorFragmentos(iter([b'678901']), 10, inicial=b'12345')
+    with pytest.raises(ValueError):
+        lector.read()
+
+    with pytest.raises(ValueError):
+        _LectorFragmentos(iter([]), 4, inicial=b'12345').read()
+
+
+def test_lector_justo_en_el_limite_no_falla():
+    lector = _LectorFragmentos(iter([b'ab', b'cd']), 4)
+    assert lector.read(3) == b'abc'
+    assert lector.read(3) == b'd'
+    assert lector.read(3) == b''
+
+
+def test_leer_robots(sitio):
+    sitio['https://sitio.gob.mx/robots.txt'] = RespuestaFalsa(
+        b"User-agent: Googlebot\nCrawl-delay: 30\n\n"
+        b"User-agent: *\nDisallow: /admin\nCrawl-delay: 2\n"
+        b"Sitemap: /sitemap_index.xml\n", 'text/plain')
+    robots = leer_robots('https://sitio.gob.mx')
+    assert robots == {'sitemaps': ['https://sitio.gob.mx/sitemap_index.xml'], 'crawl_delay': 2.0}
+
+
+def test_recorrer_sitemap_en_streaming_y_gzip(sitio):
+    descubridor = DescubridorSitemap()
+    sitio['https://sitio.gob.mx/a.xml'] = RespuestaFalsa(urlset('https://sitio.gob.mx/x', 'https://sitio.gob.mx/y'))
+    sitio['https://sitio.gob.mx/b.xml.gz'] = RespuestaFalsa(gzip.compress(urlset('https://sitio.gob.mx/z')),
+                                                            'application/x-gzip')
+
+    assert list(descubridor.recorrer_sitemap('https://sitio.gob.mx/a.xml')) == [
+        ('url', 'https://sitio.gob.mx/x'), ('url', 'https://sitio.gob.mx/y')]
+    assert list(descubridor.recorrer_sitemap('https://sitio.gob.mx/b.xml.gz')) == [('url', 'https://sitio.gob.mx/z')]
+
+
+def test_recorrer_sitemap_corta_al_pasar_el_limite(sitio):
+    contenido = urlset(*[f'https://sitio.gob.mx/p{i}' for i in range(2000)])
+    sitio['https://sitio.gob.mx/grande.xml'] = RespuestaFalsa(contenido)
+    sitio['https://sitio.gob.mx/bomba.xml.gz'] = RespuestaFalsa(gzip.compress(contenido), 'application/x-gzip')
+
+    descubridor = DescubridorSitemap(max_bytes=len(contenido) // 2)
+    with pytest.raises(ValueError):
+        list(descubridor.recorrer_sitemap('https://sitio.gob.mx/grande.xml'))
+    # El .gz comprimido cabe, pero descomprimido excede el límite
+    with pytest.raises(ValueError):
+        list(descubridor.recorrer_sitemap('https://sitio.gob.mx/bomba.xml.gz'))
+
+
+def test_descubrir_sigue_indices_y_confirma_el_mejor(sitio):
+    sitio['https://sitio.gob.mx/robots.txt'] = RespuestaFalsa(b"Sitemap: https://sitio.gob.mx/indice.xml\n", 'text/plain')
+    sitio['https://sitio.gob.mx/indice.xml'] = RespuestaFalsa(
+        b'<sitemapindex><sitemap><loc>https://sitio.gob.mx/paginas.xml</loc></sitemap></sitemapindex>')
+    sitio['https://sitio.gob.mx/paginas.xml'] = RespuestaFalsa(urlset(
+        'https://sitio.gob.mx/noticias/1', 'https://sitio.gob.mx/directorio-de-tramites',
+        'https://sitio.gob.mx/transparencia/directorio', 'https://sitio.gob.mx/organigrama'))
+    sitio['https://sitio.gob.mx/transparencia/directorio'] = RespuestaFalsa(
+        b'<html><title>Directorio institucional</title></html>', 'text/html')
+
+    resultado = DescubridorSitemap(umbral_confianza=1).descubrir('https://sitio.gob.mx')
+    urls = [c['url'] for c in resultado['candidatos']]
+    assert urls == ['https://sitio.gob.mx/transparencia/directorio', 'https://sitio.gob.mx/organigrama']
+    assert [c['confiable'] for c in resultado['candidatos']] == [True, False]
+
+
+def test_sin_segunda_senal_no_es_confiable(sitio):
+    sitio['https://sitio.gob.mx/sitemap.xml'] = RespuestaFalsa(urlset('https://sitio.gob.mx/directorio'))
+    sitio['https://sitio.gob.mx/directorio'] = RespuestaFalsa(b'<html><title>Inicio</title></html>', 'text/html')
+
+    resultado = DescubridorSitemap(umbral_confianza=1).descubrir('https://sitio.gob.mx')
+    assert [c['confiable'] for c in resultado['candidatos']] == [False]
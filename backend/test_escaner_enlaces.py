@@ -0,0 +1,59 @@
+from escaner_enlaces import SCRIPT_ENLACES, SELECTORES_MENU, EscanerEnlaces
+
+BASE = 'https://www.sitio.gob.mx/'
+
+
+def test_puntuar_por_campo():
+    escaner = EscanerEnlaces()
+    enlace = {'href': 'https://sitio.gob.mx/transparencia/directorio', 'texto': ' Directorio '}
+
+    assert escaner.puntuar(enlace, BASE) == (16.0, ['directorio'])
+    assert escaner.puntuar(dict(enlace, en_menu=True), BASE) == (17.0, ['directorio'])
+    assert escaner.puntuar(dict(enlace, href='https://otro.gob.mx/transparencia/directorio'), BASE) == (8.0, ['directorio'])
+    assert escaner.puntuar({'href': 'https://sitio.gob.mx/x', 'texto': 'Organigrama',
+                            'menu': ['Conócenos']}, BASE) == (9.9, ['conocenos', 'organigrama'])
+
+
+def test_palabras_a_evitar_solo_en_el_ultimo_segmento():
+    escaner = EscanerEnlaces()
+    assert escaner.puntuar({'href': 'https://sitio.gob.mx/servicios/directorio', 'texto': 'Directorio'}, BASE)
+    assert escaner.puntuar({'href': 'https://sitio.gob.mx/directorio-de-tramites', 'texto': 'Directorio'}, BASE) is None
+    assert escaner.puntuar({'href': 'https://sitio.gob.mx/a', 'texto': 'Directorio de Contacto'}, BASE) is None
+
+
+def test_descarta_enlaces_no_navegables():
+    escaner = EscanerEnlaces()
+    assert escaner.puntuar({'href': 'mailto:directorio@sitio.gob.mx', 'texto': 'Directorio'}, BASE) is None
+    assert escaner.puntuar({'href': 'https://www.facebook.com/directorio', 'texto': 'Directorio'}, BASE) is None
+    assert escaner.puntuar({'href': 'https://sitio.gob.mx/noticias', 'texto': 'Noticias'}, BASE) is None
+
+
+def test_candidatos_sin_duplicados_ni_anclas():
+    enlaces = [
+        {'href': 'https://sitio.gob.mx/organigrama', 'texto': 'Organigrama'},
+        {'href': 'https://sitio.gob.mx/directorio#arriba', 'texto': 'Ver', 'en_menu': True},
+        {'href': 'https://sitio.gob.mx/directorio', 'texto': 'Directorio'},
+        {'href': 'https://www.sitio.gob.mx/#directorio', 'texto': 'Directorio'},
+        {'href': 'https://sitio.gob.mx/personal', 'texto': 'Personal'},
+    ]
+    candidatos = EscanerEnlaces().candidatos(enlaces, BASE, min_puntaje=4)
+
+    assert [(c['url'], c['puntaje']) for c in candidatos] == [
+        ('https://sitio.gob.mx/directorio', 16.0), ('https://sitio.gob.mx/organigrama', 14.4)]
+    assert candidatos[0]['texto'] == 'Directorio'
+
+
+class DriverFalso:
+    def __init__(self, enlaces):
+        self.enlaces = enlaces
+        self.llamadas = []
+
+    def execute_script(self, script, *args):
+        self.llamadas.append((script, args))
+        return self.enlaces
+
+
+def test_escanear_en_un_solo_viaje_al_navegador():
+    driver = DriverFalso([{'href': 'https://sitio.gob.mx/directorio', 'texto': 'Directorio'}])
+    assert [c['url'] for c in EscanerEnlaces().escanear(driver, BASE)] == ['https://sitio.gob.mx/directorio']
+    assert driver.llamadas == [(SCRIPT_ENLACES, (SELECTORES_MENU,))]
@@ -0,0 +1,84 @@
+import os
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from exportador_excel import LibroStreaming, ContadorGrupos
+
+
+def hojas(ruta):
+    libro = load_workbook(ruta)
+    return {hoja.title: [fila[0].value for fila in hoja.iter_rows()] for hoja in libro}
+
+
+def test_hoja_se_divide_al_llenarse(tmp_path):
+    with LibroStreaming(str(tmp_path / "a.xlsx"), max_filas_hoja=3, max_filas_archivo=None) as libro:
+        hoja = libro.hoja('Datos', ['x'])
+        for i in range(5):
+            hoja.agregar((i,))
+
+    assert libro.rutas == [str(tmp_path / "a.xlsx")]
+    assert hojas(libro.rutas[0]) == {'Datos': ['x', 0, 1], 'Datos (2)': ['x', 2, 3], 'Datos (3)': ['x', 4]}
+    assert hoja.total_filas == 5
+
+
+def test_libro_se_divide_en_archivos(tmp_path):
+    with LibroStreaming(str(tmp_path / "a.xlsx"), max_filas_hoja=100, max_filas_archivo=4) as libro:
+        hoja = libro.hoja('Datos', ['x'])
+        for i in range(10):
+            hoja.agregar((i,))
+
+    assert [os.path.basename(r) for r in libro.rutas] == ['a.xlsx', 'a_parte2.xlsx', 'a_parte3.xlsx']
+    assert hojas(libro.rutas[0]) == {'Datos': ['x', 0, 1, 2, 3]}
+    assert hojas(libro.rutas[1]) == {'Datos (2)': ['x', 4, 5, 6, 7]}
+    assert hojas(libro.rutas[2]) == {'Datos (3)': ['x', 8, 9]}
+
+
+def test_resumen_se_queda_en_el_primer_archivo(tmp_path):
+    with LibroStreaming(str(tmp_path / "a.xlsx"), max_filas_archivo=3) as libro:
+        resumen = libro.hoja('Resumen', ['k'], dividir_archivos=False)
+        datos = libro.hoja('Datos', ['x'])
+        for i in range(7):
+            datos.agregar((i,))
+        resumen.agregar(('total',))
+
+    primero = hojas(libro.rutas[0])
+    assert list(primero) == ['Resumen', 'Datos']
+    assert primero['Resumen'] == ['k', 'total']
+    assert len(libro.rutas) == 3
+    assert all('Resumen' not in hojas(ruta) for ruta in libro.rutas[1:])
+
+
+def test_escribir_dataframe_con_vacios(tmp_path):
+    df = pd.DataFrame({'a': ['x', None], 'b': [float('nan'), 2.0]})
+    with LibroStreaming(str(tmp_path / "a.xlsx")) as libro:
+        libro.escribir_dataframe('Tabla', df)
+
+    filas = [[celda.value for celda in fila] for fila in load_workbook(libro.rutas[0])['Tabla'].iter_rows()]
+    assert filas == [['a', 'b'], ['x', None], [None, 2]]
+
+
+def test_partes_se_guardan_al_pasar_a_la_siguiente(tmp_path):
+    with LibroStreaming(str(tmp_path / "a.xlsx"), max_filas_archivo=2) as libro:
+        libro.hoja('Resumen', ['k'], dividir_archivos=False)
+        datos = libro.hoja('Datos', ['x'])
+        for i in range(5):
+            datos.agregar((i,))
+            if i == 4:
+                # La parte 2 ya se cerró; la 1 sigue abierta por el resumen fijo
+                assert (tmp_path / "a_parte2.xlsx").exists()
+                assert not (tmp_path / "a.xlsx").exists()
+                assert libro._libros[1] is None
+    assert len(libro.rutas) == 3
+    assert hojas(libro.rutas[1]) == {'Datos (2)': ['x', 2, 3]}
+
+
+def test_contador_grupos_respeta_orden_y_grupos_vacios():
+    contador = ContadorGrupos(['Directores'])
+    for grupo, marca in [('A', True), ('B', False), ('A', True)]:
+        contador.agregar(grupo, {'Directores': marca})
+
+    assert list(contador.filas(orden=['B', 'C', 'A'])) == [('B', 1, 0), ('C', 0, 0), ('A', 2, 2)]
+    assert list(contador.filas()) == [('A', 2, 2), ('B', 1, 0)]
+    assert contador.total() == 3
+    assert contador.total('Directores') == 2
@@ -0,0 +1,69 @@
+from extractor_contactos import ExtractorContactos, es_buzon_generico, es_nombre_propio
+
+
+def extraer(texto, **opciones):
+    return ExtractorContactos().extraer(texto, 'https://sitio.gob.mx/directorio', **opciones)
+
+
+def test_nombres_propios():
+    assert es_nombre_propio('Lic. María de la Luz Hernández')
+    assert es_nombre_propio('ING. Juan Pérez López')
+    assert not es_nombre_propio('Mapa del sitio')
+    assert not es_nombre_propio('Ver Más Información')
+    assert not es_nombre_propio('juan pérez lópez')
+
+
+def test_agrupa_nombre_cargo_y_datos_cercanos():
+    contactos = extraer(
+        "María López Hernández\n"
+        "Directora General de Tecnologías\n"
+        "maria.lopez@sitio.gob.mx\n"
+        "55 1234 5678 ext. 101\n"
+        "Juan Pérez Gómez\n"
+        "Subdirector de Sistemas\n"
+        "jperez@sitio.gob.mx\n"
+    )
+    assert [(c['nombre'], c['email'], c['extension']) for c in contactos] == [
+        ('María López Hernández', 'maria.lopez@sitio.gob.mx', '101'),
+        ('Juan Pérez Gómez', 'jperez@sitio.gob.mx', ''),
+    ]
+    assert contactos[0]['cargo'] == 'Directora General de Tecnologías'
+    assert contactos[0]['telefono'] == '55 1234 5678'
+
+
+def test_buzon_del_pie_no_se_pega_a_la_persona_anterior():
+    contactos = extraer(
+        "Juan Pérez Gómez\n"
+        "Subdirector de Sistemas\n"
+        "Tel. 55 1234 5678\n"
+        "contacto@sitio.gob.mx\n"
+    )
+    assert len(contactos) == 1
+    assert contactos[0]['email'] == ''
+    assert contactos[0]['telefono'] == '55 1234 5678'
+
+
+def test_buzon_en_la_misma_linea_si_se_asigna():
+    contactos = extraer("Titular de la Unidad de Transparencia: transparencia@sitio.gob.mx\n")
+    assert contactos[0]['email'] == 'transparencia@sitio.gob.mx'
+
+
+def test_la_ventana_no_cruza_lineas_en_blanco():
+    contactos = extraer(
+        "Juan Pérez Gómez\n"
+        "Subdirector de Sistemas\n"
+        "\n"
+        "jperez@sitio.gob.mx\n"
+    )
+    assert contactos == []
+
+
+def test_buzones_genericos():
+    assert es_buzon_generico('contacto@sitio.gob.mx')
+    assert es_buzon_generico('Atencion.Ciudadana@sitio.gob.mx')
+    assert not es_buzon_generico('jperez@sitio.gob.mx')
+
+
+def test_simples_si_no_hay_estructura():
+    contactos = extraer("Escríbenos a info@sitio.gob.mx", simples_si_vacio=True)
+    assert [c['fuente_tipo'] for c in contactos] == ['email_simple']
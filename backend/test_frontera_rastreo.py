@@ -0,0 +1,67 @@
+from frontera_rastreo import FronteraRastreo, PresupuestoSitio, canonicalizar_url
+
+
+def enlace(url, relevancia=0, tipo='html', **extra):
+    return {'url': url, 'texto': url, 'relevancia': relevancia, 'tipo': tipo, **extra}
+
+
+def test_canonicalizar_url_unifica_variantes():
+    clave = canonicalizar_url('https://www.sitio.gob.mx/directorio/')
+    assert canonicalizar_url('http://sitio.gob.mx/directorio#equipo') == clave
+    assert canonicalizar_url('https://sitio.gob.mx:443/directorio?utm_source=x&fbclid=y') == clave
+    assert canonicalizar_url('https://sitio.gob.mx/directorio?b=2&a=1') == canonicalizar_url('https://sitio.gob.mx/directorio?a=1&b=2')
+
+
+def test_siguiente_respeta_la_prioridad():
+    frontera = FronteraRastreo('https://sitio.gob.mx')
+    frontera.agregar(enlace('https://sitio.gob.mx/a', relevancia=1))
+    frontera.agregar(enlace('https://sitio.gob.mx/b.pdf', relevancia=1, tipo='pdf'))
+    frontera.agregar(enlace('https://sitio.gob.mx/c', relevancia=1, confiable=True))
+    frontera.agregar(enlace('https://sitio.gob.mx/d', relevancia=6), profundidad=1)
+
+    orden = [frontera.siguiente()['url'] for _ in range(4)]
+    assert orden == ['https://sitio.gob.mx/c', 'https://sitio.gob.mx/d',
+                     'https://sitio.gob.mx/b.pdf', 'https://sitio.gob.mx/a']
+    assert frontera.siguiente() is None
+
+
+def test_enlaces_externos_se_siguen_despues_de_los_propios():
+    frontera = FronteraRastreo('https://sitio.gob.mx')
+    assert frontera.agregar(enlace('https://directorio.otro.gob.mx/', relevancia=3))
+    assert frontera.agregar(enlace('https://portal.sitio.gob.mx/directorio', relevancia=3))
+
+    assert frontera.siguiente()['url'] == 'https://portal.sitio.gob.mx/directorio'
+    assert frontera.siguiente()['url'] == 'https://directorio.otro.gob.mx/'
+
+
+def test_no_encola_repetidos_profundos_ni_otros():
+    frontera = FronteraRastreo('https://sitio.gob.mx', max_profundidad=1)
+    assert frontera.agregar(enlace('https://sitio.gob.mx/a'))
+    assert not frontera.agregar(enlace('http://www.sitio.gob.mx/a/'))
+    assert not frontera.agregar(enlace('https://sitio.gob.mx/b'), profundidad=2)
+    assert not frontera.agregar(enlace('https://sitio.gob.mx/c.zip', tipo='otro'))
+
+    frontera.siguiente()
+    assert not frontera.agregar(enlace('https://sitio.gob.mx/a'))
+    assert len(frontera) == 0
+
+
+def test_presupuesto_de_paginas_detiene_la_frontera():
+    frontera = FronteraRastreo('https://sitio.gob.mx', PresupuestoSitio(max_paginas=2))
+    for i in range(5):
+        frontera.agregar(enlace(f'https://sitio.gob.mx/{i}'))
+
+    visitados = 0
+    while frontera.siguiente() is not None:
+        frontera.presupuesto.consumir(1)
+        visitados += 1
+    assert visitados == 2
+    assert len(frontera) == 3
+
+
+def test_presupuesto_de_bytes():
+    presupuesto = PresupuestoSitio(max_bytes=1000)
+    presupuesto.consumir(1, 600)
+    assert presupuesto.motivo_agotado() is None
+    presupuesto.consumir(0, 400)
+    assert presupuesto.motivo_agotado() is not None
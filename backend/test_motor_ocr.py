@@ -0,0 +1,79 @@
+from concurrent.futures import Future
+
+import pytest
+from PIL import Image
+
+import motor_ocr
+from motor_ocr import MotorOCR, _ocr_imagen
+
+# Líneas de la imagen completa: (texto, top, alto) en coordenadas absolutas
+LINEAS = [('uno', 45, 10), ('dos', 100, 10), ('tres', 210, 10)]
+
+
+def imagen_marcada(ancho, alto):
+    """Imagen en escala de grises donde cada fila vale su coordenada y (así una franja sabe dónde empieza)"""
+    imagen = Image.new('L', (ancho, alto))
+    imagen.putdata([y % 256 for y in range(alto) for _ in range(ancho)])
+    return imagen
+
+
+def datos_falsos(imagen, **kwargs):
+    """Sustituto de pytesseract.image_to_data: devuelve las LINEAS visibles en la franja recibida"""
+    inicio = imagen.getpixel((0, 0))
+    datos = {clave: [] for clave in ('text', 'left', 'top', 'width', 'height', 'conf',
+                                     'block_num', 'par_num', 'line_num')}
+    for numero, (texto, top, alto) in enumerate(LINEAS):
+        if inicio <= top and top + alto <= inicio + imagen.height:
+            for clave, valor in (('text', texto), ('left', 5), ('top', top - inicio), ('width', 20),
+                                 ('height', alto), ('conf', '90'), ('block_num', 1), ('par_num', 1),
+                                 ('line_num', numero)):
+                datos[clave].append(valor)
+    return datos
+
+
+@pytest.fixture
+def motor(monkeypatch):
+    monkeypatch.setattr(motor_ocr.pytesseract, 'image_to_data', datos_falsos)
+
+    def enviar_local(self, funcion, *args):
+        futuro = Future()
+        futuro.set_result(funcion(*args))
+        return futuro
+
+    monkeypatch.setattr(MotorOCR, '_enviar', enviar_local)
+    motor = MotorOCR(max_workers=1, umbral_mosaico=1000, alto_franja=100, solapamiento=20)
+    yield motor
+    motor.cerrar()
+
+
+def test_ocr_imagen_agrupa_por_linea(monkeypatch):
+    datos = {'text': ['Juan', 'Perez', '', 'Director'], 'left': [0, 40, 0, 0], 'top': [0, 0, 0, 20],
+             'width': [30, 30, 0, 50], 'height': [10, 10, 0, 10], 'conf': ['95', '90', '-1', '80'],
+             'block_num': [1, 1, 1, 1], 'par_num': [1, 1, 1, 1], 'line_num': [1, 1, 1, 2]}
+    monkeypatch.setattr(motor_ocr.pytesseract, 'image_to_data', lambda imagen, **kwargs: datos)
+
+    resultado = _ocr_imagen(Image.new('L', (10, 10)), 'spa', '', offset_x=3, offset_y=7)
+
+    assert resultado['texto'] == 'Juan Perez\nDirector'
+    assert [(c['texto'], c['x'], c['y']) for c in resultado['cajas']] == [
+        ('Juan', 3, 7), ('Perez', 43, 7), ('Director', 3, 27)]
+
+
+def test_franjas_no_repiten_el_solapamiento(motor):
+    imagen = imagen_marcada(20, 250)
+    assert len(motor.enviar_imagen(imagen)) == 3
+
+    resultado = motor.reconocer_imagen(imagen).result()
+
+    assert resultado['texto'] == 'uno\ndos\ntres'
+    assert [(c['texto'], c['y']) for c in resultado['cajas']] == [('uno', 45), ('dos', 100), ('tres', 210)]
+
+
+def test_imagen_pequena_va_en_una_sola_tarea(motor):
+    assert len(motor.enviar_imagen(imagen_marcada(10, 50))) == 1
+
+
+def test_limitar_pixeles():
+    motor = MotorOCR(max_workers=1, max_pixeles=10_000)
+    assert motor.limitar_pixeles(Image.new('L', (200, 200))).size == (100, 100)
+    assert motor.limitar_pixeles(Image.new('L', (50, 50))).size == (50, 50)
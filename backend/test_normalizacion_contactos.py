@@ -0,0 +1,58 @@
+import pandas as pd
+
+from normalizacion_contactos import resolver_columnas, normalizar_contactos, deduplicar_contactos
+
+
+def test_resolver_columnas_sin_acentos_y_una_vez_por_columna():
+    columnas = ['Nombre(s) de la persona servidora pública', 'Primer apellido', 'Segundo apellido',
+                'Denominación del cargo', 'Área de adscripción', 'Correo electrónico oficial', 'Teléfono', 'Extensión']
+    mapeo = resolver_columnas(columnas)
+
+    assert mapeo['nombre'] == 'Nombre(s) de la persona servidora pública'
+    assert mapeo['primer_apellido'] == 'Primer apellido'
+    assert mapeo['cargo'] == 'Denominación del cargo'
+    assert mapeo['area'] == 'Área de adscripción'
+    assert mapeo['email'] == 'Correo electrónico oficial'
+    assert mapeo['telefono'] == 'Teléfono'
+    assert mapeo['extension'] == 'Extensión'
+
+
+def test_resolver_columnas_faltantes_quedan_en_none():
+    mapeo = resolver_columnas(['Puesto', 'E-mail'])
+    assert mapeo['cargo'] == 'Puesto'
+    assert mapeo['email'] == 'E-mail'
+    assert mapeo['nombre'] is None
+    assert mapeo['telefono'] is None
+
+
+def contactos(filas):
+    return normalizar_contactos(pd.DataFrame(filas, columns=['nombre', 'cargo', 'email', 'telefono', 'extension']))
+
+
+def test_deduplicar_por_email_combina_campos():
+    df = deduplicar_contactos(contactos([
+        ['Ana López', None, 'MAILTO:Ana@X.gob.mx', None, None],
+        ['Ana López', 'Directora', 'ana@x.gob.mx', '+52 55 1234 5678', None],
+    ]))
+    assert len(df) == 1
+    fila = df.iloc[0]
+    assert fila['email'] == 'ana@x.gob.mx'
+    assert fila['cargo'] == 'Directora'
+    assert fila['telefono'] == '5512345678'
+
+
+def test_deduplicar_une_sin_email_por_telefono_y_nombre():
+    df = deduplicar_contactos(contactos([
+        ['José Pérez', 'Jefe', None, '55 1234 5678 ext. 12', None],
+        ['Jose Perez', None, 'jperez@x.gob.mx', '5512345678', '12'],
+        ['Otra Persona', 'Jefa', None, '5512345678', '12'],
+    ]))
+    assert len(df) == 2
+    jose = df[df['email'] == 'jperez@x.gob.mx'].iloc[0]
+    assert jose['cargo'] == 'Jefe'
+    assert jose['extension'] == '12'
+
+
+def test_deduplicar_vacio():
+    vacio = contactos([])
+    assert deduplicar_contactos(vacio).empty
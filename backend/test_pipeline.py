@@ -0,0 +1,76 @@
+import threading
+
+from pipeline import Pipeline, Etapa
+
+
+def ejecutar_con_limite(generador, segundos=5):
+    """Consume el generador en un hilo para que un bloqueo falle el test en vez de colgarlo"""
+    resultado = {}
+
+    def consumir():
+        try:
+            resultado['items'] = list(generador)
+        except BaseException as e:
+            resultado['error'] = e
+
+    hilo = threading.Thread(target=consumir, daemon=True)
+    hilo.start()
+    hilo.join(segundos)
+    assert not hilo.is_alive(), "el pipeline no terminó"
+    return resultado
+
+
+def test_items_pasan_por_todas_las_etapas():
+    pipeline = Pipeline([
+        Etapa('doble', lambda item: {**item, 'valor': item['valor'] * 2}, workers=3),
+        Etapa('pares', lambda item: item if item['valor'] % 4 == 0 else None),
+    ])
+    resultado = ejecutar_con_limite(pipeline.ejecutar({'valor': i} for i in range(10)))
+    assert sorted(item['valor'] for item in resultado['items']) == [0, 4, 8, 12, 16]
+
+
+def test_rutas_usan_pools_separados():
+    hilos = {}
+
+    def anotar(item):
+        hilos[item['id']] = threading.current_thread().name
+        return item
+
+    pipeline = Pipeline([Etapa('extraer', anotar, workers={'a': 1, 'b': 1}, ruta=lambda item: item['ruta'])])
+    ejecutar_con_limite(pipeline.ejecutar([{'id': 1, 'ruta': 'a'}, {'id': 2, 'ruta': 'b'}]))
+    assert hilos[1].startswith('extraer-a') and hilos[2].startswith('extraer-b')
+
+
+def test_error_en_etapa_se_anota_en_el_item():
+    def falla(item):
+        raise ValueError('sin datos')
+
+    pipeline = Pipeline([Etapa('extraer', falla)], log_callback=lambda *args: None)
+    resultado = ejecutar_con_limite(pipeline.ejecutar([{'id': 1}]))
+    assert resultado['items'] == [{'id': 1, 'errores': ['extraer: sin datos']}]
+
+
+def test_error_del_iterador_de_entrada_cierra_y_se_relanza():
+    def entrada():
+        yield {'id': 1}
+        raise RuntimeError('no se pudo arrendar')
+
+    pipeline = Pipeline([Etapa('extraer', lambda item: item, workers=2)])
+    resultado = ejecutar_con_limite(pipeline.ejecutar(entrada()))
+    assert isinstance(resultado['error'], RuntimeError)
+
+
+def test_backpressure_detiene_la_entrada():
+    leidos = []
+
+    def entrada():
+        for i in range(100):
+            leidos.append(i)
+            yield {'id': i}
+
+    pipeline = Pipeline([Etapa('extraer', lambda item: item)], capacidad=2)
+    generador = pipeline.ejecutar(entrada())
+    next(generador)
+    threading.Event().wait(0.1)
+    assert len(leidos) < 10
+    generador.close()
@@ -0,0 +1,90 @@
+import os
+import shutil
+
+import pytest
+
+import procesador_pdf
+from descargas import ArchivoDescargado
+from procesador_pdf import ProcesadorPDF
+
+
+def pdf_con_textos(ruta, textos):
+    """PDF mínimo con una página por texto (None = página sin capa de texto)"""
+    objetos = [b'<< /Type /Catalog /Pages 2 0 R >>', None,
+               b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    paginas = []
+    for texto in textos:
+        contenido = f'BT /F1 12 Tf 72 720 Td ({texto}) Tj ET'.encode('latin-1') if texto else b''
+        objetos.append(b'<< /Length %d >>\nstream\n%s\nendstream' % (len(contenido), contenido))
+        objetos.append(b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+                       b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>' % len(objetos))
+        paginas.append(len(objetos))
+    hijos = b' '.join(b'%d 0 R' % numero for numero in paginas)
+    objetos[1] = b'<< /Type /Pages /Kids [%s] /Count %d >>' % (hijos, len(paginas))
+
+    datos = b'%PDF-1.4\n'
+    posiciones = []
+    for numero, objeto in enumerate(objetos, start=1):
+        posiciones.append(len(datos))
+        datos += b'%d 0 obj\n%s\nendobj\n' % (numero, objeto)
+    inicio_xref = len(datos)
+    datos += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objetos) + 1)
+    datos += b''.join(b'%010d 00000 n \n' % posicion for posicion in posiciones)
+    datos += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objetos) + 1, inicio_xref)
+    ruta.write_bytes(datos)
+    return str(ruta)
+
+
+@pytest.fixture
+def procesador():
+    procesador = ProcesadorPDF(max_workers=2, paginas_por_tarea=2, min_caracteres_texto=10)
+    yield procesador
+    procesador.cerrar()
+
+
+TEXTO_1 = 'Juan Perez Director de Sistemas'
+TEXTO_3 = 'Maria Lopez Jefa de Finanzas'
+
+
+def test_texto_por_pagina_y_ocr_solo_de_escaneadas(tmp_path, procesador):
+    ruta = pdf_con_textos(tmp_path / "d.pdf", [TEXTO_1, None, TEXTO_3, None])
+    paginas_ocr = []
+
+    def ocr(ruta_pdf, paginas):
+        paginas_ocr.extend(paginas)
+        return {num: f'Texto OCR pagina {num}' for num in paginas}
+
+    resultados = dict(procesador.procesar_archivo(ruta, lambda texto: [texto.strip()], ocr))
+
+    assert paginas_ocr == [1, 3]
+    assert resultados[0] == [TEXTO_1]
+    assert resultados[2] == [TEXTO_3]
+    assert resultados[1] == ['Texto OCR pagina 1']
+    assert procesador.contar_paginas(ruta) == 4
+
+
+def test_respeta_max_paginas(tmp_path):
+    ruta = pdf_con_textos(tmp_path / "d.pdf", [TEXTO_1] * 5)
+    procesador = ProcesadorPDF(max_workers=1, max_paginas=2, min_caracteres_texto=10)
+    try:
+        assert sorted(num for num, _ in procesador.procesar_archivo(ruta, lambda texto: [texto])) == [0, 1]
+    finally:
+        procesador.cerrar()
+
+
+def test_procesar_url_informa_bytes_y_borra_el_temporal(tmp_path, monkeypatch, procesador):
+    original = pdf_con_textos(tmp_path / "d.pdf", [TEXTO_1])
+    copia = str(tmp_path / "descarga.pdf")
+
+    def descargar_local(url, tipo, max_bytes):
+        shutil.copy(original, copia)
+        return ArchivoDescargado(url, copia, tipo, os.path.getsize(copia), 'application/pdf', 0, None)
+
+    monkeypatch.setattr(procesador_pdf, 'descargar', descargar_local)
+    tamanos = []
+    resultados = list(procesador.procesar_url('https://sitio.gob.mx/d.pdf', lambda texto: [texto],
+                                              al_descargar=tamanos.append))
+
+    assert [num for num, _ in resultados] == [0]
+    assert tamanos == [os.path.getsize(original)]
+    assert not os.path.exists(copia)
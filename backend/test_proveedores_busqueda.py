@@ -0,0 +1,67 @@
+import time
+
+from proveedores_busqueda import (ProveedorBusqueda, ProveedorCache, ProveedorConcurrente, ProveedorFixture,
+                                  crear_resultado, es_resultado_confiable)
+
+
+class ProveedorFalso(ProveedorBusqueda):
+    def __init__(self, nombre, urls, espera=0):
+        super().__init__(0)
+        self.nombre = nombre
+        self.urls = urls
+        self.espera = espera
+        self.llamadas = 0
+
+    def _buscar(self, consulta, max_resultados):
+        self.llamadas += 1
+        time.sleep(self.espera)
+        return [crear_resultado(url, '', i + 1, self.nombre) for i, url in enumerate(self.urls)]
+
+
+def test_resultado_confiable():
+    assert es_resultado_confiable({'url': 'https://www.sat.gob.mx/', 'posicion': 1})
+    assert not es_resultado_confiable({'url': 'https://www.sat.gob.mx/', 'posicion': 4})
+    assert not es_resultado_confiable({'url': 'https://noticias.com/sat', 'posicion': 1})
+
+
+def test_escalonado_no_lanza_el_navegador_si_http_resuelve():
+    http = ProveedorFalso('http', ['https://www.sat.gob.mx/'])
+    navegador = ProveedorFalso('navegador', ['https://otra.gob.mx/'])
+    concurrente = ProveedorConcurrente([http, navegador], espera_escalonada=1)
+
+    assert concurrente.buscar('SAT')[0]['proveedor'] == 'http'
+    assert navegador.llamadas == 0
+
+
+def test_escalonado_lanza_el_siguiente_si_no_hay_confiable():
+    http = ProveedorFalso('http', ['https://noticias.com/sat'])
+    navegador = ProveedorFalso('navegador', ['https://www.sat.gob.mx/'])
+    concurrente = ProveedorConcurrente([http, navegador], espera_escalonada=1)
+
+    assert concurrente.buscar('SAT')[0]['proveedor'] == 'navegador'
+
+
+def test_escalonado_lanza_el_siguiente_si_el_primero_tarda():
+    lento = ProveedorFalso('http', ['https://www.sat.gob.mx/'], espera=1)
+    rapido = ProveedorFalso('navegador', ['https://www.sat.gob.mx/'])
+    concurrente = ProveedorConcurrente([lento, rapido], espera_escalonada=0.1)
+
+    inicio = time.monotonic()
+    assert concurrente.buscar('SAT')[0]['proveedor'] == 'navegador'
+    assert time.monotonic() - inicio < 0.8
+
+
+def test_sin_confiable_combina_sin_duplicados():
+    a = ProveedorFalso('a', ['https://ejemplo.org/1', 'https://ejemplo.org/2'])
+    b = ProveedorFalso('b', ['https://ejemplo.org/2', 'https://ejemplo.org/3'])
+    resultados = ProveedorConcurrente([a, b]).buscar('X')
+    assert [r['url'] for r in resultados] == ['https://ejemplo.org/1', 'https://ejemplo.org/2', 'https://ejemplo.org/3']
+
+
+def test_cache_guarda_por_nombre_normalizado(tmp_path):
+    base = ProveedorFixture({'Servicio de Administración Tributaria': ['https://www.sat.gob.mx/']})
+    cache = ProveedorCache(base, cache_file=str(tmp_path / "search.db"))
+
+    assert cache.buscar('Servicio de Administración Tributaria')[0]['url'] == 'https://www.sat.gob.mx/'
+    base.fixture = {}
+    assert cache.buscar('SERVICIO DE ADMINISTRACION TRIBUTARIA')[0]['url'] == 'https://www.sat.gob.mx/'
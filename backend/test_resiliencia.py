@@ -0,0 +1,72 @@
+import threading
+import time
+
+from resiliencia import CircuitoHost, PoliticaReintentos, es_fallo_del_host
+
+
+def test_circuito_se_abre_tras_umbral_de_fallos():
+    circuito = CircuitoHost('host', umbral_fallos=3, espera_base=60)
+    circuito.registrar_fallo()
+    circuito.registrar_fallo()
+    assert circuito.estado == 'cerrado'
+    circuito.registrar_fallo()
+    assert circuito.estado == 'abierto'
+
+
+def test_exito_reinicia_la_racha():
+    circuito = CircuitoHost('host', umbral_fallos=2)
+    circuito.registrar_fallo()
+    circuito.registrar_exito()
+    circuito.registrar_fallo()
+    assert circuito.estado == 'cerrado'
+
+
+def test_medio_abierto_cierra_con_exito():
+    circuito = CircuitoHost('host', umbral_fallos=1, espera_base=0.05)
+    circuito.registrar_fallo()
+    assert circuito.estado == 'abierto'
+
+    circuito.esperar_turno()
+    assert circuito.estado == 'medio_abierto'
+    circuito.registrar_exito()
+    assert circuito.estado == 'cerrado'
+    assert circuito.aperturas == 0
+
+
+def test_medio_abierto_reabre_con_el_doble_de_espera():
+    circuito = CircuitoHost('host', umbral_fallos=1, espera_base=0.05)
+    circuito.registrar_fallo()
+    circuito.esperar_turno()
+
+    antes = time.monotonic()
+    circuito.registrar_fallo()
+    assert circuito.estado == 'abierto'
+    assert circuito.abierto_hasta - antes >= 0.09
+
+
+def test_medio_abierto_deja_pasar_una_sola_prueba():
+    circuito = CircuitoHost('host', umbral_fallos=1, espera_base=0.05)
+    circuito.registrar_fallo()
+    circuito.esperar_turno()
+
+    liberado = threading.Event()
+    hilo = threading.Thread(target=lambda: (circuito.esperar_turno(), liberado.set()))
+    hilo.start()
+    assert not liberado.wait(0.1)
+
+    circuito.registrar_exito()
+    assert liberado.wait(1)
+    hilo.join()
+
+
+def test_solo_los_fallos_del_host_cuentan():
+    assert es_fallo_del_host({'exito': False, 'timeout': True})
+    assert es_fallo_del_host({'exito': False, 'tipo_error': 'host'})
+    assert es_fallo_del_host({'exito': False, 'error': 'Message: net::ERR_CONNECTION_RESET'})
+    assert not es_fallo_del_host({'exito': False, 'tipo_error': 'entidad', 'error': 'timeout'})
+    assert not es_fallo_del_host({'exito': False, 'error': 'No se pudieron extraer datos del directorio'})
+
+
+def test_espera_exponencial_sin_jitter():
+    politica = PoliticaReintentos(espera_base=2, jitter=0)
+    assert [politica.espera(i) for i in (1, 2, 3)] == [2, 4, 8]
@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta
+
+from resolvedor_urls import ResolvedorURLOficial, normalizar_nombre_entidad
+
+
+def nuevo_resolvedor(tmp_path, **opciones):
+    return ResolvedorURLOficial(str(tmp_path / "urls.db"), **opciones)
+
+
+def test_normalizar_nombre_entidad():
+    assert normalizar_nombre_entidad('  Secretaría de  Educación Pública ') == 'secretaria de educacion publica'
+    assert normalizar_nombre_entidad('Gobierno del Estado de Nuevo León (NL)') == 'gobierno del estado de nuevo leon nl'
+    assert normalizar_nombre_entidad(None) == ''
+
+
+def test_registro_federal_y_estatal(tmp_path):
+    resolvedor = nuevo_resolvedor(tmp_path)
+    assert resolvedor.consultar_registro('SECRETARÍA DE SALUD') == 'https://www.gob.mx/salud'
+    assert resolvedor.consultar_registro('Gobierno del Estado de Querétaro') == 'https://www.queretaro.gob.mx'
+    assert resolvedor.consultar_registro('Yucatán') == 'https://www.yucatan.gob.mx'
+    assert resolvedor.consultar_registro('Secretaría de Salud de Jalisco') is None
+
+
+def test_resolver_en_orden_cache_registro_busqueda(tmp_path):
+    resolvedor = nuevo_resolvedor(tmp_path)
+    busquedas = []
+
+    def en_vivo(nombre):
+        busquedas.append(nombre)
+        return 'https://www.ejemplo.gob.mx'
+
+    assert resolvedor.resolver('Secretaría de Salud', en_vivo) == 'https://www.gob.mx/salud'
+    assert resolvedor.resolver('Instituto Ejemplo', en_vivo) == 'https://www.ejemplo.gob.mx'
+    assert resolvedor.resolver('INSTITUTO EJEMPLO', en_vivo) == 'https://www.ejemplo.gob.mx'
+    assert resolvedor.resolver('Sin Sitio', lambda nombre: None) is None
+
+    assert busquedas == ['Instituto Ejemplo']
+    assert resolvedor.estadisticas == {'cache': 1, 'registro': 1, 'busqueda': 1, 'sin_resultado': 1}
+
+
+def test_cache_vencida_no_se_usa(tmp_path):
+    resolvedor = nuevo_resolvedor(tmp_path, ttl_dias=30)
+    viejo = (datetime.now() - timedelta(days=31)).isoformat()
+    resolvedor.guardar_en_cache('Instituto Ejemplo', 'https://viejo.gob.mx', verificado_en=viejo)
+    resolvedor.guardar_en_cache('Instituto Nuevo', 'https://nuevo.gob.mx')
+
+    assert resolvedor.consultar_cache('Instituto Ejemplo') is None
+    assert resolvedor.consultar_cache('instituto nuevo') == 'https://nuevo.gob.mx'
+
+
+def test_precargar_desde_csv(tmp_path):
+    ruta = tmp_path / "urls.csv"
+    ruta.write_text("entidad,url\nInstituto Ejemplo,https://www.ejemplo.gob.mx\nSin URL,no-es-url\n", encoding='utf-8')
+    resolvedor = nuevo_resolvedor(tmp_path)
+
+    assert resolvedor.precargar_desde_csv(str(ruta)) == 1
+    assert resolvedor.consultar_cache('Instituto Ejemplo') == 'https://www.ejemplo.gob.mx'
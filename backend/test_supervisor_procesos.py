@@ -0,0 +1,90 @@
+import threading
+import time
+from multiprocessing import Pipe
+
+import pytest
+
+import supervisor_procesos
+from supervisor_procesos import SupervisorAgentes
+
+
+class TrabajadorFalso:
+    """Trabajador en un hilo con el mismo protocolo por Pipe que _bucle_trabajador"""
+
+    creados = []
+
+    def __init__(self, contexto, tipo):
+        self.conexion, conexion_hijo = Pipe()
+        self.muerto = False
+        threading.Thread(target=self._bucle, args=(conexion_hijo,), daemon=True).start()
+        TrabajadorFalso.creados.append(self)
+
+    def _bucle(self, conexion):
+        while True:
+            try:
+                tarea = conexion.recv()
+            except (EOFError, OSError):
+                break
+            if tarea is None:
+                break
+            nombre, _, opciones = tarea
+            conexion.send(('parcial', {'url_oficial': f'https://{nombre}.gob.mx'}))
+            time.sleep(opciones.get('espera', 0))
+            try:
+                conexion.send(('resultado', {'exito': True, 'entidad': nombre}))
+            except OSError:
+                break
+
+    def cerrar(self):
+        self.conexion.close()
+
+    def matar(self):
+        self.muerto = True
+        self.conexion.close()
+
+
+@pytest.fixture
+def supervisor(monkeypatch):
+    TrabajadorFalso.creados = []
+    monkeypatch.setattr(supervisor_procesos, '_Trabajador', TrabajadorFalso)
+    supervisor = SupervisorAgentes('contactos', max_workers=1, plazo_segundos=0.3)
+    yield supervisor
+    supervisor.cerrar()
+
+
+def test_reutiliza_el_trabajador(supervisor):
+    assert supervisor.ejecutar('a') == {'exito': True, 'entidad': 'a'}
+    assert supervisor.ejecutar('b') == {'exito': True, 'entidad': 'b'}
+    assert len(TrabajadorFalso.creados) == 1
+
+
+def test_plazo_vencido_devuelve_parcial_y_reemplaza(supervisor):
+    datos = supervisor.ejecutar('lenta', espera=2)
+    assert datos['exito'] is False and datos['timeout'] is True
+    assert datos['url_oficial'] == 'https://lenta.gob.mx'
+    assert TrabajadorFalso.creados[0].muerto
+
+    assert supervisor.ejecutar('b')['exito']
+    assert len(TrabajadorFalso.creados) == 2
+
+
+def test_error_al_serializar_no_pierde_el_lugar(supervisor):
+    with pytest.raises(Exception):
+        supervisor.ejecutar('a', callback=threading.Lock())
+    assert TrabajadorFalso.creados[0].muerto
+
+    # Con max_workers=1, un lugar perdido bloquearía aquí para siempre
+    resultado = {}
+    hilo = threading.Thread(target=lambda: resultado.update(supervisor.ejecutar('b')), daemon=True)
+    hilo.start()
+    hilo.join(5)
+    assert resultado == {'exito': True, 'entidad': 'b'}
+
+
+def test_proceso_caido(supervisor):
+    supervisor.ejecutar('a')
+    TrabajadorFalso.creados[0].conexion.close()
+    datos = supervisor.ejecutar('b')
+    assert datos['exito'] is False
+    assert 'terminó inesperadamente' in datos['error']
+    assert supervisor.ejecutar('c')['exito']
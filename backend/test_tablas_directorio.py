@@ -0,0 +1,44 @@
+from tablas_directorio import analizar_tablas, mapear_columnas
+
+HTML = """
+<html><body>
+<table>
+  <tr><td>Menú</td><td>Inicio</td></tr>
+  <tr><td>Noticias</td><td>Contacto</td></tr>
+</table>
+<table>
+  <tr><th>Nombre</th><th>Cargo</th><th>Correo</th><th>Teléfono</th></tr>
+  <tr><td>Juan  Pérez</td><td>Director General</td><td>juan@sitio.gob.mx</td>
+      <td>55 1234 5678<table><tr><td>ext. 101</td></tr></table></td></tr>
+  <tr><td>María López</td><td>Coordinadora</td><td>maria@sitio.gob.mx</td><td>55 8765 4321</td></tr>
+</table>
+</body></html>
+"""
+
+
+def test_analizar_tablas_en_una_pasada():
+    tablas = analizar_tablas(HTML)
+
+    assert [t['indice'] for t in tablas] == [0, 1, 2]
+    menu, directorio, anidada = tablas
+    assert not menu['es_directorio']
+    assert menu['encabezados'] == ['menú', 'inicio']
+
+    assert directorio['es_directorio']
+    assert directorio['encabezados'] == ['nombre', 'cargo', 'correo', 'teléfono']
+    # Las filas de la tabla anidada no se mezclan con las de la tabla que la contiene
+    assert directorio['filas'] == [
+        ['Juan Pérez', 'Director General', 'juan@sitio.gob.mx', '55 1234 5678 ext. 101'],
+        ['María López', 'Coordinadora', 'maria@sitio.gob.mx', '55 8765 4321']]
+    assert not anidada['es_directorio']
+
+
+def test_tabla_sin_filas_no_es_directorio():
+    tablas = analizar_tablas('<table><tr><th>Nombre</th><th>Cargo</th><th>Correo</th></tr></table>')
+    assert tablas[0]['puntaje'] == 3
+    assert not tablas[0]['es_directorio']
+
+
+def test_mapear_columnas():
+    assert mapear_columnas(['#', 'nombre del servidor', 'puesto', 'e-mail']) == {
+        'nombre': 1, 'cargo': 2, 'email': 3, 'telefono': None}
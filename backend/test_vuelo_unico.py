@@ -0,0 +1,107 @@
+import threading
+import time
+
+import pytest
+
+from vuelo_unico import VueloUnico
+
+
+def test_llamadas_simultaneas_comparten_una_ejecucion():
+    vuelo = VueloUnico()
+    llamadas = []
+    arranco = threading.Event()
+    continuar = threading.Event()
+
+    def lenta():
+        llamadas.append(1)
+        arranco.set()
+        continuar.wait(1)
+        return {'exito': True, 'contactos': ['a']}
+
+    resultados = {}
+    lider = threading.Thread(target=lambda: resultados.setdefault('lider', vuelo.ejecutar('k', lenta)))
+    lider.start()
+    arranco.wait(1)
+    seguidor = threading.Thread(target=lambda: resultados.setdefault('seguidor', vuelo.ejecutar('k', lenta)))
+    seguidor.start()
+    time.sleep(0.05)
+    continuar.set()
+    lider.join()
+    seguidor.join()
+
+    assert len(llamadas) == 1
+    assert resultados['lider'][1] == 'nuevo'
+    assert resultados['seguidor'] == ({'exito': True, 'contactos': ['a']}, 'en_vuelo')
+    # Cada llamador recibe su propia copia
+    assert resultados['lider'][0] is not resultados['seguidor'][0]
+
+
+def test_cache_respeta_el_ttl():
+    vuelo = VueloUnico(ttl_segundos=0.1)
+    llamadas = []
+
+    def funcion():
+        llamadas.append(1)
+        return {'exito': True}
+
+    assert vuelo.ejecutar('k', funcion)[1] == 'nuevo'
+    assert vuelo.ejecutar('k', funcion)[1] == 'cache'
+    time.sleep(0.15)
+    assert vuelo.ejecutar('k', funcion)[1] == 'nuevo'
+    assert len(llamadas) == 2
+
+
+def test_no_guarda_fallos_ni_excepciones():
+    vuelo = VueloUnico()
+
+    assert vuelo.ejecutar('k', lambda: {'exito': False})[1] == 'nuevo'
+    assert vuelo.ejecutar('k', lambda: {'exito': False})[1] == 'nuevo'
+
+    def explota():
+        raise RuntimeError('host caído')
+
+    with pytest.raises(RuntimeError):
+        vuelo.ejecutar('e', explota)
+    assert vuelo.ejecutar('e', lambda: {'exito': True})[1] == 'nuevo'
+
+
+def test_seguidor_recibe_la_excepcion_del_lider():
+    vuelo = VueloUnico()
+    arranco = threading.Event()
+    continuar = threading.Event()
+    errores = []
+
+    def falla():
+        arranco.set()
+        continuar.wait(1)
+        raise RuntimeError('host caído')
+
+    def llamar():
+        try:
+            vuelo.ejecutar('k', falla)
+        except RuntimeError as e:
+            errores.append(str(e))
+
+    lider = threading.Thread(target=llamar)
+    lider.start()
+    arranco.wait(1)
+    seguidor = threading.Thread(target=llamar)
+    seguidor.start()
+    time.sleep(0.05)
+    continuar.set()
+    lider.join()
+    seguidor.join()
+
+    assert errores == ['host caído', 'host caído']
+    assert vuelo.estadisticas == {'nuevo': 1, 'en_vuelo': 1, 'cache': 0}
+
+
+def test_vencidos_y_excedentes_salen_de_la_cache():
+    vuelo = VueloUnico(ttl_segundos=0.1, max_entradas=2)
+    for clave in 'abc':
+        vuelo.ejecutar(clave, lambda: {'exito': True})
+    assert list(vuelo._cache) == ['b', 'c']
+
+    time.sleep(0.15)
+    vuelo.ejecutar('d', lambda: {'exito': True})
+    assert list(vuelo._cache) == ['d']
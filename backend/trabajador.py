@@ -0,0 +1,79 @@
+"""Nodo trabajador: toma entidades de la cola compartida y corre los agentes del coordinador.
+
+Uso:
+    python trabajador.py --db jobs.db --artefactos \\\\servidor\\compartido\\artefactos
+    python trabajador.py --broker 10.0.0.5:50000 --clave secreto --artefactos /mnt/artefactos
+
+Con --db usa la cola SQLite directamente (mismo equipo que el API); con --broker se conecta a la
+cola que el API expone por red (variables BROKER_COLA y BROKER_CLAVE), así que agregar nodos no cambia
+el API. La clave es obligatoria: el broker usa pickle y quien la conozca puede ejecutar código.
+"""
+import argparse
+import os
+import socket
+import time
+
+from coordinador import Coordinador
+from cola_trabajos import ColaTrabajos
+from cola_broker import conectar_cola
+
+
+def abrir_cola(db=None, broker=None, clave=None):
+    """Backend de la cola: SQLite local o broker remoto"""
+    if broker:
+        host, puerto = broker.rsplit(':', 1)
+        return conectar_cola((host, int(puerto)), clave)
+    return ColaTrabajos(db or "jobs.db")
+
+
+def carpeta_artefactos(cola, session_id, artefactos=None):
+    """Carpeta compartida de la sesión; sin --artefactos se usa la carpeta registrada por el API"""
+    if artefactos:
+        return os.path.join(artefactos, session_id)
+    return cola.sesion(session_id)['carpeta']
+
+
+def ejecutar_trabajador(cola, coordinador, artefactos=None, intervalo_sondeo=5, una_pasada=False):
+    """Atiende sesiones con tareas en cola, de la más antigua a la más nueva"""
+    nombre = f"{socket.gethostname()}:{os.getpid()}"
+    print(f"👷 Trabajador {nombre} esperando tareas...")
+    while True:
+        session_id = cola.siguiente_sesion()
+        if session_id is None:
+            if una_pasada:
+                return
+            time.sleep(intervalo_sondeo)
+            continue
+
+        def log_callback(mensaje, tipo='info', session_id=session_id):
+            cola.agregar_log(session_id, f"[{nombre}] {mensaje}", tipo)
+
+        contexto = coordinador.crear_contexto(carpeta_artefactos(cola, session_id, artefactos), log_callback)
+        print(f"📦 Sesión {session_id}: artefactos en {contexto.download_path}")
+        for resultado in coordinador.investigar_desde_cola(cola, contexto, session_id, trabajador=nombre,
+                                                           esperar_ajenas=False):
+            print(f"   ✅ {resultado['entidad']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Nodo trabajador de investigaciones")
+    parser.add_argument('--db', help="Archivo SQLite de la cola (backend local)")
+    parser.add_argument('--broker', help="host:puerto de la cola expuesta por el API (backend de red)")
+    parser.add_argument('--clave', default=os.environ.get('BROKER_CLAVE'),
+                        help="Clave de autenticación del broker (por defecto la variable BROKER_CLAVE)")
+    parser.add_argument('--artefactos', help="Carpeta compartida donde escribir los resultados")
+    parser.add_argument('--workers-transparencia', type=int, default=2)
+    parser.add_argument('--workers-contactos', type=int, default=3)
+    parser.add_argument('--una-pasada', action='store_true', help="Terminar cuando la cola quede vacía")
+    args = parser.parse_args()
+    if args.broker and not args.clave:
+        parser.error("--broker requiere --clave o la variable BROKER_CLAVE")
+
+    cola = abrir_cola(args.db, args.broker, args.clave.encode() if args.clave else None)
+    coordinador = Coordinador(max_workers_transparencia=args.workers_transparencia,
+                              max_workers_contactos=args.workers_contactos)
+    ejecutar_trabajador(cola, coordinador, args.artefactos, una_pasada=args.una_pasada)
+
+
+if __name__ == "__main__":
+    main()
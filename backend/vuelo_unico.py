@@ -0,0 +1,74 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+
+class _Vuelo:
+    def __init__(self):
+        self.listo = threading.Event()
+        self.resultado = None
+        self.error = None
+
+
+class VueloUnico:
+    """Una sola ejecución por clave a la vez, más caché corta de los resultados exitosos.
+
+    Quien llega mientras otra llamada con la misma clave está en curso espera y recibe el mismo
+    resultado; quien llega dentro del TTL recibe el resultado guardado. Cada llamador obtiene
+    su propia copia, porque las etapas siguientes modifican el dict.
+
+    La caché guarda a lo más max_entradas resultados; como todos comparten el mismo TTL, el orden
+    de inserción es el de vencimiento y los vencidos (o los más viejos, si se llena) salen por el frente.
+    """
+
+    def __init__(self, ttl_segundos=600, max_entradas=256):
+        self.ttl_segundos = ttl_segundos
+        self.max_entradas = max_entradas
+        self._lock = threading.Lock()
+        self._en_vuelo = {}
+        self._cache = OrderedDict()
+        self.estadisticas = {'nuevo': 0, 'en_vuelo': 0, 'cache': 0}
+
+    def ejecutar(self, clave, funcion):
+        """Devuelve (resultado, origen) con origen 'nuevo', 'en_vuelo' o 'cache'"""
+        with self._lock:
+            self._desalojar(time.monotonic())
+            guardado = self._cache.get(clave)
+            if guardado:
+                self.estadisticas['cache'] += 1
+                return copy.deepcopy(guardado[1]), 'cache'
+            vuelo = self._en_vuelo.get(clave)
+            lider = vuelo is None
+            if lider:
+                vuelo = self._en_vuelo[clave] = _Vuelo()
+            self.estadisticas['nuevo' if lider else 'en_vuelo'] += 1
+
+        if not lider:
+            vuelo.listo.wait()
+            if vuelo.error is not None:
+                raise vuelo.error
+            return copy.deepcopy(vuelo.resultado), 'en_vuelo'
+
+        try:
+            vuelo.resultado = funcion()
+        except Exception as e:
+            vuelo.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._en_vuelo[clave]
+                if vuelo.error is None and self.ttl_segundos and (vuelo.resultado or {}).get('exito'):
+                    self._cache.pop(clave, None)
+                    self._cache[clave] = (time.monotonic() + self.ttl_segundos, vuelo.resultado)
+                    self._desalojar(time.monotonic())
+            vuelo.listo.set()
+        return copy.deepcopy(vuelo.resultado), 'nuevo'
+
+    def _desalojar(self, ahora):
+        """Saca los resultados vencidos y los más viejos por encima de max_entradas (con el lock tomado)"""
+        while self._cache:
+            expira, _ = next(iter(self._cache.values()))
+            if expira > ahora and len(self._cache) <= self.max_entradas:
+                break
+            self._cache.popitem(last=False)